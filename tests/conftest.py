@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# The webapp is run as a script from within the webapp folder, so its modules
+# import each other as top-level packages (e.g. ``helpers``, ``templates``).
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "webapp"))
@@ -0,0 +1,159 @@
+import unittest
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from helpers.compact_frame import CompactCatalogue, ListCodes, memory_report
+from helpers.data_tools import apply_row_model, build_long_table
+
+
+class TestListCodes(unittest.TestCase):
+
+    def setUp(self):
+        self.series = pd.Series([["Soleus", "Deltoid"], "Soleus", None, ["Legacy", None]])
+        self.codes = ListCodes.from_series(self.series, options=["Deltoid", "Soleus"])
+
+    def test_round_trip(self):
+        self.assertEqual(
+            self.codes.to_lists(),
+            [["Soleus", "Deltoid"], ["Soleus"], [], ["Legacy"]],
+        )
+
+    def test_unknown_values_are_appended_to_categories(self):
+        self.assertEqual(list(self.codes.categories), ["Deltoid", "Soleus", "Legacy"])
+        self.assertEqual(self.codes.codes.dtype, np.int8)
+
+    def test_counts_and_match_any(self):
+        self.assertEqual(
+            self.codes.counts().to_dict(), {"Deltoid": 1, "Soleus": 2, "Legacy": 1}
+        )
+        self.assertEqual(
+            self.codes.match_any(["Deltoid", "Legacy"]).tolist(),
+            [True, False, False, True],
+        )
+
+
+class TestCompactCatalogue(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {
+                "DATASET_NAME": ["A", "B", "C"],
+                "MUSCLE": [["Soleus"], ["Soleus", "Deltoid"], []],
+                "DATA_TYPE": ["Image", "Video", None],
+                "PARTICIPANT_AGE": [25.0, None, 40.0],
+                "PARTICIPANT_HEIGHT": [170.5, 180.0, None],
+                "DATA_LABELS": [True, None, False],
+            }
+        )
+        self.compact = CompactCatalogue.from_frame(self.df)
+
+    def test_dtypes(self):
+        dtypes = self.compact.frame.dtypes
+        self.assertIsInstance(dtypes["DATA_TYPE"], pd.CategoricalDtype)
+        self.assertIn("Volume", dtypes["DATA_TYPE"].categories)
+        self.assertEqual(str(dtypes["PARTICIPANT_AGE"]), "Int32")
+        self.assertEqual(str(dtypes["PARTICIPANT_HEIGHT"]), "Float64")
+        self.assertEqual(str(dtypes["DATA_LABELS"]), "boolean")
+        self.assertIn("MUSCLE", self.compact.lists)
+
+    def test_to_frame_keeps_column_order_and_values(self):
+        df = self.compact.to_frame()
+        self.assertEqual(list(df.columns), list(self.df.columns))
+        self.assertEqual(df["MUSCLE"].tolist(), self.df["MUSCLE"].tolist())
+        self.assertEqual(df["PARTICIPANT_AGE"].dropna().tolist(), [25, 40])
+
+    def test_to_frame_adds_missing_columns(self):
+        df = self.compact.to_frame(["DATASET_NAME", "DEVICE"])
+        self.assertEqual(list(df.columns), ["DATASET_NAME", "DEVICE"])
+        self.assertTrue(df["DEVICE"].isna().all())
+
+    def test_long_table_matches_object_frame(self):
+        columns = ["MUSCLE", "DATA_TYPE"]
+        expected = build_long_table(self.df, columns)
+        result = self.compact.long_table(columns)
+        key = ["field", "row", "value"]
+        pd.testing.assert_frame_equal(
+            result.sort_values(key).reset_index(drop=True)[key],
+            expected.sort_values(key).reset_index(drop=True)[key],
+        )
+
+    def test_take_decodes_given_rows(self):
+        rows = self.compact.take([2, 0], ["DATASET_NAME", "MUSCLE", "DEVICE"])
+        self.assertEqual(rows.index.tolist(), [2, 0])
+        self.assertEqual(rows["DATASET_NAME"].tolist(), ["C", "A"])
+        self.assertEqual(rows["MUSCLE"].tolist(), [[], ["Soleus"]])
+        self.assertTrue(rows["DEVICE"].isna().all())
+
+    def test_value_codes(self):
+        codes = self.compact.value_codes(["MUSCLE", "DATA_TYPE", "DEVICE"])
+        self.assertEqual(list(codes), ["MUSCLE", "DATA_TYPE"])
+        rows, muscle_codes, categories = codes["MUSCLE"]
+        self.assertEqual(rows.tolist(), [0, 1, 1])
+        self.assertEqual(list(categories[muscle_codes]), ["Soleus", "Soleus", "Deltoid"])
+        self.assertEqual(codes["DATA_TYPE"][1][2], -1)
+
+    def test_row_model_matches_object_frame(self):
+        columns = ["DATASET_NAME", "MUSCLE", "DATA_TYPE", "PARTICIPANT_AGE"]
+        df = self.compact.to_frame(columns)
+        cases = [
+            ({"sort_model": [{"colId": "DATA_TYPE", "sort": "desc"}]}),
+            ({"sort_model": [{"colId": "PARTICIPANT_AGE", "sort": "asc"}]}),
+            ({"sort_model": [{"colId": "MUSCLE", "sort": "asc"}]}),
+            ({"quick_filter": "SOL"}),
+            ({"quick_filter": "video"}),
+            ({"quick_filter": "b", "sort_model": [{"colId": "DATASET_NAME", "sort": "desc"}]}),
+        ]
+        for case in cases:
+            with self.subTest(**case):
+                expected = apply_row_model(df, **case).index.tolist()
+                self.assertEqual(
+                    self.compact.row_model(columns=columns, **case).tolist(), expected
+                )
+
+    def test_match(self):
+        cases = [
+            ({"MUSCLE": {"$in": ["Deltoid", "Biceps Brachii"]}}, [False, True, False]),
+            ({"MUSCLE": {"$all": ["Soleus", "Deltoid"]}}, [False, True, False]),
+            ({"MUSCLE": "Soleus", "DATA_TYPE": {"$in": ["Image"]}}, [True, False, False]),
+            ({"PARTICIPANT_AGE": {"$gte": 30, "$lte": 50}}, [False, False, True]),
+            ({"DATA_LABELS": True}, [True, False, False]),
+            ({"DEVICE": {"$in": ["Aixplorer"]}}, [False, False, False]),
+            ({}, [True, True, True]),
+        ]
+        for query, expected in cases:
+            with self.subTest(query=query):
+                self.assertEqual(self.compact.match(query).tolist(), expected)
+        with self.assertRaises(ValueError):
+            self.compact.match({"DATASET_NAME": {"$regex": "A"}})
+
+    def test_arrow_round_trip(self):
+        table = self.compact.to_arrow({"digest": "x"})
+        self.assertEqual(table.schema.metadata[b"digest"], b"x")
+        compact = CompactCatalogue.from_arrow(table)
+        pd.testing.assert_frame_equal(compact.to_frame(), self.compact.to_frame())
+        self.assertFalse(compact.lists["MUSCLE"].codes.flags.owndata)
+        self.assertFalse(compact.frame["DATA_TYPE"].array.codes.flags.owndata)
+
+    def test_arrow_codes_are_checked(self):
+        table = self.compact.to_arrow()
+        position = table.schema.get_field_index("DATA_TYPE")
+        table = table.set_column(
+            position,
+            table.schema.field(position),
+            pa.array(np.array([0, 1, 9], dtype=np.int8)),
+        )
+        with self.assertRaises(ValueError):
+            CompactCatalogue.from_arrow(table)
+
+    def test_memory_report(self):
+        report = memory_report(self.df, self.compact)
+        self.assertEqual(list(report.index), list(self.df.columns) + ["TOTAL"])
+        self.assertEqual(report.loc["MUSCLE", "dtype"], "list codes")
+        self.assertEqual(
+            report.loc["TOTAL", "compact_bytes"],
+            self.compact.memory_usage().sum(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,323 @@
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+import pandas as pd
+from bson import ObjectId
+from helpers.data_tools import (
+    ROW_ID_COLUMN,
+    _grid_state,
+    _resolve_rows,
+    apply_row_model,
+    build_long_table,
+    clean_dataframe,
+    FrameRows,
+    export_token,
+    filter_dataframe,
+    iter_export_chunks,
+    prune_downloads,
+    publish_chunks,
+    publish_file,
+    published_path,
+)
+
+
+class TestCleanDataframe(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {
+                "DATASET_NAME": pd.Series(["Test_2024", "Bad\ud800_2024"], dtype=object),
+                "MUSCLE": [["Soleus", "Deltoid\udc00"], []],
+                "_id": [ObjectId("66a0f0f0f0f0f0f0f0f0f0f0"), None],
+                "SAMPLE_SIZE": [10, 20],
+            }
+        )
+
+    def test_strings_are_cleaned(self):
+        cleaned = clean_dataframe(self.df)
+        self.assertEqual(list(cleaned["DATASET_NAME"]), ["Test_2024", "Bad_2024"])
+
+    def test_list_columns_stay_lists(self):
+        cleaned = clean_dataframe(self.df)
+        self.assertEqual(list(cleaned["MUSCLE"]), [["Soleus", "Deltoid"], []])
+
+    def test_objects_are_converted_to_strings(self):
+        cleaned = clean_dataframe(self.df)
+        self.assertEqual(cleaned["_id"][0], "66a0f0f0f0f0f0f0f0f0f0f0")
+        self.assertIsNone(cleaned["_id"][1])
+
+    def test_input_is_not_modified(self):
+        clean_dataframe(self.df)
+        self.assertEqual(self.df["DATASET_NAME"][1], "Bad\ud800_2024")
+
+    def test_only_selected_columns_are_processed(self):
+        cleaned = clean_dataframe(self.df, columns=["MUSCLE", "SAMPLE_SIZE"])
+        self.assertEqual(list(cleaned.columns), ["MUSCLE", "SAMPLE_SIZE"])
+
+
+class TestBuildLongTable(unittest.TestCase):
+
+    def test_lists_and_scalars_are_exploded(self):
+        df = pd.DataFrame(
+            {"MUSCLE": [["Soleus", "Deltoid"], []], "DEVICE": ["Philips Lumify", None]}
+        )
+        long_table = build_long_table(df, ["MUSCLE", "DEVICE"])
+        self.assertEqual(
+            long_table.values.tolist(),
+            [
+                [0, "MUSCLE", "Soleus"],
+                [0, "MUSCLE", "Deltoid"],
+                [0, "DEVICE", "Philips Lumify"],
+            ],
+        )
+
+    def test_missing_columns_are_skipped(self):
+        long_table = build_long_table(pd.DataFrame({"MUSCLE": []}), ["DEVICE"])
+        self.assertEqual(list(long_table.columns), ["row", "field", "value"])
+        self.assertTrue(long_table.empty)
+
+
+class TestIterExportChunks(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {
+                "DATASET_NAME": ["A_2024", "B_2024", "C_2024"],
+                "MUSCLE": [["Soleus"], ["Deltoid", "Soleus"], []],
+                "SAMPLE_SIZE": [10, 20, 30],
+            }
+        )
+
+    def test_csv(self):
+        chunks = list(iter_export_chunks(self.df, "CSV", chunk_rows=2))
+        self.assertEqual(len(chunks), 2)
+        lines = b"".join(chunks).decode().splitlines()
+        self.assertEqual(lines[0], "DATASET_NAME,MUSCLE,SAMPLE_SIZE")
+        self.assertEqual(lines[2], 'B_2024,"Deltoid, Soleus",20')
+        self.assertEqual(len(lines), 4)
+
+    def test_jsonl(self):
+        content = b"".join(iter_export_chunks(self.df, "JSONL", chunk_rows=2))
+        records = [json.loads(line) for line in content.decode().splitlines()]
+        self.assertEqual(records[1]["MUSCLE"], ["Deltoid", "Soleus"])
+        self.assertEqual(len(records), 3)
+
+    def test_parquet(self):
+        content = b"".join(iter_export_chunks(self.df, "Parquet", chunk_rows=2))
+        restored = pd.read_parquet(io.BytesIO(content))
+        self.assertEqual(list(restored["SAMPLE_SIZE"]), [10, 20, 30])
+        self.assertEqual(list(restored["MUSCLE"][1]), ["Deltoid", "Soleus"])
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            list(iter_export_chunks(self.df, "XLSX"))
+
+
+class TestServerSideGrid(unittest.TestCase):
+
+    def test_only_the_block_is_taken(self):
+        df = pd.DataFrame({"DATASET_NAME": ["C", "A", "B"]}, index=[10, 11, 12])
+        rows = FrameRows(df)
+        rows.take = mock.Mock(wraps=rows.take)
+        response = None
+        with mock.patch("helpers.data_tools._show_grid", return_value=response):
+            with mock.patch("helpers.data_tools.st") as st:
+                st.columns.return_value = [mock.MagicMock()] * 3
+                st.text_input.return_value = ""
+                st.selectbox.return_value = "DATASET_NAME"
+                st.checkbox.return_value = False
+                st.number_input.return_value = 2
+                st.session_state = {}
+                row_ids = filter_dataframe(
+                    rows, server_side=True, block_size=2, read_only=True
+                )
+        self.assertEqual(row_ids.tolist(), [11, 12, 10])
+        self.assertEqual(rows.take.call_args.args[0].tolist(), [10])
+
+    def test_the_grid_filter_model_is_applied_to_all_rows(self):
+        df = pd.DataFrame({"SAMPLE_SIZE": [30, 10, 20]}, index=[10, 11, 12])
+        filter_model = {
+            "SAMPLE_SIZE": {"filterType": "number", "type": "greaterThan", "filter": 15}
+        }
+        with mock.patch("helpers.data_tools._show_grid", return_value=None) as grid:
+            with mock.patch("helpers.data_tools.st") as st:
+                st.columns.return_value = [mock.MagicMock()] * 3
+                st.text_input.return_value = ""
+                st.selectbox.return_value = None
+                st.checkbox.return_value = False
+                st.number_input.return_value = 1
+                st.session_state = {"grid_view": {"filterModel": filter_model}}
+                row_ids = filter_dataframe(
+                    FrameRows(df), server_side=True, block_size=1, read_only=True
+                )
+        self.assertEqual(row_ids.tolist(), [10, 12])
+        self.assertEqual(grid.call_args.kwargs["filter_model"], filter_model)
+
+
+class TestExportToken(unittest.TestCase):
+
+    def test_token_depends_on_rows_columns_and_source(self):
+        df = pd.DataFrame({"A": [1, 2, 3]}, index=[5, 7, 9])
+        token = export_token(df, "digest")
+        self.assertEqual(export_token(df.copy(), "digest"), token)
+        self.assertNotEqual(export_token(df.iloc[:2], "digest"), token)
+        self.assertNotEqual(export_token(df.rename(columns={"A": "B"}), "digest"), token)
+        self.assertNotEqual(export_token(df, "other"), token)
+
+
+class TestPublishFile(unittest.TestCase):
+
+    def test_chunks_are_streamed_to_one_file(self):
+        with tempfile.TemporaryDirectory() as root:
+            url = publish_chunks(iter([b"instr", b"uctions"]), "a.txt", root=root)
+            self.assertEqual(publish_file("instructions", "a.txt", root=root), url)
+            downloads = Path(root) / "downloads"
+            self.assertEqual(len(list(downloads.iterdir())), 1)
+
+    def test_files_are_content_addressed(self):
+        with tempfile.TemporaryDirectory() as root:
+            url = publish_file("instructions", "instructions.txt", root=root)
+            self.assertTrue(url.startswith("app/static/downloads/"))
+            self.assertTrue(url.endswith("/instructions.txt"))
+            self.assertEqual(publish_file("instructions", "instructions.txt", root=root), url)
+            self.assertNotEqual(publish_file(b"other", "instructions.txt", root=root), url)
+
+            path = Path(root) / url[len("app/static/"):]
+            self.assertEqual(path.read_text(), "instructions")
+            self.assertEqual(list(path.parent.iterdir()), [path])
+
+    def test_concurrent_publishing(self):
+        with tempfile.TemporaryDirectory() as root:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                urls = set(
+                    executor.map(
+                        lambda _: publish_file("instructions", "a.txt", root=root),
+                        range(32),
+                    )
+                )
+            self.assertEqual(len(urls), 1)
+            path = Path(root) / urls.pop()[len("app/static/"):]
+            self.assertEqual(path.read_text(), "instructions")
+            self.assertEqual(list(path.parent.iterdir()), [path])
+
+    def test_old_downloads_are_pruned(self):
+        with tempfile.TemporaryDirectory() as root:
+            old = published_path(publish_file("old", "a.txt", root=root), root)
+            os.utime(old.parent, (0, 0))
+            new = published_path(publish_file("new", "a.txt", root=root), root)
+            self.assertFalse(old.exists())
+            self.assertTrue(new.exists())
+
+    def test_downloads_are_pruned_past_the_size_limit(self):
+        with tempfile.TemporaryDirectory() as root:
+            paths = []
+            for age, content in enumerate(["first", "second", "third"]):
+                path = published_path(publish_file(content, "a.txt", root=root), root)
+                os.utime(path.parent, (time.time() - 30 + age, time.time() - 30 + age))
+                paths.append(path)
+            removed = prune_downloads(
+                Path(root) / "downloads", keep=paths[0].parent, max_bytes=10
+            )
+            self.assertEqual(removed, 1)
+            self.assertEqual([path.exists() for path in paths], [True, False, True])
+
+
+class TestRowModel(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {
+                "DATASET_NAME": ["b_2020", "A_2021", "c_2022", None],
+                "MUSCLE": [["Soleus"], ["Gastrocnemius Medialis", "Soleus"], [], None],
+                "SAMPLE_SIZE": [10, 30, 20, None],
+            },
+            index=[10, 11, 12, 13],
+        )
+
+    def test_sort_keeps_source_index(self):
+        rows = apply_row_model(self.df, sort_model=[{"colId": "DATASET_NAME", "sort": "asc"}])
+        self.assertEqual(list(rows.index), [11, 10, 12, 13])
+        rows = apply_row_model(self.df, sort_model=[{"colId": "SAMPLE_SIZE", "sort": "desc"}])
+        self.assertEqual(list(rows.index), [11, 12, 10, 13])
+
+    def test_filter_model(self):
+        rows = apply_row_model(
+            self.df,
+            filter_model={
+                "MUSCLE": {"filterType": "text", "type": "contains", "filter": "soleus"},
+                "SAMPLE_SIZE": {"filterType": "number", "type": "greaterThan", "filter": 15},
+            },
+        )
+        self.assertEqual(list(rows.index), [11])
+        with self.assertRaises(ValueError):
+            apply_row_model(self.df, filter_model={"MUSCLE": {"type": "regex"}})
+
+    def test_combined_filter_conditions(self):
+        condition = {
+            "filterType": "number",
+            "operator": "OR",
+            "conditions": [
+                {"filterType": "number", "type": "lessThan", "filter": 15},
+                {"filterType": "number", "type": "blank"},
+            ],
+        }
+        rows = apply_row_model(self.df, filter_model={"SAMPLE_SIZE": condition})
+        self.assertEqual(list(rows.index), [10, 13])
+        condition["operator"] = "AND"
+        rows = apply_row_model(self.df, filter_model={"SAMPLE_SIZE": condition})
+        self.assertEqual(list(rows.index), [])
+        rows = apply_row_model(
+            self.df, filter_model={"MUSCLE": {"filterType": "text", "type": "notBlank"}}
+        )
+        self.assertEqual(list(rows.index), [10, 11])
+
+    def test_quick_filter(self):
+        rows = apply_row_model(self.df, quick_filter="GASTRO")
+        self.assertEqual(list(rows.index), [11])
+
+
+class TestReadOnlyGrid(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {"DATASET_NAME": ["A", "B", "C"], "SAMPLE_SIZE": [10, 20, 30]},
+            index=[40, 7, 12],
+        )
+
+    def test_grid_state(self):
+        self.assertEqual(_grid_state(None), ([], {}))
+        self.assertEqual(_grid_state({"selected": None}), ([], {}))
+        state = {"selected": [7], "filterModel": {"SAMPLE_SIZE": {"type": "equals"}}}
+        self.assertEqual(
+            _grid_state(mock.Mock(raw_data=state)),
+            ([7], {"SAMPLE_SIZE": {"type": "equals"}}),
+        )
+
+    def test_rows_are_resolved_against_the_index(self):
+        resolved = _resolve_rows(self.df, [12, 40, 99])
+        self.assertEqual(resolved.index.tolist(), [40, 12])
+        self.assertEqual(resolved["DATASET_NAME"].tolist(), ["A", "C"])
+
+    def test_filter_dataframe_returns_filtered_rows_and_selection(self):
+        response = {
+            "selected": [12],
+            "filterModel": {
+                "SAMPLE_SIZE": {"filterType": "number", "type": "greaterThan", "filter": 15}
+            },
+        }
+        with mock.patch("helpers.data_tools._show_grid", return_value=response):
+            with mock.patch("helpers.data_tools.st") as st:
+                st.session_state = {}
+                filtered = filter_dataframe(self.df, key="grid", read_only=True)
+        self.assertEqual(filtered.index.tolist(), [7, 12])
+        self.assertEqual(filtered["SAMPLE_SIZE"].tolist(), [20, 30])
+        self.assertEqual(st.session_state["grid_selection"], [12])
+
+if __name__ == "__main__":
+    unittest.main()
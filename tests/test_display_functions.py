@@ -0,0 +1,109 @@
+import unittest
+from unittest import mock
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from helpers.display_functions import (
+    FigureCache,
+    age_dot_positions,
+    display_charts,
+    plot_age_distribution,
+    render_figure,
+)
+
+
+class TestFigureCache(unittest.TestCase):
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = FigureCache(max_entries=2)
+        cache.put("a", b"a")
+        cache.put("b", b"b")
+        cache.get("a")
+        cache.put("c", b"c")
+        self.assertEqual(cache.get("a"), b"a")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), b"c")
+
+    def test_render_figure_closes_figure(self):
+        fig, ax = plt.subplots()
+        image = render_figure(fig)
+        self.assertTrue(image.startswith(b"\x89PNG"))
+        self.assertNotIn(fig.number, plt.get_fignums())
+
+
+class TestDisplayCharts(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch("helpers.display_functions.st")
+        self.st = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch(
+            "helpers.display_functions._get_figure_cache", return_value=FigureCache()
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.plots = ["Muscle Distribution", "Age Distribution"]
+        self.counts = pd.DataFrame(
+            [[2, 1]],
+            index=pd.Index(["Soleus"], name="MUSCLE"),
+            columns=pd.Index(["Soleus", "Deltoid"], name="MUSCLE"),
+        )
+
+    def test_server_side_charts_do_not_need_the_data(self):
+        query = {"DATA_TYPE": {"$in": ["Image"]}}
+        with mock.patch(
+            "helpers.display_functions.get_chart_counts", return_value=self.counts
+        ) as get_chart_counts, mock.patch(
+            "helpers.display_functions.get_value_counts",
+            return_value=pd.Series([2, 1], index=[25, 40]),
+        ) as get_value_counts:
+            display_charts(None, self.plots, server_side=True, query=query, data_key="v")
+        get_chart_counts.assert_called_once_with("MUSCLE", "MUSCLE", query)
+        get_value_counts.assert_called_once_with("PARTICIPANT_AGE", query)
+        self.assertEqual(self.st.image.call_count, 2)
+
+    def test_local_charts_are_restricted_to_rows(self):
+        df = pd.DataFrame(
+            {
+                "MUSCLE": [["Soleus"], ["Deltoid"], ["Soleus"]],
+                "PARTICIPANT_AGE": [25, 40, None],
+            }
+        )
+        with mock.patch(
+            "helpers.display_functions.plot_distribution", return_value=plt.figure()
+        ) as plot_distribution, mock.patch(
+            "helpers.display_functions.plot_age_distribution", return_value=plt.figure()
+        ) as plot_age_distribution:
+            display_charts(df, self.plots, rows=np.array([1, 2]))
+        counts = plot_distribution.call_args.args[0]
+        self.assertEqual(counts.loc["Soleus", "Soleus"], 1)
+        self.assertEqual(counts.loc["Deltoid", "Deltoid"], 1)
+        self.assertEqual(plot_age_distribution.call_args.args[0].tolist(), [40])
+
+    def test_group_must_be_a_chart_column(self):
+        display_charts(None, self.plots, group_by_column="_id", server_side=True)
+        self.st.warning.assert_called_once()
+        self.st.image.assert_not_called()
+
+
+class TestAgeDistribution(unittest.TestCase):
+
+    def test_age_dot_positions(self):
+        xs, ys = age_dot_positions([30, 26, 30, 30, 26])
+        self.assertEqual(xs.tolist(), [30, 26, 30, 30, 26])
+        self.assertEqual(ys.tolist(), [1, 1, 2, 3, 2])
+
+    def test_histogram_mode_for_large_catalogues(self):
+        ages = pd.Series(range(10000)) % 60 + 18
+        fig = plot_age_distribution(ages, max_dots=500)
+        self.assertEqual(len(fig.axes[0].collections), 0)
+        self.assertEqual(len(fig.axes[0].patches), 60)
+        plt.close(fig)
+
+
+if __name__ == "__main__":
+    unittest.main()
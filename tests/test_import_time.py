@@ -0,0 +1,76 @@
+import ast
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+WEBAPP_DIR = Path(__file__).resolve().parent.parent / "webapp"
+
+# Dependencies that must only be imported by the tabs that need them.
+HEAVY_MODULES = ["matplotlib", "seaborn", "st_aggrid", "streamlit_pydantic"]
+
+# Modules of the ingestion tool that the web app must not import.
+INGESTION_MODULES = ["helpers.ingestion_functions", "helpers.index_functions"]
+
+# Helper and tab modules imported by webapp.py.
+HELPER_MODULES = [
+    "helpers.loading_functions",
+    "helpers.query_functions",
+    "helpers.snapshot",
+    "helpers.display_functions",
+    "helpers.data_tools",
+    "helpers.pydantic_models",
+    "helpers.footer",
+    "helpers.search_functions",
+    "tabs.home",
+    "tabs.datasets",
+    "tabs.database",
+    "tabs.contributing",
+]
+
+# Budget for importing all helper modules, including streamlit and pandas.
+IMPORT_BUDGET_SECONDS = 5.0
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_webapp_has_no_heavy_top_level_imports(self):
+        for path in [WEBAPP_DIR / "webapp.py", *sorted(WEBAPP_DIR.glob("tabs/*.py"))]:
+            with self.subTest(path=path.name):
+                self._assert_no_heavy_imports(path)
+
+    def _assert_no_heavy_imports(self, path):
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+        for node in tree.body:
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom):
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                self.assertNotIn(name.split(".")[0], HEAVY_MODULES)
+
+    def test_helpers_import_within_budget(self):
+        code = (
+            "import sys, time\n"
+            "start = time.perf_counter()\n"
+            f"for name in {HELPER_MODULES!r}:\n"
+            "    __import__(name)\n"
+            "print(time.perf_counter() - start)\n"
+            f"print(','.join(m for m in {HEAVY_MODULES + INGESTION_MODULES!r} "
+            "if m in sys.modules))\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=WEBAPP_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.splitlines()
+        self.assertEqual(output[-1], "", f"Heavy modules imported: {output[-1]}")
+        self.assertLess(float(output[-2]), IMPORT_BUDGET_SECONDS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import contextlib
+import io
+import unittest
+from unittest import mock
+from unittest.mock import MagicMock
+from database import main
+from helpers.index_functions import (
+    IndexSpec,
+    build_index_specs,
+    ensure_indexes,
+    explain_query,
+)
+
+
+class TestIndexFunctions(unittest.TestCase):
+
+    def test_build_index_specs(self):
+        specs = {spec.field: spec for spec in build_index_specs()}
+        self.assertTrue(specs["MUSCLE"].multikey)
+        self.assertTrue(specs["DEVICE"].multikey)
+        self.assertFalse(specs["PARTICIPANT_AGE"].multikey)
+        for field in [
+            "SHORT_DESCRIPTION",
+            "DATA_LABELS_DESCRIPTION",
+            "DATASET_LINK",
+            "PUBLICATION_LINK",
+        ]:
+            self.assertNotIn(field, specs)
+
+    def test_ensure_indexes_is_idempotent(self):
+        specs = [IndexSpec("MUSCLE", multikey=True), IndexSpec("DEVICE", multikey=True)]
+        collection = MagicMock()
+        collection.index_information.return_value = {"_id_": {}}
+        collection.create_indexes.side_effect = lambda models: [
+            model.document["name"] for model in models
+        ]
+        result = ensure_indexes(collection, specs)
+        self.assertEqual(result["created"], ["umud_field_muscle", "umud_field_device"])
+
+        collection.create_indexes.reset_mock()
+        collection.index_information.return_value = {
+            "_id_": {},
+            "umud_field_muscle": {},
+            "umud_field_device": {},
+            "umud_field_old": {},
+        }
+        result = ensure_indexes(collection, specs, prune=True)
+        collection.create_indexes.assert_not_called()
+        self.assertEqual(result["dropped"], ["umud_field_old"])
+
+    def test_explain_query_flags_collection_scans(self):
+        collection = MagicMock()
+        collection.find.return_value.explain.return_value = {
+            "queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}},
+            "executionStats": {"totalDocsExamined": 10, "nReturned": 1},
+        }
+        self.assertTrue(explain_query(collection, {"LICENSE": "MIT"})["collscan"])
+
+        collection.find.return_value.explain.return_value = {
+            "queryPlanner": {
+                "winningPlan": {
+                    "stage": "FETCH",
+                    "inputStage": {"stage": "IXSCAN", "indexName": "umud_field_muscle"},
+                }
+            }
+        }
+        result = explain_query(collection, {"MUSCLE": "GM"})
+        self.assertFalse(result["collscan"])
+        self.assertEqual(result["indexes"], ["umud_field_muscle"])
+
+
+class TestDatabaseCommand(unittest.TestCase):
+
+    def run_main(self, argv):
+        indexes = {"created": [], "existing": [], "dropped": []}
+        with mock.patch("database.get_collection") as get_collection:
+            with mock.patch("database.ensure_indexes", return_value=indexes) as ensure:
+                with mock.patch("database.explain_report", return_value="") as explain:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        main(argv)
+        return get_collection, ensure, explain
+
+    def test_explain_runs_without_writes_in_a_dry_run(self):
+        get_collection, ensure, explain = self.run_main(["--explain", "--dry-run"])
+        explain.assert_called_once_with(get_collection.return_value)
+        ensure.assert_not_called()
+
+    def test_prune_indexes(self):
+        _, ensure, explain = self.run_main(["--explain", "--prune-indexes"])
+        self.assertTrue(ensure.call_args.kwargs["prune"])
+        explain.assert_called_once()
+        _, ensure, _ = self.run_main(["--explain"])
+        self.assertFalse(ensure.call_args.kwargs["prune"])
+
+    def test_prune_indexes_is_rejected_with_dry_run(self):
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            with self.assertRaises(SystemExit):
+                main(["--explain", "--dry-run", "--prune-indexes"])
+        self.assertIn("--dry-run", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+from helpers.ingestion_functions import (
+    HASH_FIELD,
+    IngestionReport,
+    content_hash,
+    ingest,
+    iter_records,
+    upsert_records,
+    validate_record,
+)
+
+ENTRIES_DIR = Path(__file__).resolve().parent.parent / "webapp" / "database_entries"
+
+
+class TestIngestionFunctions(unittest.TestCase):
+
+    def setUp(self):
+        with open(ENTRIES_DIR / "_dictionary_DeepACSA_2022.json") as file:
+            self.record = json.load(file)
+
+    def test_validate_record(self):
+        self.assertIsNone(validate_record(self.record))
+        self.assertIn("DATASET_NAME", validate_record({**self.record, "DATASET_NAME": "x"}))
+
+    def test_iter_records_from_jsonl(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = Path(folder) / "entries.jsonl"
+            path.write_text(json.dumps(self.record) + "\n\nnot json\n")
+            entries = list(iter_records(str(path)))
+        self.assertEqual(len(entries), 2)
+        self.assertEqual(entries[0][1]["DATASET_NAME"], "DeepACSA_2022")
+        self.assertTrue(entries[1][0].endswith("entries.jsonl:3"))
+        self.assertIsNotNone(entries[1][2])
+
+    def test_upsert_records_is_keyed_and_batched(self):
+        collection = MagicMock()
+        collection.bulk_write.return_value.bulk_api_result = {"nUpserted": 1, "nModified": 0}
+        report = IngestionReport()
+        upsert_records(collection, [("a", self.record)] * 3, report, batch_size=2)
+
+        self.assertEqual(collection.bulk_write.call_count, 2)
+        operations = collection.bulk_write.call_args_list[0].args[0]
+        self.assertEqual(
+            operations[0]._filter, {"DATASET_NAME": "DeepACSA_2022", "VERSION": "1.0"}
+        )
+        self.assertEqual(report.inserted, 2)
+
+    def test_upsert_records_skips_unchanged_records(self):
+        collection = MagicMock()
+        collection.find.return_value = [
+            {"DATASET_NAME": "DeepACSA_2022", "VERSION": "1.0", HASH_FIELD: content_hash(self.record)}
+        ]
+        changed = {**self.record, "DATASET_NAME": "DeepACSA_2023"}
+        collection.bulk_write.return_value.bulk_api_result = {"nUpserted": 1, "nModified": 0}
+        report = IngestionReport()
+        upsert_records(collection, [("a", self.record), ("b", changed)], report)
+
+        operations = collection.bulk_write.call_args.args[0]
+        self.assertEqual(len(operations), 1)
+        self.assertEqual(operations[0]._doc[HASH_FIELD], content_hash(changed))
+        self.assertEqual(report.unchanged, 1)
+        self.assertEqual(report.inserted, 1)
+        collection.database.__getitem__.return_value.update_one.assert_called_once()
+
+    def test_upsert_records_removes_dropped_fields(self):
+        collection = MagicMock()
+        collection.find.return_value = [
+            {"DATASET_NAME": "DeepACSA_2022", "VERSION": "1.0", HASH_FIELD: content_hash(self.record)}
+        ]
+        reduced = {key: value for key, value in self.record.items() if key != "DOI"}
+        collection.bulk_write.return_value.bulk_api_result = {"nUpserted": 0, "nModified": 1}
+        report = IngestionReport()
+        upsert_records(collection, [("a", reduced)], report)
+
+        operations = collection.bulk_write.call_args.args[0]
+        self.assertEqual(len(operations), 1)
+        self.assertEqual(
+            operations[0]._filter, {"DATASET_NAME": "DeepACSA_2022", "VERSION": "1.0"}
+        )
+        self.assertNotIn("DOI", operations[0]._doc)
+        self.assertNotIn("$set", operations[0]._doc)
+        self.assertEqual(operations[0]._doc[HASH_FIELD], content_hash(reduced))
+        self.assertEqual(report.updated, 1)
+
+    def test_upsert_records_does_not_bump_version_without_changes(self):
+        collection = MagicMock()
+        collection.find.return_value = [
+            {"DATASET_NAME": "DeepACSA_2022", "VERSION": "1.0", HASH_FIELD: content_hash(self.record)}
+        ]
+        report = IngestionReport()
+        upsert_records(collection, [("a", self.record)], report)
+
+        collection.bulk_write.assert_not_called()
+        collection.database.__getitem__.return_value.update_one.assert_not_called()
+
+    def test_content_hash_ignores_key_order_and_stored_fields(self):
+        reordered = dict(reversed(list(self.record.items())))
+        stored = {**self.record, "_id": "x", HASH_FIELD: "y"}
+        self.assertEqual(content_hash(reordered), content_hash(self.record))
+        self.assertEqual(content_hash(stored), content_hash(self.record))
+
+    def test_ingest_reports_invalid_records_without_aborting(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = Path(folder) / "entries.json"
+            path.write_text(json.dumps([self.record, {"DATASET_NAME": "broken"}]))
+            report = ingest(str(path))
+        self.assertEqual(report.read, 2)
+        self.assertEqual(report.valid, 1)
+        self.assertEqual(len(report.errors), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
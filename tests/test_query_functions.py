@@ -0,0 +1,129 @@
+import unittest
+from helpers.query_functions import (
+    build_count_pipeline,
+    build_facet_pipeline,
+    build_projection,
+    build_results_pipeline,
+    build_value_count_pipeline,
+    canonical_query,
+    compile_query,
+    counts_to_frame,
+    field_kind,
+    FIELD_REGISTRY,
+    get_field_spec,
+)
+
+
+class TestQueryFunctions(unittest.TestCase):
+
+    def test_build_facet_pipeline(self):
+        pipeline = build_facet_pipeline(["MUSCLE", "DATA_TYPE"])
+        self.assertEqual(len(pipeline), 1)
+        facets = pipeline[0]["$facet"]
+        self.assertEqual(set(facets), {"MUSCLE", "DATA_TYPE"})
+        self.assertEqual(facets["MUSCLE"][0], {"$unwind": "$MUSCLE"})
+        self.assertEqual(facets["MUSCLE"][1], {"$group": {"_id": "$MUSCLE"}})
+
+    def test_build_projection(self):
+        self.assertEqual(build_projection(None), {"_id": 0, "_content_hash": 0})
+        self.assertEqual(
+            build_projection(["DATASET_NAME", "MUSCLE"]),
+            {"_id": 0, "DATASET_NAME": 1, "MUSCLE": 1},
+        )
+
+    def test_build_count_pipeline(self):
+        pipeline = build_count_pipeline("MUSCLE", "DATA_TYPE", {"DATA_TYPE": "Image"})
+        self.assertEqual(pipeline[0], {"$match": {"DATA_TYPE": "Image"}})
+        self.assertIn({"$unwind": "$value"}, pipeline)
+
+        same_column = build_count_pipeline("MUSCLE", "MUSCLE")
+        self.assertNotIn({"$unwind": "$value"}, same_column)
+
+    def test_build_value_count_pipeline(self):
+        pipeline = build_value_count_pipeline("PARTICIPANT_AGE", {"MUSCLE": {"$in": ["Soleus"]}})
+        self.assertEqual(pipeline[0], {"$match": {"MUSCLE": {"$in": ["Soleus"]}}})
+        self.assertEqual(pipeline[-1]["$group"]["_id"], "$PARTICIPANT_AGE")
+        self.assertEqual(len(build_value_count_pipeline("PARTICIPANT_AGE")), 2)
+
+    def test_counts_to_frame(self):
+        results = [
+            {"_id": {"group": "Soleus", "value": "Image"}, "count": 2},
+            {"_id": {"group": "Deltoid", "value": "Video"}, "count": 1},
+        ]
+        counts = counts_to_frame(results, "MUSCLE", "DATA_TYPE")
+        self.assertEqual(counts.loc["Soleus", "Image"], 2)
+        self.assertEqual(counts.loc["Soleus", "Video"], 0)
+        self.assertEqual(counts.index.name, "MUSCLE")
+
+    def test_build_results_pipeline(self):
+        pipeline = build_results_pipeline({"MUSCLE": {"$in": ["GM"]}}, page=2, page_size=10)
+        self.assertEqual(pipeline[0], {"$match": {"MUSCLE": {"$in": ["GM"]}}})
+        facets = pipeline[1]["$facet"]
+        self.assertEqual(facets["total"], [{"$count": "count"}])
+        rows = facets["rows"]
+        self.assertEqual(list(rows[0]["$sort"])[-1], "_id")
+        self.assertEqual(rows[1:3], [{"$skip": 20}, {"$limit": 10}])
+        self.assertEqual(rows[3]["$project"]["SHORT_DESCRIPTION"], 1)
+        self.assertNotIn("CONTACT", rows[3]["$project"])
+
+    def test_canonical_query(self):
+        self.assertEqual(
+            canonical_query({"MUSCLE": {"$in": ["VL", "GM", "VL"]}, "DATA_TYPE": "Image"}),
+            canonical_query({"DATA_TYPE": "Image", "MUSCLE": {"$in": ["GM", "VL"]}}),
+        )
+        self.assertEqual(
+            canonical_query({"MUSCLE": {"$all": {"VL", "GM"}}}),
+            '{"MUSCLE": {"$all": ["GM", "VL"]}}',
+        )
+        # Array equality is order sensitive and must not be reordered
+        self.assertNotEqual(
+            canonical_query({"MUSCLE": ["VL", "GM"]}),
+            canonical_query({"MUSCLE": ["GM", "VL"]}),
+        )
+        self.assertEqual(canonical_query(None), "{}")
+
+    def test_field_kind(self):
+        self.assertEqual(field_kind("MUSCLE"), "list")
+        self.assertEqual(field_kind("AUTHORS"), "list")
+        self.assertEqual(field_kind("PARTICIPANT_AGE"), "number")
+        self.assertEqual(field_kind("DATA_LABELS"), "bool")
+        self.assertEqual(field_kind("LICENSE"), "str")
+        self.assertEqual(field_kind("UNKNOWN"), "str")
+
+    def test_field_registry(self):
+        self.assertIn("PARTICIPANT_BODYMASS", FIELD_REGISTRY)
+        self.assertIn("Image", FIELD_REGISTRY["DATA_TYPE"].options)
+        self.assertIn("MIT License", get_field_spec("LICENSE").options)
+        age = get_field_spec("PARTICIPANT_AGE")
+        self.assertEqual((age.minimum, age.maximum), (0, 100))
+        self.assertIsNone(get_field_spec("SAMPLE_SIZE").maximum)
+        self.assertIsNone(get_field_spec("AUTHORS").options)
+        self.assertEqual(get_field_spec("UNKNOWN").kind, "str")
+
+    def test_compile_query(self):
+        query = compile_query(
+            {
+                "MUSCLE": ["GM", "VL"],
+                "DEVICE": ["Aixplorer"],
+                "PARTICIPANT_AGE": (20, None),
+                "SAMPLE_SIZE": (None, None),
+                "DATA_LABELS": False,
+                "LICENSE": ["MIT"],
+                "FILE_TYPE": [],
+            },
+            matches={"MUSCLE": "all"},
+        )
+        self.assertEqual(
+            query,
+            {
+                "MUSCLE": {"$all": ["GM", "VL"]},
+                "DEVICE": {"$in": ["Aixplorer"]},
+                "PARTICIPANT_AGE": {"$gte": 20},
+                "DATA_LABELS": False,
+                "LICENSE": {"$in": ["MIT"]},
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
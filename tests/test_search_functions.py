@@ -0,0 +1,59 @@
+import unittest
+from helpers.search_functions import SearchIndex, document_text, tokenize
+
+
+def make_document(name, description, authors=("Jane Doe",)):
+    return {
+        "DATASET_NAME": name,
+        "VERSION": "1.0",
+        "SHORT_DESCRIPTION": description,
+        "DATA_LABELS_DESCRIPTION": None,
+        "AUTHORS": list(authors),
+    }
+
+
+class TestSearchFunctions(unittest.TestCase):
+
+    def setUp(self):
+        self.documents = [
+            make_document("Fascicle_2020", "Fascicle length of the gastrocnemius."),
+            make_document("Area_2021", "Cross-sectional area of the vastus lateralis."),
+            make_document("Both_2022", "Fascicle length and area of the vastus lateralis."),
+        ]
+        self.index = SearchIndex()
+        self.index.update(self.documents, version=1)
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("The Cross-Sectional Area"), ["cross", "sectional", "area"])
+        self.assertIn("Jane Doe", document_text(self.documents[0]))
+
+    def test_search_ranks_matching_documents(self):
+        ranked = self.index.search("gastrocnemius fascicle")
+        self.assertEqual(ranked[0][0], ("Fascicle_2020", "1.0"))
+        self.assertNotIn(("Area_2021", "1.0"), [key for key, _ in ranked])
+        self.assertEqual(len(self.index.search("doe", limit=2)), 2)
+        self.assertEqual(self.index.search("unknownword"), [])
+
+    def test_update_is_incremental(self):
+        self.assertEqual(self.index.update(self.documents, version=1), (0, 0))
+
+        changed = make_document("Area_2021", "Echo intensity of the rectus femoris.")
+        indexed, removed = self.index.update([self.documents[0], changed], version=2)
+        self.assertEqual((indexed, removed), (1, 1))
+        self.assertEqual(len(self.index), 2)
+        self.assertEqual(self.index.search("echo")[0][0], ("Area_2021", "1.0"))
+        self.assertEqual(self.index.search("vastus"), [])
+
+
+    def test_positions_belong_to_the_searched_update(self):
+        version, matches = self.index.search_positions("fascicle")
+        self.assertEqual(version, 1)
+        self.assertEqual(sorted(position for position, _ in matches), [0, 2])
+
+        self.index.update(self.documents[::-1], version=2)
+        version, matches = self.index.search_positions("gastrocnemius")
+        self.assertEqual((version, [position for position, _ in matches]), (2, [2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
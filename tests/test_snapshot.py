@@ -0,0 +1,212 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+import numpy as np
+import pandas as pd
+from pymongo.errors import OperationFailure, PyMongoError
+from helpers.snapshot import (
+    CHANGE_STREAM_UNSUPPORTED,
+    DatasetSnapshot,
+    SnapshotCache,
+    SnapshotRows,
+    load_snapshot,
+    read_snapshot_file,
+    snapshot_path,
+    write_snapshot_file,
+)
+
+
+class TestSnapshotCache(unittest.TestCase):
+
+    def setUp(self):
+        self.version = (1, "a")
+        self.loads = []
+
+        def load(version, refresh=False):
+            self.loads.append(version)
+            self.refreshes.append(refresh)
+            frame = pd.DataFrame({"DATASET_NAME": ["A"]})
+            return DatasetSnapshot.from_frame(frame, version)
+
+        self.refreshes = []
+
+        self.cache = SnapshotCache(load=load, probe=lambda: self.version, ttl=600)
+
+    def test_snapshot_is_shared_until_version_changes(self):
+        first = self.cache.get()
+        self.assertIs(self.cache.get(), first)
+        self.assertEqual(self.loads, [(1, "a")])
+
+        self.version = (2, "b")
+        self.assertIsNot(self.cache.get(), first)
+        self.assertEqual(self.loads, [(1, "a"), (2, "b")])
+
+    def test_invalidate_rebuilds_snapshot(self):
+        first = self.cache.get()
+        self.cache.invalidate()
+        self.assertIsNot(self.cache.get(), first)
+        self.assertEqual(self.refreshes, [False, True])
+
+    def test_watch_reconnects_with_backoff(self):
+        stream = mock.MagicMock()
+        stream.__enter__.return_value = iter([{}, {}])
+        collection = mock.MagicMock()
+        collection.watch.side_effect = [
+            PyMongoError("connection lost"),
+            PyMongoError("connection lost"),
+            stream,
+            OperationFailure("not supported", code=CHANGE_STREAM_UNSUPPORTED),
+        ]
+        sleep = mock.Mock()
+        cache = SnapshotCache(load=None, probe=None)
+        with self.assertLogs("helpers.snapshot", level="WARNING") as logs:
+            cache._watch(collection, sleep=sleep)
+
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [1, 2, 1])
+        self.assertTrue(cache._stale)
+        self.assertIn("connection lost", logs.output[0])
+
+    def test_select_adds_missing_columns(self):
+        snapshot = self.cache.get()
+        selected = snapshot.select(["DATASET_NAME", "MUSCLE"])
+        self.assertEqual(list(selected.columns), ["DATASET_NAME", "MUSCLE"])
+        self.assertEqual(len(selected), 1)
+
+    def test_select_is_decoded_from_compact_form(self):
+        snapshot = self.cache.get()
+        self.assertEqual(snapshot.select(["DATASET_NAME"])["DATASET_NAME"].tolist(), ["A"])
+        self.assertEqual(snapshot.select(["DATASET_NAME"], rows=[]).shape, (0, 1))
+        self.assertIn("TOTAL", snapshot.memory.index)
+
+
+class TestSnapshotFile(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "snapshot.arrow"
+        self.frame = pd.DataFrame(
+            {
+                "DATASET_NAME": ["A", "B"],
+                "MUSCLE": [["Soleus", "Deltoid"], []],
+                "DATA_TYPE": ["Image", None],
+                "PARTICIPANT_AGE": [25.0, None],
+            }
+        )
+        self.snapshot = DatasetSnapshot.from_frame(self.frame, (3, 2, "b"))
+
+    def test_round_trip(self):
+        write_snapshot_file(self.snapshot, self.path)
+        shared = read_snapshot_file(self.path)
+        self.assertEqual(shared.version, (3, 2, "b"))
+        self.assertEqual(shared.digest, self.snapshot.digest)
+        pd.testing.assert_frame_equal(
+            shared.compact.to_frame(), self.snapshot.compact.to_frame()
+        )
+        pd.testing.assert_series_equal(
+            shared.memory["object_bytes"], self.snapshot.memory["object_bytes"]
+        )
+        self.assertEqual(list(self.path.parent.iterdir()), [self.path])
+
+    def test_snapshot_path_is_namespaced_and_configurable(self):
+        collection = mock.Mock()
+        collection.database.name = "muscle_ultrasound"
+        collection.name = "datasets"
+        directory = self.path.parent
+        with mock.patch.dict("os.environ", {"UMUD_SNAPSHOT_DIR": str(directory)}):
+            path = snapshot_path(collection)
+        self.assertEqual(
+            path, directory / "umud_snapshot_muscle_ultrasound_datasets.arrow"
+        )
+        collection.name = "datasets_staging"
+        self.assertNotEqual(snapshot_path(collection, directory), path)
+
+    def test_load_writes_the_file_of_the_collection(self):
+        collection = mock.MagicMock()
+        collection.database.name = "muscle_ultrasound"
+        collection.name = "datasets"
+        collection.find.return_value = [{"DATASET_NAME": "C"}]
+        with mock.patch.dict("os.environ", {"UMUD_SNAPSHOT_DIR": str(self.path.parent)}):
+            with mock.patch("helpers.snapshot.get_data", return_value=collection):
+                load_snapshot((4, 1, "c"))
+        path = snapshot_path(collection, self.path.parent)
+        self.assertEqual(read_snapshot_file(path).version, (4, 1, "c"))
+
+    def test_missing_or_invalid_file(self):
+        self.assertIsNone(read_snapshot_file(self.path))
+        self.path.write_bytes(b"invalid")
+        self.assertIsNone(read_snapshot_file(self.path))
+
+    def test_load_reuses_file_of_same_version(self):
+        write_snapshot_file(self.snapshot, self.path)
+        with mock.patch("helpers.snapshot.get_data") as get_data:
+            shared = load_snapshot((3, 2, "b"), path=self.path)
+        get_data.assert_not_called()
+        self.assertEqual(shared.digest, self.snapshot.digest)
+
+    def test_reused_file_keeps_its_age(self):
+        self.snapshot.created_at = time.monotonic() - 300
+        write_snapshot_file(self.snapshot, self.path)
+        with mock.patch("helpers.snapshot.get_data"):
+            shared = load_snapshot((3, 2, "b"), path=self.path)
+        self.assertAlmostEqual(shared.created_at, self.snapshot.created_at, delta=5)
+
+    def test_load_replaces_file_of_other_version(self):
+        write_snapshot_file(self.snapshot, self.path)
+        documents = [{"DATASET_NAME": "C", "MUSCLE": ["Soleus"]}]
+        with mock.patch("helpers.snapshot.get_data") as get_data:
+            get_data.return_value.find.return_value = documents
+            shared = load_snapshot((4, 1, "c"), path=self.path)
+        self.assertEqual(shared.select(["DATASET_NAME"])["DATASET_NAME"].tolist(), ["C"])
+        self.assertEqual(read_snapshot_file(self.path).version, (4, 1, "c"))
+
+
+class TestSnapshotMatch(unittest.TestCase):
+
+    def test_match_uses_the_index_like_the_codes(self):
+        frame = pd.DataFrame(
+            {
+                "MUSCLE": [["Soleus"], ["Deltoid"], ["Soleus", "Deltoid"], None],
+                "DATA_TYPE": ["Image", "Video", "Image", "Image"],
+                "SAMPLE_SIZE": [10, 20, 30, 40],
+            }
+        )
+        snapshot = DatasetSnapshot.from_frame(frame, None)
+        queries = [
+            {"MUSCLE": {"$in": ["Soleus"]}, "DATA_TYPE": {"$in": ["Image"]}},
+            {"MUSCLE": {"$all": ["Soleus", "Deltoid"]}},
+            {"MUSCLE": {"$in": ["Deltoid"]}, "SAMPLE_SIZE": {"$gte": 25}},
+            {"DATA_TYPE": {"$in": ["Audio"]}},
+            {},
+        ]
+        for query in queries:
+            with self.subTest(query=query):
+                expected = np.flatnonzero(snapshot.compact.match(query))
+                self.assertEqual(snapshot.match(query).tolist(), expected.tolist())
+        self.assertEqual(snapshot.match(queries[2]).tolist(), [2])
+
+
+class TestSnapshotRows(unittest.TestCase):
+
+    def test_rows_are_filtered_sorted_and_taken(self):
+        frame = pd.DataFrame(
+            {
+                "DATASET_NAME": ["C", "A", "B"],
+                "MUSCLE": [["Soleus"], ["Deltoid"], ["Soleus", "Deltoid"]],
+            }
+        )
+        rows = SnapshotRows(DatasetSnapshot.from_frame(frame, None), ["DATASET_NAME", "MUSCLE"])
+        sort_model = [{"colId": "DATASET_NAME", "sort": "asc"}]
+        self.assertEqual(rows.row_ids(sort_model).tolist(), [1, 2, 0])
+        row_ids = rows.row_ids(sort_model, quick_filter="soleus")
+        self.assertEqual(row_ids.tolist(), [2, 0])
+        self.assertEqual(rows.take(row_ids)["DATASET_NAME"].tolist(), ["B", "C"])
+        filter_model = {"MUSCLE": {"filterType": "text", "type": "contains", "filter": "delt"}}
+        row_ids = rows.row_ids(sort_model, filter_model=filter_model)
+        self.assertEqual(row_ids.tolist(), [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
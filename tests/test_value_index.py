@@ -0,0 +1,48 @@
+import unittest
+import pandas as pd
+from helpers.value_index import ValueIndex
+
+
+class TestValueIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = ValueIndex.from_frame(
+            pd.DataFrame(
+                {
+                    "MUSCLE": [["Soleus", "Deltoid"], ["Soleus"], []],
+                    "DATA_TYPE": ["Image", "Video", "Image"],
+                }
+            ),
+            columns=["MUSCLE", "DATA_TYPE"],
+        )
+
+    def test_rows(self):
+        self.assertEqual(self.index.rows("MUSCLE", "Soleus").tolist(), [0, 1])
+        self.assertEqual(self.index.rows("MUSCLE", "Biceps Brachii").tolist(), [])
+        self.assertEqual(self.index.values("DATA_TYPE"), ["Image", "Video"])
+
+    def test_match_any_and_all(self):
+        values = ["Soleus", "Deltoid"]
+        self.assertEqual(self.index.match_any("MUSCLE", values).tolist(), [0, 1])
+        self.assertEqual(self.index.match_all("MUSCLE", values).tolist(), [0])
+
+    def test_query(self):
+        rows = self.index.query({"MUSCLE": ["Soleus"], "DATA_TYPE": ["Image"]})
+        self.assertEqual(rows.tolist(), [0])
+
+    def test_cross_counts(self):
+        counts = self.index.cross_counts("MUSCLE", "DATA_TYPE")
+        self.assertEqual(counts.loc["Soleus"].tolist(), [1, 1])
+        self.assertEqual(counts.loc["Deltoid"].tolist(), [1, 0])
+
+        counts = self.index.cross_counts("DATA_TYPE", "MUSCLE", rows=[1, 2])
+        self.assertEqual(counts.loc["Image"].tolist(), [0, 0])
+        self.assertEqual(counts.loc["Video"].tolist(), [0, 1])
+
+        diagonal = self.index.cross_counts("MUSCLE", "MUSCLE")
+        self.assertEqual(diagonal.loc["Soleus", "Soleus"], 2)
+        self.assertEqual(diagonal.loc["Soleus", "Deltoid"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
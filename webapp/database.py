@@ -1,90 +1,141 @@
 """
-This module connects to a MongoDB database to insert and retrieve muscle ultrasound dataset metadata.
-It uses Streamlit secrets for secure connection management.
+Command line tool to ingest muscle ultrasound dataset metadata into the MongoDB database.
+
+Metadata records are read from a directory of JSON files, a JSON or JSONL file
+or a JSONL stream on stdin, validated against the DatasetMetadata model and
+upserted keyed on DATASET_NAME and VERSION, which are backed by a unique
+index, so rerunning the tool does not create duplicates. Records whose content
+did not change are skipped, and the version counter read by the web app is
+only bumped when documents changed. Invalid records are reported without
+aborting the run.
+
+After ingestion, the secondary indexes derived from DatasetMetadata are
+created if missing. With --prune-indexes, managed indexes that are no longer
+derived from the model are dropped. With --explain, the query plans of one
+sample query per indexed field are printed and queries scanning the whole
+collection are flagged. Explaining only reads, so with --dry-run the plans
+are reported without ingesting or creating indexes.
+
+Examples
+--------
+python database.py database_entries
+python database.py submissions.jsonl --workers 4
+cat submissions.jsonl | python database.py - --dry-run
+python database.py --explain
+python database.py --explain --dry-run
+python database.py database_entries --prune-indexes
 
 Note
 ----
 It is only possible to insert data into the database with access rights to the MongoDB atlas.
+The connection string is taken from the Streamlit secrets unless passed with --uri.
 """
 
-import streamlit as st
+import argparse
+import os
+import sys
 from pymongo import MongoClient
+from helpers.index_functions import ensure_indexes, explain_report
+from helpers.ingestion_functions import ingest
+
+
+def get_collection(uri=None):
+    """
+    Connect to the datasets collection.
+
+    Parameters
+    ----------
+    uri : str, optional
+        MongoDB connection string (default is the one in the Streamlit secrets).
+
+    Returns
+    -------
+    pymongo.collection.Collection
+        The datasets collection.
+    """
+    if uri is None:
+        import streamlit as st
+
+        uri = st.secrets.mongo["CONNECTION_STRING"]
+    client = MongoClient(uri, tls=True)
+    return client.muscle_ultrasound.datasets
+
+
+def main(argv=None):
+    """
+    Run the ingestion command.
+
+    Parameters
+    ----------
+    argv : list, optional
+        Command line arguments (default is sys.argv[1:]).
+
+    Returns
+    -------
+    int
+        Exit code, 1 if any record was rejected.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "source",
+        nargs="?",
+        help="Directory of JSON files, a JSON/JSONL file or '-' for stdin.",
+    )
+    parser.add_argument("--uri", help="MongoDB connection string.")
+    parser.add_argument(
+        "--batch-size", type=int, default=500, help="Records per bulk write."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of validation worker processes.",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only validate, do not write."
+    )
+    parser.add_argument(
+        "--explain",
+        action="store_true",
+        help="Report the query plans of the indexed fields.",
+    )
+    parser.add_argument(
+        "--prune-indexes",
+        action="store_true",
+        help="Drop managed indexes that are no longer derived from the model.",
+    )
+    args = parser.parse_args(argv)
+    if args.source is None and not args.explain:
+        parser.error("a source is required unless --explain is given")
+    if args.prune_indexes and args.dry_run:
+        parser.error("--prune-indexes drops indexes and cannot be used with --dry-run")
+
+    # Explaining only reads, so the database is also opened for a dry run
+    collection = None
+    if not args.dry_run or args.explain:
+        collection = get_collection(args.uri)
+    exit_code = 0
+    if args.source is not None:
+        report = ingest(
+            args.source,
+            collection=None if args.dry_run else collection,
+            batch_size=args.batch_size,
+            workers=args.workers,
+        )
+        print(report.summary())
+        exit_code = 1 if report.errors else 0
+
+    if not args.dry_run:
+        indexes = ensure_indexes(collection, prune=args.prune_indexes)
+        print(
+            f"Indexes created: {len(indexes['created'])}, "
+            f"existing: {len(indexes['existing'])}, "
+            f"dropped: {len(indexes['dropped'])}"
+        )
+    if args.explain:
+        print(explain_report(collection))
+    return exit_code
+
 
-MONGO_URI = st.secrets.mongo["CONNECTION_STRING"]
-
-# Connect to MongoDB
-client = MongoClient(MONGO_URI)
-
-# Select the database and collection
-db = client.muscle_ultrasound
-collection = db.datasets
-
-# Example data
-dictionary = [
-    {
-        "DATASET_NAME": "AnkleImage_2024",
-        "DOI": "10.6019/S-BIAD1482",
-        "VERSION": "1.0",
-        "MUSCLE": [
-            "Tibialis Anterior",
-            "Soleus",
-            "Gastrocnemius Medialis",
-            "Gastrocnemius Lateralis"
-        ],
-        "MUSCLE_REGION": [
-            "Middle"
-        ],
-        "DEVICE": ["S-Sharp Prodigy"],
-        "TRANSDUCER": [
-            "L7.5SC Prodigy Probe"
-        ],
-        "DATA_TYPE": "Image",
-        "FILE_TYPE": [
-            "png",
-            "jpg"
-        ],
-        "IMAGE_TYPE": [
-            "Static"
-        ],
-        "IMAGE_NUMBER": 69440,
-        "VIDEO_NUMBER": None,
-        "DATA_PLANE": [
-            "Longitudinal"
-        ],
-        "SCANNING_FREQUENCY": 6,
-        "SAMPLING_RATE": 1000,
-        "PARTICIPANT_AGE": 26,
-        "PARTICIPANT_HEIGHT": 176,
-        "PARTICIPANT_BODYMASS": 75,
-        "PARTICIPANT_SEX": "Both",
-        "SAMPLE_SIZE": 10,
-        "DATA_LABELS": True,
-        "DATA_LABELS_DESCRIPTION": "The dataset contains annotatoins of fascicle and aponeurosis (sometimes partly, using Ultratrack), thickness, displacement, and echogenicity. Labels can be converted to binary but are sometimes limited to one fascicle and one aponeurosis line per image. For description of folder structure please check publication. ",
-        "SHORT_DESCRIPTION": "Ultrafast ultrasound dataset of the human ankle joint during isometric, isokinetic, and dynamic platar flextions as well as treadmill walking. It contains B-mode and radio frequency ultrasound images from A total of ten young participants (7 males and 3 females, age: 26.1\u2009\u00b1\u20092.5 years, height: 1.76\u2009\u00b1\u20090.08\u2009m, mass: 75.0\u2009\u00b1\u200915.4\u2009kg) with no record of neuromuscular or musculoskeletal disorders. Data were collected using a clinical-grade linear US transducer (L7.5SC Prodigy Probe, S-Sharp, Taiwan, 6.4 MHz, up to 1000 FPS). The linear US array transducer, with a width of 38\u2009mm and comprising 128 channels, was configured with a pitch of 0.3\u2009mm. Imaged muscles include the gastrocnemius medialis and lateralis, tibialis anterior and soleus muscles. The probe was affixed to the muscle using a using a specially designed holder (3-D printed) capable of one degree of freedom (DOF), enabling the adjustment of the US probe\u2019s orientation perpendicular to the skin. For description of folder structure please check publication.",
-        "DATASET_YEAR": "2024",
-        "PUBLICATION_LINK": "https://www.nature.com/articles/s41597-024-04285-x#Sec18",
-        "DATASET_LINK": "https://ftp.ebi.ac.uk/biostudies/fire/S-BIAD/482/S-BIAD1482/Files/",
-        "AUTHORS": [
-            "Qiang Zhang",
-            "Noor Hakam",
-            "Oluwasegun Akinniyi",
-            "Ashwin Iyer",
-            "Xuefeng Bao",
-            "Nitin Sharma"
-        ],
-        "CONTACT": "qiang.zhang@ua.edu",
-        "LICENSE": "Creative Commons Attribution 4.0 International (CC BY 4.0)"
-    }
-]
-
-
-# Insert data into the collection
-# Uncomment the next line to insert template data into database
-collection.insert_many(dictionary)
-
-# Retrieve and print data from the collection
-query = {"DATASET_NAME": "AnkleImage_2024"}
-results = collection.find(query)
-
-# Print the result, DATASET_LINK must be present
-print([result["DATASET_LINK"] for result in results])
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,764 @@
+import json
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from helpers.query_functions import FIELD_REGISTRY
+
+
+def _categories(options, values):
+    """
+    Build the categories of a field from its Enum options.
+
+    Stored values missing from the Enum, e.g. legacy entries, are appended in
+    sorted order so that no value is lost.
+
+    Parameters
+    ----------
+    options : list or None
+        The Enum values of the field.
+    values : iterable
+        The stored values.
+
+    Returns
+    -------
+    pandas.Index
+        The categories.
+    """
+    options = list(options or [])
+    known = set(options)
+    extra = sorted({value for value in values if value not in known}, key=str)
+    return pd.Index(options + extra)
+
+
+def _as_list(value):
+    """
+    Treat scalars as single-element lists and missing values as empty lists.
+    """
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return value
+    if _is_missing(value):
+        return []
+    return [value]
+
+
+def _is_missing(value):
+    """
+    Check whether a scalar value is missing.
+    """
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+def _code_dtype(size):
+    """
+    Get the smallest integer dtype holding the codes of ``size`` categories.
+    """
+    for dtype in (np.int8, np.int16, np.int32):
+        if size < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+class ListCodes:
+    """
+    Integer-coded list column in compressed sparse row layout.
+
+    The codes of row ``i`` are ``codes[offsets[i]:offsets[i + 1]]``.
+
+    Parameters
+    ----------
+    offsets : numpy.ndarray
+        Start of the codes of each row, with one trailing entry.
+    codes : numpy.ndarray
+        The codes of all rows, concatenated.
+    categories : pandas.Index
+        The value of each code.
+    """
+
+    def __init__(self, offsets, codes, categories):
+        self.offsets = offsets
+        self.codes = codes
+        self.categories = categories
+
+    @classmethod
+    def from_series(cls, series, options=None):
+        """
+        Encode a series of lists.
+
+        Parameters
+        ----------
+        series : pandas.Series
+            The list column. Scalars are treated as single-element lists,
+            missing values as empty lists and missing list items are dropped.
+        options : list, optional
+            The Enum values used as leading categories.
+
+        Returns
+        -------
+        ListCodes
+            The encoded column.
+        """
+        lists = [
+            [item for item in _as_list(value) if not _is_missing(item)]
+            for value in series
+        ]
+        values = [item for items in lists for item in items]
+        categories = _categories(options, values)
+        lookup = {value: code for code, value in enumerate(categories)}
+        codes = np.fromiter(
+            (lookup[value] for value in values),
+            dtype=_code_dtype(len(categories)),
+            count=len(values),
+        )
+        offsets = np.zeros(len(lists) + 1, dtype=np.int32)
+        np.cumsum([len(items) for items in lists], out=offsets[1:])
+        return cls(offsets, codes, categories)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self):
+        """
+        int: Memory used by the offsets, codes and categories.
+        """
+        return (
+            self.offsets.nbytes
+            + self.codes.nbytes
+            + self.categories.memory_usage(deep=True)
+        )
+
+    def row_ids(self):
+        """
+        Get the row of each code.
+
+        Returns
+        -------
+        numpy.ndarray
+            Row ids aligned with ``codes``.
+        """
+        rows = np.arange(len(self), dtype=np.int32)
+        return np.repeat(rows, np.diff(self.offsets))
+
+    def to_lists(self):
+        """
+        Decode the column into lists of values.
+
+        Returns
+        -------
+        list
+            The list of values of each row.
+        """
+        values = self.categories.to_numpy()[self.codes]
+        return [
+            list(values[start:end])
+            for start, end in zip(self.offsets[:-1], self.offsets[1:])
+        ]
+
+    def take(self, rows):
+        """
+        Decode the lists of the given rows only.
+
+        Parameters
+        ----------
+        rows : array-like
+            The rows to decode.
+
+        Returns
+        -------
+        list
+            The list of values of each row.
+        """
+        categories = self.categories.to_numpy()
+        starts = self.offsets[rows]
+        ends = self.offsets[np.asarray(rows) + 1]
+        return [
+            list(categories[self.codes[start:end]]) for start, end in zip(starts, ends)
+        ]
+
+    def first_codes(self):
+        """
+        Get the code of the first value of each row.
+
+        Returns
+        -------
+        numpy.ndarray
+            The first code of each row, -1 for empty lists.
+        """
+        padded = np.append(self.codes.astype(np.int64), -1)
+        first = padded[self.offsets[:-1]]
+        first[np.diff(self.offsets) == 0] = -1
+        return first
+
+    def counts(self):
+        """
+        Count the rows containing each value, using the integer codes.
+
+        Returns
+        -------
+        pandas.Series
+            The number of rows per value, for the values that occur.
+        """
+        counts = np.bincount(self.codes, minlength=len(self.categories))
+        return pd.Series(counts, index=self.categories)[counts > 0]
+
+    def match_any(self, values):
+        """
+        Get a mask of the rows containing at least one of the values.
+
+        Parameters
+        ----------
+        values : list
+            The values to look up.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean mask of the rows.
+        """
+        return self.match_codes(np.flatnonzero(self.categories.isin(values)))
+
+    def match_codes(self, codes):
+        """
+        Get a mask of the rows containing at least one of the codes.
+
+        Parameters
+        ----------
+        codes : numpy.ndarray
+            The codes to look up.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean mask of the rows.
+        """
+        mask = np.zeros(len(self), dtype=bool)
+        mask[self.row_ids()[np.isin(self.codes, codes)]] = True
+        return mask
+
+
+def _label_ranks(categories):
+    """
+    Rank categories by their lowercase label, for sorting rows by their codes.
+
+    Parameters
+    ----------
+    categories : pandas.Index
+        The categories.
+
+    Returns
+    -------
+    numpy.ndarray
+        The rank of each category, followed by NaN for the missing code -1.
+    """
+    labels = np.array([str(value).lower() for value in categories], dtype=object)
+    ranks = np.empty(len(labels) + 1)
+    ranks[np.argsort(labels, kind="stable")] = np.arange(len(labels))
+    ranks[-1] = np.nan
+    return ranks
+
+
+def _matching_codes(categories, text):
+    """
+    Get the codes of the categories whose lowercase label contains a text.
+    """
+    labels = pd.Series([str(value).lower() for value in categories], dtype=object)
+    return np.flatnonzero(labels.str.contains(text, regex=False).to_numpy(dtype=bool))
+
+
+class CompactCatalogue:
+    """
+    Memory efficient representation of the datasets catalogue.
+
+    Scalar fields with an Enum vocabulary become ``pd.Categorical`` columns,
+    numeric fields nullable numbers, flags nullable booleans and free text
+    Arrow-backed strings. List fields are stored as ListCodes.
+
+    Attributes
+    ----------
+    frame : pandas.DataFrame
+        The scalar columns.
+    lists : dict
+        Mapping of list fields to ListCodes.
+    columns : list
+        All columns, in their original order.
+    """
+
+    def __init__(self, frame, lists, columns=None):
+        self.frame = frame
+        self.lists = lists
+        self.columns = list(frame.columns) + list(lists) if columns is None else columns
+
+    @classmethod
+    def from_frame(cls, df, registry=FIELD_REGISTRY):
+        """
+        Build the compact representation of a catalogue dataframe.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            The catalogue with one row per document.
+        registry : dict, optional
+            The field descriptions (default is FIELD_REGISTRY).
+
+        Returns
+        -------
+        CompactCatalogue
+            The compact catalogue.
+        """
+        df = df.reset_index(drop=True)
+        columns = {}
+        lists = {}
+        for column in df.columns:
+            series = df[column]
+            spec = registry.get(column)
+            kind = spec.kind if spec is not None else "str"
+            if kind == "list":
+                lists[column] = ListCodes.from_series(series, spec.options)
+            elif kind == "number":
+                numbers = pd.to_numeric(series, errors="coerce")
+                integral = (numbers.dropna() % 1 == 0).all()
+                columns[column] = numbers.astype("Int32" if integral else "Float64")
+            elif kind == "bool":
+                columns[column] = series.astype("boolean")
+            elif spec is not None and spec.options:
+                present = series.dropna()
+                dtype = pd.CategoricalDtype(_categories(spec.options, present))
+                columns[column] = series.astype(dtype)
+            else:
+                values = series.map(
+                    lambda value: None if _is_missing(value) else str(value)
+                )
+                columns[column] = values.astype(pd.StringDtype("pyarrow"))
+        return cls(pd.DataFrame(columns, index=df.index), lists, list(df.columns))
+
+    def __len__(self):
+        return len(self.frame)
+
+    def to_frame(self, columns=None):
+        """
+        Decode the catalogue into a dataframe with list columns.
+
+        Parameters
+        ----------
+        columns : list, optional
+            The columns to decode (default is all columns). Unknown columns
+            are added as empty columns.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The decoded catalogue.
+        """
+        columns = self.columns if columns is None else columns
+        df = pd.DataFrame(index=self.frame.index)
+        for column in columns:
+            if column in self.lists:
+                df[column] = self.lists[column].to_lists()
+            elif column in self.frame.columns:
+                df[column] = self.frame[column]
+            else:
+                df[column] = None
+        return df
+
+    def take(self, rows, columns=None):
+        """
+        Decode the given rows only.
+
+        Parameters
+        ----------
+        rows : array-like
+            The positions of the rows, in the order of the result.
+        columns : list, optional
+            The columns to decode (default is all columns). Unknown columns
+            are added as empty columns.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The decoded rows, indexed by their positions.
+        """
+        columns = self.columns if columns is None else columns
+        rows = np.asarray(rows, dtype=np.int64)
+        index = pd.Index(rows)
+        df = pd.DataFrame(index=index)
+        for column in columns:
+            if column in self.lists:
+                df[column] = self.lists[column].take(rows)
+            elif column in self.frame.columns:
+                df[column] = self.frame[column].take(rows).set_axis(index)
+            else:
+                df[column] = None
+        return df
+
+    def value_codes(self, columns):
+        """
+        Get the row and code of every value of the given columns.
+
+        List columns and categorical columns return their stored codes, other
+        columns are factorized.
+
+        Parameters
+        ----------
+        columns : list
+            The columns to include. Unknown columns are skipped.
+
+        Returns
+        -------
+        dict
+            Mapping of columns to (rows, codes, categories) tuples, with -1 as
+            the code of missing values.
+        """
+        result = {}
+        for column in columns:
+            if column in self.lists:
+                codes = self.lists[column]
+                result[column] = (codes.row_ids(), codes.codes, codes.categories)
+            elif column in self.frame.columns:
+                series = self.frame[column]
+                if isinstance(series.dtype, pd.CategoricalDtype):
+                    codes, categories = series.array.codes, series.cat.categories
+                else:
+                    codes, categories = pd.factorize(series)
+                result[column] = (np.arange(len(series)), codes, categories)
+        return result
+
+    def row_model(self, sort_model=None, quick_filter=None, columns=None):
+        """
+        Filter and sort the rows on their codes, like an AG Grid row model.
+
+        Equivalent to ``apply_row_model(self.to_frame(columns), ...)`` without
+        decoding the catalogue: the quick filter is matched against the
+        categories of list and categorical columns and the sort keys are the
+        ranks of their labels. List columns are sorted by their first value
+        only.
+
+        Parameters
+        ----------
+        sort_model : list, optional
+            AG Grid sort model, e.g. [{"colId": "DATASET_NAME", "sort": "asc"}].
+        quick_filter : str, optional
+            Text that must occur in at least one column of a row.
+        columns : list, optional
+            The columns searched and sortable (default is all columns).
+
+        Returns
+        -------
+        numpy.ndarray
+            The positions of the matching rows, in display order.
+        """
+        columns = self.columns if columns is None else columns
+        rows = np.arange(len(self))
+        if quick_filter:
+            text = quick_filter.lower()
+            mask = np.zeros(len(self), dtype=bool)
+            for column in columns:
+                mask |= self._text_mask(column, text)
+            rows = rows[mask]
+
+        sort_model = [item for item in sort_model or [] if item.get("colId") in columns]
+        if sort_model:
+            names = [item["colId"] for item in sort_model]
+            keys = pd.DataFrame(
+                {
+                    column: self._sort_key(column).take(rows).to_numpy()
+                    for column in names
+                },
+                index=rows,
+            )
+            rows = keys.sort_values(
+                names,
+                ascending=[item.get("sort", "asc") == "asc" for item in sort_model],
+                kind="stable",
+                na_position="last",
+            ).index.to_numpy()
+        return rows
+
+    def match(self, query):
+        """
+        Evaluate a query compiled by compile_query on the codes.
+
+        List fields match if they contain the values, like in MongoDB.
+        Missing fields and missing values never match.
+
+        Parameters
+        ----------
+        query : dict
+            The query document, using ``$in``, ``$all``, ``$gte``, ``$lte``
+            or equality predicates.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean mask of the matching rows.
+
+        Raises
+        ------
+        ValueError
+            If the query uses another operator.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for column, predicate in (query or {}).items():
+            if not isinstance(predicate, dict):
+                predicate = {"$eq": predicate}
+            for operator, operand in predicate.items():
+                if operator == "$in":
+                    mask &= self._isin(column, operand)
+                elif operator == "$all":
+                    for value in operand:
+                        mask &= self._isin(column, [value])
+                elif operator == "$eq":
+                    mask &= self._isin(column, [operand])
+                elif operator in ("$gte", "$lte") and column in self.frame.columns:
+                    values = pd.to_numeric(self.frame[column], errors="coerce")
+                    matches = values >= operand if operator == "$gte" else values <= operand
+                    mask &= matches.fillna(False).to_numpy(dtype=bool)
+                elif operator in ("$gte", "$lte"):
+                    mask[:] = False
+                else:
+                    raise ValueError(f"Unsupported query operator: {operator}")
+        return mask
+
+    def _isin(self, column, values):
+        """
+        Get a mask of the rows whose value of a column is one of the values.
+        """
+        if column in self.lists:
+            return self.lists[column].match_any(values)
+        if column not in self.frame.columns:
+            return np.zeros(len(self), dtype=bool)
+        return self.frame[column].isin(values).fillna(False).to_numpy(dtype=bool)
+
+    def _text_mask(self, column, text):
+        """
+        Get a mask of the rows whose value of a column contains a lowercase text.
+        """
+        if column in self.lists:
+            codes = self.lists[column]
+            return codes.match_codes(_matching_codes(codes.categories, text))
+        if column not in self.frame.columns:
+            return np.zeros(len(self), dtype=bool)
+        series = self.frame[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            matching = _matching_codes(series.cat.categories, text)
+            return np.isin(series.array.codes, matching)
+        values = series.astype(pd.StringDtype("pyarrow")).str.lower()
+        return values.str.contains(text, regex=False).fillna(False).to_numpy(dtype=bool)
+
+    def _sort_key(self, column):
+        """
+        Get the sort key of a column, with missing values as NaN.
+        """
+        if column in self.lists:
+            # Empty lists sort first, like their empty text
+            codes = self.lists[column]
+            ranks = _label_ranks(codes.categories)
+            ranks[-1] = -1
+            return pd.Series(ranks[codes.first_codes()])
+        if column not in self.frame.columns:
+            return pd.Series(np.full(len(self), np.nan))
+        series = self.frame[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            ranks = _label_ranks(series.cat.categories)
+            return pd.Series(ranks[series.array.codes])
+        if pd.api.types.is_numeric_dtype(series):
+            return series
+        return series.astype(pd.StringDtype("pyarrow")).str.lower()
+
+    def long_table(self, columns):
+        """
+        Build the long-format table of the given columns from the codes.
+
+        Equivalent to ``build_long_table(self.to_frame(), columns)`` without
+        decoding the list columns first.
+
+        Parameters
+        ----------
+        columns : list
+            The list or categorical columns to include.
+
+        Returns
+        -------
+        pandas.DataFrame
+            A dataframe with the columns "row", "field" and "value".
+        """
+        parts = []
+        for column, (rows, codes, categories) in self.value_codes(columns).items():
+            present = codes >= 0
+            parts.append(
+                pd.DataFrame(
+                    {
+                        "row": rows[present].astype(np.int64),
+                        "field": column,
+                        "value": categories.to_numpy(dtype=object)[codes[present]],
+                    }
+                )
+            )
+        if not parts:
+            return pd.DataFrame(
+                {
+                    "row": np.array([], dtype=np.int64),
+                    "field": np.array([], dtype=object),
+                    "value": np.array([], dtype=object),
+                }
+            )
+        return pd.concat(parts, ignore_index=True)
+
+    def to_arrow(self, metadata=None):
+        """
+        Convert the catalogue into an Arrow table without decoding it.
+
+        Categorical columns are stored as their integer codes (-1 for missing
+        values) and list fields as Arrow lists of codes. The categories are
+        kept in the field metadata. Other columns keep their Arrow type.
+
+        Parameters
+        ----------
+        metadata : dict, optional
+            Additional schema metadata, with string keys and values.
+
+        Returns
+        -------
+        pyarrow.Table
+            The encoded catalogue.
+        """
+        fields = []
+        arrays = []
+        for column in self.columns:
+            if column in self.lists:
+                codes = self.lists[column]
+                array = pa.ListArray.from_arrays(
+                    pa.array(codes.offsets), pa.array(codes.codes)
+                )
+                info = {"kind": "list", "categories": list(codes.categories)}
+            else:
+                series = self.frame[column]
+                if isinstance(series.dtype, pd.CategoricalDtype):
+                    array = pa.array(series.array.codes)
+                    info = {
+                        "kind": "category",
+                        "categories": list(series.cat.categories),
+                    }
+                else:
+                    array = pa.Array.from_pandas(series)
+                    info = {"kind": "scalar", "dtype": str(series.dtype)}
+            fields.append(
+                pa.field(
+                    column,
+                    array.type,
+                    metadata={"umud": json.dumps(info, default=str)},
+                )
+            )
+            arrays.append(array)
+        return pa.Table.from_arrays(
+            arrays, schema=pa.schema(fields, metadata=metadata)
+        )
+
+    @classmethod
+    def from_arrow(cls, table):
+        """
+        Rebuild the catalogue from an Arrow table written by ``to_arrow``.
+
+        The codes, offsets and strings are views of the Arrow buffers, so a
+        memory-mapped table is not copied into the process.
+
+        Parameters
+        ----------
+        table : pyarrow.Table
+            The encoded catalogue.
+
+        Returns
+        -------
+        CompactCatalogue
+            The compact catalogue.
+
+        Raises
+        ------
+        ValueError
+            If a categorical column has codes outside of its categories.
+        """
+        index = pd.RangeIndex(table.num_rows)
+        columns = {}
+        lists = {}
+        for field, column in zip(table.schema, table.columns):
+            info = json.loads(field.metadata[b"umud"])
+            array = column.combine_chunks() if column.num_chunks != 1 else column.chunk(0)
+            if info["kind"] == "list":
+                lists[field.name] = ListCodes(
+                    array.offsets.to_numpy(),
+                    array.values.to_numpy(),
+                    pd.Index(info["categories"]),
+                )
+            elif info["kind"] == "category":
+                codes = array.to_numpy()
+                dtype = pd.CategoricalDtype(info["categories"])
+                if len(codes) and (
+                    codes.min() < -1 or codes.max() >= len(dtype.categories)
+                ):
+                    raise ValueError(f"Invalid category codes in column '{field.name}'")
+                # The codes stay a view of the buffer
+                columns[field.name] = pd.Series(
+                    pd.Categorical.from_codes(codes, dtype=dtype),
+                    index=index,
+                    copy=False,
+                )
+            else:
+                if info["dtype"] == "string":
+                    dtype = pd.StringDtype("pyarrow")
+                else:
+                    dtype = pd.api.types.pandas_dtype(info["dtype"])
+                columns[field.name] = pd.Series(
+                    dtype.__from_arrow__(column), index=index
+                )
+        frame = pd.DataFrame(columns, index=index, copy=False)
+        return cls(frame, lists, table.column_names)
+
+    def memory_usage(self):
+        """
+        Get the memory used by each column in bytes.
+
+        Returns
+        -------
+        pandas.Series
+            Bytes per column.
+        """
+        usage = self.frame.memory_usage(deep=True, index=False)
+        lists = pd.Series(
+            {column: codes.nbytes for column, codes in self.lists.items()}, dtype=np.int64
+        )
+        return pd.concat([usage, lists]).astype(np.int64)
+
+
+def memory_report(df, compact):
+    """
+    Compare the memory per column of a catalogue and its compact form.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame or pandas.Series
+        The catalogue with object columns, or its memory usage per column.
+    compact : CompactCatalogue
+        The compact catalogue built from ``df``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The dtype and bytes of each column before and after compaction, and
+        the ratio between them, with a final "TOTAL" row.
+    """
+    if isinstance(df, pd.DataFrame):
+        before = df.memory_usage(deep=True, index=False)
+    else:
+        before = df
+    after = compact.memory_usage().reindex(before.index)
+    dtypes = {column: str(dtype) for column, dtype in compact.frame.dtypes.items()}
+    dtypes.update({column: "list codes" for column in compact.lists})
+    report = pd.DataFrame(
+        {
+            "dtype": pd.Series(dtypes).reindex(before.index),
+            "object_bytes": before,
+            "compact_bytes": after,
+        }
+    )
+    report.loc["TOTAL"] = ["", before.sum(), after.sum()]
+    report["ratio"] = report["object_bytes"] / report["compact_bytes"]
+    return report
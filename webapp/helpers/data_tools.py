@@ -1,31 +1,209 @@
-import streamlit as st 
+import streamlit as st
+import numpy as np
+import pandas as pd
 from io import BytesIO
-import base64
+from itertools import chain
+from pathlib import Path
+import hashlib
+import os
+import shutil
+import tempfile
+import time
 import urllib.parse
-from st_aggrid import AgGrid, GridOptionsBuilder
 
-def clean_dataframe(df):
+# Folder served by streamlit under "app/static".
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+
+# Limits of the published downloads: files older than a day are removed, and
+# the oldest files are removed first once they take more than 1 GiB.
+DOWNLOADS_MAX_AGE = 24 * 60 * 60
+DOWNLOADS_MAX_BYTES = 1024**3
+
+# Lone surrogates are the only characters that cannot be encoded as UTF-8.
+_SURROGATES = r"[\ud800-\udfff]"
+
+# Scalar types that are passed to the grid unchanged.
+_JSON_SCALARS = [str, int, float, bool, type(None)]
+
+
+def _clean_strings(series):
+    """
+    Remove characters that cannot be encoded as UTF-8 from a string series.
+
+    Only the rows that actually contain such characters are re-encoded.
+
+    Parameters
+    ----------
+    series : pandas.Series
+        A series containing only strings.
+
+    Returns
+    -------
+    pandas.Series
+        The cleaned series.
+    """
+    invalid = series.str.contains(_SURROGATES, regex=True, na=False)
+    if invalid.any():
+        series = series.copy()
+        series[invalid] = (
+            series[invalid]
+            .str.encode("utf-8", "ignore")
+            .str.decode("utf-8", "ignore")
+        )
+    return series
+
+
+def _clean_lists(series):
+    """
+    Clean the elements of a series of lists, keeping them as lists.
+
+    Parameters
+    ----------
+    series : pandas.Series
+        A series containing only lists, tuples or sets.
+
+    Returns
+    -------
+    pandas.Series
+        The cleaned series of lists.
+    """
+    lengths = series.map(len).to_numpy()
+    flat = pd.Series(list(chain.from_iterable(series)), dtype=object)
+    flat = _clean_values(flat).to_numpy()
+    parts = np.split(flat, np.cumsum(lengths)[:-1]) if len(series) else []
+    return pd.Series([part.tolist() for part in parts], index=series.index, dtype=object)
+
+
+def _clean_values(series):
+    """
+    Clean an object series holding strings, lists and other objects.
+
+    Strings are cleaned, lists are cleaned element-wise and other objects
+    (e.g. ObjectIds) are converted to their string representation.
+
+    Parameters
+    ----------
+    series : pandas.Series
+        The series to be cleaned.
+
+    Returns
+    -------
+    pandas.Series
+        The cleaned series.
+    """
+    if pd.api.types.infer_dtype(series, skipna=True) == "string":
+        return _clean_strings(series)
+
+    types = series.map(type)
+    is_str = types.isin([str])
+    is_list = types.isin([list, tuple, set])
+    is_other = ~types.isin(_JSON_SCALARS) & ~is_list
+
+    series = series.copy()
+    if is_str.any():
+        series[is_str] = _clean_strings(series[is_str])
+    if is_list.any():
+        series[is_list] = _clean_lists(series[is_list])
+    if is_other.any():
+        series[is_other] = series[is_other].astype(str)
+    return series
+
+
+def clean_dataframe(df, columns=None):
     """
     Clean the dataframe to ensure all data is properly encoded and formatted.
 
+    Strings are stripped of characters that cannot be encoded as UTF-8, list
+    columns stay lists with cleaned elements and other objects such as
+    ObjectIds are converted to strings. The input dataframe is not modified.
+
     Parameters
     ----------
     df : pandas.DataFrame
         The input dataframe to be cleaned.
+    columns : list, optional
+        The columns to keep and clean (default is all columns).
 
     Returns
     -------
     pandas.DataFrame
         The cleaned dataframe with properly encoded and formatted data.
     """
+    if columns is not None:
+        df = df[[col for col in columns if col in df.columns]]
+
+    # Dedicated string dtypes can only hold valid UTF-8 and are skipped
+    cleaned = {
+        col: _clean_values(df[col]) for col in df.columns if df[col].dtype == object
+    }
+    return df.assign(**cleaned)
+
+
+# Metadata columns holding lists of values.
+LIST_COLUMNS = ["MUSCLE_REGION", "MUSCLE", "DEVICE", "DATA_PLANE", "IMAGE_TYPE", "FILE_TYPE"]
+
+
+def build_long_table(df, list_columns=LIST_COLUMNS):
+    """
+    Build a long-format table of all values of the given list columns.
+
+    Every element of every list becomes one row holding the position of the
+    dataset in ``df``, the column name and the value. Scalar cells are
+    treated as single-element lists and missing values are dropped.
 
-    for col in df.select_dtypes(include=[object]).columns:
-        df[col] = (
-            df[col]
-            .astype(str)
-            .apply(lambda x: x.encode("utf-8", "ignore").decode("utf-8", "ignore"))
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The input dataframe.
+    list_columns : list, optional
+        The list columns to include (default is LIST_COLUMNS).
+
+    Returns
+    -------
+    pandas.DataFrame
+        A dataframe with the columns "row", "field" and "value".
+    """
+    parts = []
+    for col in list_columns:
+        if col not in df.columns:
+            continue
+        values = pd.Series(df[col].to_numpy(), dtype=object).explode().dropna()
+        parts.append(
+            pd.DataFrame(
+                {
+                    "row": values.index.to_numpy(dtype=np.int64),
+                    "field": col,
+                    "value": values.to_numpy(dtype=object),
+                }
+            )
+        )
+    if not parts:
+        return pd.DataFrame(
+            {
+                "row": np.array([], dtype=np.int64),
+                "field": np.array([], dtype=object),
+                "value": np.array([], dtype=object),
+            }
         )
-    return df
+    return pd.concat(parts, ignore_index=True)
+
+
+def hash_dataframe(df):
+    """
+    Compute a content hash of a dataframe, including list columns.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The dataframe to be hashed.
+
+    Returns
+    -------
+    str
+        Hex digest of the dataframe content.
+    """
+    content = df.to_json(orient="split", default_handler=str, date_format="iso")
+    return hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest()
 
 
 def get_categorical_columns(df):
@@ -45,56 +223,642 @@ def get_categorical_columns(df):
     return df.select_dtypes(include=["object", "category"]).columns.tolist()
 
 
-def filter_dataframe(df):
+def _text_values(series):
     """
-    Display an interactive, filterable dataframe using st_aggrid and provide a download button.
+    Convert a series to comparable strings, joining list values with commas.
+
+    Parameters
+    ----------
+    series : pandas.Series
+        The series to convert.
+
+    Returns
+    -------
+    pandas.Series
+        The lowercase string value of each row, empty for missing values.
+    """
+
+    def _to_text(value):
+        if isinstance(value, (list, tuple, np.ndarray)):
+            return ", ".join(str(item) for item in value)
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            return ""
+        return str(value)
+
+    return series.map(_to_text).str.lower()
+
+
+# Comparisons of the AG Grid number filter.
+_NUMBER_FILTERS = {
+    "equals": lambda values, a, b: values == a,
+    "notEqual": lambda values, a, b: values != a,
+    "lessThan": lambda values, a, b: values < a,
+    "lessThanOrEqual": lambda values, a, b: values <= a,
+    "greaterThan": lambda values, a, b: values > a,
+    "greaterThanOrEqual": lambda values, a, b: values >= a,
+    "inRange": lambda values, a, b: (values >= a) & (values <= b),
+    "blank": lambda values, a, b: values.isna(),
+    "notBlank": lambda values, a, b: values.notna(),
+}
+
+# Comparisons of the AG Grid text filter.
+_TEXT_FILTERS = {
+    "contains": lambda values, text: values.str.contains(text, regex=False),
+    "notContains": lambda values, text: ~values.str.contains(text, regex=False),
+    "equals": lambda values, text: values == text,
+    "notEqual": lambda values, text: values != text,
+    "startsWith": lambda values, text: values.str.startswith(text),
+    "endsWith": lambda values, text: values.str.endswith(text),
+    "blank": lambda values, text: values == "",
+    "notBlank": lambda values, text: values != "",
+}
+
+
+def _filter_mask(series, condition):
+    """
+    Evaluate a single AG Grid column filter on a series.
+
+    Parameters
+    ----------
+    series : pandas.Series
+        The filtered column.
+    condition : dict
+        The column filter, e.g. {"filterType": "text", "type": "contains",
+        "filter": "gastrocnemius"}, or several of them combined as
+        {"operator": "AND", "conditions": [...]}.
+
+    Returns
+    -------
+    pandas.Series
+        Boolean mask of the matching rows.
+
+    Raises
+    ------
+    ValueError
+        If the filter type is not supported.
+    """
+    if "conditions" in condition:
+        masks = [_filter_mask(series, part) for part in condition["conditions"]]
+        combine = np.logical_or if condition.get("operator") == "OR" else np.logical_and
+        return pd.Series(
+            combine.reduce(masks, initial=combine is np.logical_and), index=series.index
+        )
+    kind = condition.get("type", "contains")
+    if condition.get("filterType") == "number":
+        if kind not in _NUMBER_FILTERS:
+            raise ValueError(f"Unsupported number filter: {kind}")
+        values = pd.to_numeric(series, errors="coerce")
+        mask = _NUMBER_FILTERS[kind](
+            values, condition.get("filter"), condition.get("filterTo")
+        )
+        return mask.fillna(False).astype(bool)
+    if kind not in _TEXT_FILTERS:
+        raise ValueError(f"Unsupported text filter: {kind}")
+    text = str(condition.get("filter", "")).lower()
+    return _TEXT_FILTERS[kind](_text_values(series), text)
+
+
+def apply_row_model(df, sort_model=None, filter_model=None, quick_filter=None):
+    """
+    Filter and sort a dataframe on the server, like an AG Grid row model.
+
+    The index of the dataframe is preserved, so that the rows of the result
+    can be traced back to the rows of the source, e.g. the snapshot.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The source dataframe.
+    sort_model : list, optional
+        AG Grid sort model, e.g. [{"colId": "DATASET_NAME", "sort": "asc"}].
+    filter_model : dict, optional
+        AG Grid filter model, mapping column names to column filters.
+    quick_filter : str, optional
+        Text that must occur in at least one column of a row.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The filtered and sorted rows.
+    """
+    mask = pd.Series(True, index=df.index)
+    for column, condition in (filter_model or {}).items():
+        if column in df.columns:
+            mask &= _filter_mask(df[column], condition)
+    if quick_filter:
+        text = quick_filter.lower()
+        matches = pd.Series(False, index=df.index)
+        for column in df.columns:
+            matches |= _text_values(df[column]).str.contains(text, regex=False)
+        mask &= matches
+    rows = df[mask]
+
+    sort_model = [
+        item for item in sort_model or [] if item.get("colId") in df.columns
+    ]
+    if sort_model:
+        columns = [item["colId"] for item in sort_model]
+        keys = pd.DataFrame(
+            {
+                column: (
+                    rows[column]
+                    if pd.api.types.is_numeric_dtype(rows[column])
+                    else _text_values(rows[column]).mask(rows[column].isna())
+                )
+                for column in columns
+            },
+            index=rows.index,
+        )
+        order = keys.sort_values(
+            columns,
+            ascending=[item.get("sort", "asc") == "asc" for item in sort_model],
+            kind="stable",
+            na_position="last",
+        ).index
+        rows = rows.loc[order]
+    return rows
+
+
+class FrameRows:
+    """
+    Rows of a dataframe, served to the server-side row model of the grid.
+
+    Other row sources, e.g. the dataset snapshot, implement the same
+    ``columns``, ``row_ids`` and ``take`` interface.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The source dataframe.
+    """
+
+    def __init__(self, df):
+        self.df = df
+
+    @property
+    def columns(self):
+        """
+        list: The columns of the rows.
+        """
+        return list(self.df.columns)
+
+    def row_ids(self, sort_model=None, quick_filter=None, filter_model=None):
+        """
+        Filter and sort the rows, see apply_row_model.
+
+        Returns
+        -------
+        pandas.Index
+            The ids of the matching rows, in display order.
+        """
+        rows = apply_row_model(
+            self.df,
+            sort_model=sort_model,
+            filter_model=filter_model,
+            quick_filter=quick_filter,
+        )
+        return rows.index
+
+    def take(self, row_ids):
+        """
+        Get the rows with the given ids.
+
+        Parameters
+        ----------
+        row_ids : pandas.Index
+            The row ids.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The rows, in the order of ``row_ids``.
+        """
+        return self.df.loc[row_ids]
+
+
+# Hidden grid column holding the index label of each row in the source dataframe.
+ROW_ID_COLUMN = "_row_id"
+
+
+# Grid return function of the read-only mode: only the ids of the selected
+# rows and the filter model are sent back, never the row data.
+_READ_ONLY_GRID_RETURN = f"""
+function({{streamlitRerunEventTriggerName, eventData}}) {{
+    if (!eventData || !eventData.api) {{
+        return null;
+    }}
+    return {{
+        selected: eventData.api.getSelectedRows().map(row => row["{ROW_ID_COLUMN}"]),
+        filterModel: eventData.api.getFilterModel(),
+    }};
+}}
+"""
+
+
+def _grid_state(response):
+    """
+    Get the selection and the filter model reported by a read-only grid.
+
+    Parameters
+    ----------
+    response : st_aggrid.collectors.custom.CustomResponse or dict or None
+        The grid response, see _show_grid.
+
+    Returns
+    -------
+    tuple
+        The list of selected row ids and the AG Grid filter model.
+    """
+    state = getattr(response, "raw_data", response) or {}
+    return list(state.get("selected") or []), dict(state.get("filterModel") or {})
+
+
+def _resolve_rows(df, row_ids):
+    """
+    Get the rows of a dataframe with the given ids, in their original order.
+
+    Ids that are not in ``df``, e.g. from a grid response of a previous
+    rerun, are ignored.
 
     Parameters
     ----------
     df : pandas.DataFrame
-        The input dataframe to be filtered.
+        The dataframe shown in the grid.
+    row_ids : list
+        The row ids returned by the grid.
 
     Returns
     -------
     pandas.DataFrame
-        The filtered dataframe based on user interactions.
+        The rows of ``df`` with these ids.
     """
+    return df[df.index.isin(row_ids)]
+
+
+def _show_grid(df, key, read_only, paginate, filter_model=None):
+    """
+    Show a dataframe in AgGrid.
+
+    In read-only mode, cells are not editable, enterprise modules are off and
+    the grid only reports selection and filter changes. The index labels of
+    the dataframe are sent along in a hidden column. The grid returns the ids
+    of the selected rows and its filter model through a custom return
+    function (DataReturnMode.CUSTOM), so no row data is sent back; see
+    _grid_state.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The dataframe to show.
+    key : str
+        Key of the grid.
+    read_only : bool
+        Use the read-only mode.
+    paginate : bool
+        Paginate the grid in the browser. Otherwise the grid shows a single
+        block of rows and cannot be sorted in the browser. Its column filters
+        are only reported in read-only mode, to be applied to all rows on the
+        server.
+    filter_model : dict, optional
+        AG Grid filter model restored when the grid is shown.
+
+    Returns
+    -------
+    st_aggrid.AgGridReturn or st_aggrid.collectors.custom.CustomResponse
+        The grid response.
+    """
+    from st_aggrid import (
+        AgGrid,
+        DataReturnMode,
+        GridOptionsBuilder,
+        GridUpdateMode,
+        JsCode,
+    )
+
+    if read_only:
+        df = df.assign(**{ROW_ID_COLUMN: df.index})
     gb = GridOptionsBuilder.from_dataframe(df)
-    gb.configure_pagination()
-    gb.configure_default_column(editable=True, groupable=True)
+    if paginate:
+        gb.configure_pagination()
+    else:
+        # Sorting a single block in the browser would be misleading
+        gb.configure_default_column(sortable=False, filter=read_only)
+    if filter_model:
+        gb.configure_grid_options(initialState={"filter": {"filterModel": filter_model}})
     gb.configure_selection(selection_mode="multiple", use_checkbox=True)
-    gb.configure_side_bar()
-    grid_options = gb.build()
-    grid_response = AgGrid(df, gridOptions=grid_options, enable_enterprise_modules=True)
-    return grid_response["data"]
 
+    if not read_only:
+        gb.configure_default_column(editable=True, groupable=True)
+        gb.configure_side_bar()
+        return AgGrid(
+            df, gridOptions=gb.build(), enable_enterprise_modules=True, key=key
+        )
+
+    gb.configure_default_column(editable=False)
+    gb.configure_column(ROW_ID_COLUMN, hide=True)
+    return AgGrid(
+        df,
+        gridOptions=gb.build(),
+        update_mode=(
+            GridUpdateMode.SELECTION_CHANGED | GridUpdateMode.FILTERING_CHANGED
+        ),
+        update_on=["selectionChanged", "filterChanged"],
+        data_return_mode=DataReturnMode.CUSTOM,
+        custom_jscode_for_grid_return=JsCode(_READ_ONLY_GRID_RETURN),
+        enable_enterprise_modules=False,
+        key=key,
+    )
+
+
+def filter_dataframe(
+    df, server_side=False, block_size=100, key="grid", read_only=False
+):
+    """
+    Display an interactive, filterable dataframe using st_aggrid and provide a download button.
+
+    With the server-side row model, the rows are filtered and sorted in
+    Python and only one block of rows is sent to the grid, so the payload
+    does not grow with the size of the catalogue. Only this block is taken
+    from the row source and cleaned. In read-only mode, the filter model of
+    the last grid response is applied to all rows of the row source.
+
+    In read-only mode, the ids of the selected rows, i.e. their index labels
+    in ``df``, are stored in ``st.session_state[f"{key}_selection"]``. The
+    grid only reports its filter model, which is applied to ``df`` again with
+    apply_row_model.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame or FrameRows
+        The input dataframe to be filtered. With the server-side row model,
+        any row source with the interface of FrameRows.
+    server_side : bool, optional
+        Use the server-side row model (default is False).
+    block_size : int, optional
+        Number of rows per block of the server-side row model (default is 100).
+    key : str, optional
+        Key prefix of the grid and its widgets (default is "grid").
+    read_only : bool, optional
+        Show the grid in read-only mode (default is False).
+
+    Returns
+    -------
+    pandas.DataFrame or pandas.Index
+        The filtered dataframe based on user interactions. In read-only mode,
+        the filtered rows of ``df`` in their original index. With the
+        server-side row model, the ids of the filtered rows in display order.
+    """
+    if not server_side:
+        grid_response = _show_grid(df, key, read_only, paginate=True)
+        if not read_only:
+            return grid_response["data"]
+        selection, filter_model = _grid_state(grid_response)
+        st.session_state[f"{key}_selection"] = selection
+        return apply_row_model(df, filter_model=filter_model)
+
+    rows = df if hasattr(df, "row_ids") else FrameRows(df)
+
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        quick_filter = st.text_input("Search Rows", key=f"{key}_search")
+    with col2:
+        sort_column = st.selectbox(
+            "Sort By", [None] + rows.columns, key=f"{key}_sort"
+        )
+    with col3:
+        descending = st.checkbox("Descending", key=f"{key}_descending")
+    sort_model = None
+    if sort_column is not None:
+        sort_model = [{"colId": sort_column, "sort": "desc" if descending else "asc"}]
+
+    filter_model = {}
+    if read_only:
+        # The component value of the last rerun, see _grid_state
+        _, filter_model = _grid_state(st.session_state.get(f"{key}_view"))
+    row_ids = rows.row_ids(
+        sort_model=sort_model, quick_filter=quick_filter, filter_model=filter_model
+    )
+
+    # Only the requested block is taken, cleaned and sent to the browser
+    block_count = max(1, -(-len(row_ids) // block_size))
+    block = 1
+    if block_count > 1:
+        block = st.number_input(
+            "Block", min_value=1, max_value=block_count, value=1, key=f"{key}_block"
+        )
+    start = (block - 1) * block_size
+    view = clean_dataframe(rows.take(row_ids[start : start + block_size]))
+    st.caption(
+        f"Rows {min(start + 1, len(row_ids))}-{start + len(view)} of {len(row_ids)}"
+    )
+
+    grid_response = _show_grid(
+        view, f"{key}_view", read_only, paginate=False, filter_model=filter_model
+    )
+    if read_only:
+        selection, _ = _grid_state(grid_response)
+        st.session_state[f"{key}_selection"] = selection
+    return row_ids
+
+
+# Export formats offered for download: name -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "JSONL": ("jsonl", "application/x-ndjson"),
+}
+
+
+def _join_lists(df):
+    """
+    Join the list cells of a dataframe with commas, e.g. for CSV files.
+    """
+
+    def _join(value):
+        if isinstance(value, (list, tuple, np.ndarray)):
+            return ", ".join(str(item) for item in value)
+        return value
+
+    joined = {col: df[col].map(_join) for col in df.columns if df[col].dtype == object}
+    return df.assign(**joined)
 
 
-def get_download_button(df, filename="filtered_data.csv"):
+def iter_export_chunks(df, fmt, chunk_rows=1000):
     """
-    Generate a link to download the filtered dataframe as a CSV file.
+    Serialise a dataframe chunk by chunk.
+
+    CSV files hold list values joined with commas, Parquet and JSONL files
+    keep them as lists.
 
     Parameters
     ----------
     df : pandas.DataFrame
-        The dataframe to be downloaded.
+        The dataframe to be exported.
+    fmt : str
+        One of the keys of EXPORT_FORMATS.
+    chunk_rows : int, optional
+        Number of rows serialised per chunk (default is 1000).
+
+    Yields
+    ------
+    bytes
+        The next chunk of the serialised dataframe.
+    """
+    starts = range(0, len(df), chunk_rows)
+
+    if fmt == "CSV":
+        if len(df) == 0:
+            yield df.to_csv(index=False).encode("utf-8")
+        for start in starts:
+            chunk = _join_lists(df.iloc[start : start + chunk_rows])
+            yield chunk.to_csv(index=False, header=start == 0).encode("utf-8")
+
+    elif fmt == "JSONL":
+        for start in starts:
+            chunk = df.iloc[start : start + chunk_rows]
+            lines = chunk.to_json(orient="records", lines=True, default_handler=str)
+            yield (lines.rstrip("\n") + "\n").encode("utf-8")
+
+    elif fmt == "Parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # Infer the schema from all rows so that every chunk matches it
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+        sink = BytesIO()
+        with pq.ParquetWriter(sink, schema) as writer:
+            for start in starts:
+                chunk = df.iloc[start : start + chunk_rows]
+                writer.write_table(
+                    pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                )
+                yield sink.getvalue()
+                sink.seek(0)
+                sink.truncate()
+        yield sink.getvalue()
+
+    else:
+        raise ValueError(f"Unknown export format '{fmt}'.")
+
+
+def export_token(df, *parts):
+    """
+    Compute a cheap token identifying a selection of rows and columns.
+
+    Only the row ids and the columns are hashed, not the values, so
+    ``parts`` must identify the data the rows were selected from, e.g. the
+    snapshot digest or the collection version and page.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame or pandas.Index
+        The selected rows, or their ids.
+    *parts : object
+        Identifiers of the underlying data, with a stable ``repr``.
+
+    Returns
+    -------
+    str
+        Hex digest of the selection.
+    """
+    if isinstance(df, pd.DataFrame):
+        index, columns = df.index, list(df.columns)
+    else:
+        index, columns = df, None
+    rows = pd.util.hash_pandas_object(index, index=False).to_numpy()
+    digest = hashlib.sha256(rows.tobytes())
+    digest.update(repr((columns, parts)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+# Uses st.cache_data so that identical selections are only serialised once.
+@st.cache_data(max_entries=16, show_spinner=False)
+def _export_url(token, fmt, filename, _df):
+    """
+    Serialise a dataframe into a static file, cached by selection and format.
+
+    Parameters
+    ----------
+    token : str
+        Token of the selection in ``_df``, used as cache key.
+    fmt : str
+        One of the keys of EXPORT_FORMATS.
+    filename : str
+        The name of the file.
+    _df : pandas.DataFrame
+        The dataframe to be exported. Not hashed by streamlit.
+
+    Returns
+    -------
+    str
+        The URL of the file, relative to the app.
+    """
+    return publish_chunks(iter_export_chunks(_df, fmt), filename)
+
+
+def get_download_button(df, filename="filtered_data.csv", key="download", token=None):
+    """
+    Generate a link to download the filtered dataframe.
+
+    The file is only built after the user requests it. It is streamed chunk
+    by chunk into a static file and cached by the selection token, so reruns
+    neither serialise the data again nor keep it in memory.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame or callable
+        The dataframe to be downloaded, or a function returning it, which is
+        only called when the export is prepared.
     filename : str, optional
-        The name of the file to be downloaded (default is "filtered_data.csv").
+        The name of the file to be downloaded, its extension is replaced by
+        the one of the selected format (default is "filtered_data.csv").
+    key : str, optional
+        Unique key of the export widgets (default is "download").
+    token : str, optional
+        Token of the selection as returned by export_token (default is the
+        token of the row index and columns of ``df``). Required if ``df`` is
+        a function.
 
     Returns
     -------
-    streamlit.download_button
-        A Streamlit download button for the CSV file.
+    str or None
+        The URL of the prepared file, or None if no file is prepared.
     """
-    buffer = BytesIO()
-    df.to_csv(buffer, index=False)
-    buffer.seek(0)
-    return st.download_button(
-        label="Download Filtered Data as CSV",
-        data=buffer,
-        file_name=filename,
-        mime="text/csv",
+    fmt = st.selectbox("Export Format", list(EXPORT_FORMATS), key=f"{key}_format")
+    extension, mime = EXPORT_FORMATS[fmt]
+    token = export_token(df) if token is None else token
+    filename = f"{Path(filename).stem}.{extension}"
+
+    state_key = f"{key}_prepared"
+    if st.button(f"Prepare {fmt} Export", key=f"{key}_prepare"):
+        data = df() if callable(df) else df
+        url = _export_url(token, fmt, filename, data)
+        if not published_path(url).exists():
+            # The cached file was pruned, publish it again
+            _export_url.clear()
+            url = _export_url(token, fmt, filename, data)
+        st.session_state[state_key] = (token, fmt, url)
+
+    prepared = st.session_state.get(state_key)
+    if prepared is None or prepared[1] != fmt:
+        return None
+
+    # Only serve the prepared file if the selection did not change since
+    if prepared[0] != token:
+        del st.session_state[state_key]
+        return None
+
+    # The file may have been pruned since it was prepared
+    url = prepared[2]
+    if not published_path(url).exists():
+        del st.session_state[state_key]
+        return None
+
+    st.markdown(
+        f'<a href="{url}" download="{filename}" type="{mime}">Download Filtered Data as {fmt}</a>',
+        unsafe_allow_html=True,
     )
+    return url
 
 
 def create_email_link(subject, body, recipient, filenames):
@@ -124,13 +888,174 @@ def create_email_link(subject, body, recipient, filenames):
     return mailto_link
 
 
+def prune_downloads(
+    downloads, keep=None, max_age=DOWNLOADS_MAX_AGE, max_bytes=DOWNLOADS_MAX_BYTES
+):
+    """
+    Remove published downloads that are too old or exceed the size limit.
+
+    Parameters
+    ----------
+    downloads : pathlib.Path
+        The downloads folder of the static file cache.
+    keep : pathlib.Path, optional
+        A directory that is never removed, e.g. the one just published.
+    max_age : float, optional
+        Maximum age of a download in seconds (default is DOWNLOADS_MAX_AGE).
+    max_bytes : int, optional
+        Maximum total size of the downloads (default is DOWNLOADS_MAX_BYTES).
+
+    Returns
+    -------
+    int
+        The number of removed entries.
+    """
+    entries = []
+    for path in Path(downloads).iterdir():
+        try:
+            if path.is_dir():
+                files = [item.stat() for item in path.iterdir()]
+                size = sum(stat.st_size for stat in files)
+            else:
+                size = path.stat().st_size
+            entries.append((path.stat().st_mtime, size, path))
+        except OSError:
+            # Removed by another session in the meantime
+            continue
+
+    now = time.time()
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for mtime, size, path in sorted(entries):
+        if path == keep or (now - mtime <= max_age and total <= max_bytes):
+            continue
+        # Unfinished temporary files of running exports are left alone
+        if path.name.startswith(".") and now - mtime <= max_age:
+            continue
+        if path.is_dir():
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+        total -= size
+        removed += 1
+    return removed
+
+
+def published_path(url, root=STATIC_DIR):
+    """
+    Get the file of a URL returned by publish_chunks.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the file, relative to the app.
+    root : pathlib.Path, optional
+        The static folder of the app (default is STATIC_DIR).
+
+    Returns
+    -------
+    pathlib.Path
+        The published file, which may have been pruned since.
+    """
+    return Path(root) / urllib.parse.unquote(url[len("app/static/"):])
+
+
+def publish_chunks(chunks, filename, root=STATIC_DIR):
+    """
+    Stream content into the static file cache and return a short URL to it.
+
+    The chunks are written to a temporary file while they are hashed, so the
+    content is never held in memory as a whole. Files are content-addressed,
+    so publishing the same content again returns the same URL. The folder is
+    served by streamlit under "app/static" (see server.enableStaticServing).
+
+    Every publication prunes the cache, see prune_downloads, so a URL is only
+    valid for a limited time. The cache is local to the host, so the URL only
+    works on the replica that published the file; deployments with several
+    replicas need sticky sessions.
+
+    Parameters
+    ----------
+    chunks : iterable
+        The content of the file as bytes chunks.
+    filename : str
+        The name of the file.
+    root : pathlib.Path, optional
+        The static folder of the app (default is STATIC_DIR).
+
+    Returns
+    -------
+    str
+        The URL of the file, relative to the app.
+    """
+    filename = Path(filename).name
+    downloads = Path(root) / "downloads"
+    downloads.mkdir(parents=True, exist_ok=True)
+
+    # Write to a unique temporary file first so that no partial file is
+    # served and concurrent sessions do not write to the same file
+    descriptor, temporary = tempfile.mkstemp(
+        dir=downloads, prefix=f".{filename}.", suffix=".tmp"
+    )
+    try:
+        digest = hashlib.sha256()
+        with os.fdopen(descriptor, "wb") as stream:
+            for chunk in chunks:
+                digest.update(chunk)
+                stream.write(chunk)
+        target = downloads / digest.hexdigest()[:16] / filename
+        if target.exists():
+            os.unlink(temporary)
+        else:
+            target.parent.mkdir(exist_ok=True)
+            os.replace(temporary, target)
+        # Republished files count as recent
+        os.utime(target.parent)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.unlink(temporary)
+        raise
+
+    prune_downloads(downloads, keep=target.parent)
+
+    return f"app/static/downloads/{target.parent.name}/{urllib.parse.quote(filename)}"
+
+
+def publish_file(content, filename, root=STATIC_DIR):
+    """
+    Store content in the static file cache and return a short URL to it.
+
+    Parameters
+    ----------
+    content : str or bytes
+        The content of the file.
+    filename : str
+        The name of the file.
+    root : pathlib.Path, optional
+        The static folder of the app (default is STATIC_DIR).
+
+    Returns
+    -------
+    str
+        The URL of the file, relative to the app (see publish_chunks).
+    """
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    return publish_chunks([data], filename, root=root)
+
+
 def get_download_link(content, filename, mime):
     """
     Generate a link to download the given content as a file.
 
+    The content is served as a static file instead of being embedded into
+    the page as a base64 data URI.
+
     Parameters
     ----------
-    content : str
+    content : str or bytes
         The content to be downloaded.
     filename : str
         The name of the file to be downloaded.
@@ -142,6 +1067,5 @@ def get_download_link(content, filename, mime):
     str
         An HTML string containing the download link.
     """
-    b64 = base64.b64encode(content.encode()).decode()  # Convert to base64
-    href = f'<a href="data:{mime};base64,{b64}" download="{filename}">Download detailed instructions...</a>'
-    return href
\ No newline at end of file
+    href = publish_file(content, filename)
+    return f'<a href="{href}" download="{filename}" type="{mime}">Download detailed instructions...</a>'
@@ -1,153 +1,346 @@
 import streamlit as st
-import ast
-import matplotlib.pyplot as plt
+import json
+import threading
+from collections import OrderedDict
+from io import BytesIO
 import pandas as pd
 import numpy as np
-from st_aggrid import AgGrid, GridOptionsBuilder
-import seaborn as sns
-from matplotlib.colors import ListedColormap
-from matplotlib.lines import Line2D
+from helpers.data_tools import hash_dataframe
+from helpers.loading_functions import get_collection_version
+from helpers.query_functions import get_chart_counts, get_value_counts
+from helpers.value_index import ValueIndex
+
+# Columns required by display_charts.
+CHART_COLUMNS = [
+    "DATASET_NAME",
+    "MUSCLE_REGION",
+    "MUSCLE",
+    "DEVICE",
+    "DATA_TYPE",
+    "DATA_PLANE",
+    "IMAGE_TYPE",
+    "FILE_TYPE",
+    "PARTICIPANT_AGE",
+]
+
+
+class FigureCache:
+    """
+    Thread-safe LRU cache of rendered figures.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        Maximum number of rendered figures kept (default is 64).
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Get a rendered figure and mark it as recently used.
+
+        Parameters
+        ----------
+        key : tuple
+            The cache key.
+
+        Returns
+        -------
+        bytes or None
+            The rendered figure, or None if it is not cached.
+        """
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+            return image
+
+    def put(self, key, image):
+        """
+        Store a rendered figure, evicting the least recently used ones.
+
+        Parameters
+        ----------
+        key : tuple
+            The cache key.
+        image : bytes
+            The rendered figure.
+        """
+        with self._lock:
+            self._images[key] = image
+            self._images.move_to_end(key)
+            while len(self._images) > self.max_entries:
+                self._images.popitem(last=False)
 
 
-def convert_dataframe(df, list_columns):
+# Uses st.cache_resource so that rendered figures are shared across all sessions.
+@st.cache_resource
+def _get_figure_cache():
     """
-    Convert specified list columns in the DataFrame.
+    Create the process-wide cache of rendered figures.
 
-    Parameters:
-    - df: Input DataFrame
-    - list_columns: List of columns to convert
-    Returns:
-    - Converted DataFrame
+    Returns
+    -------
+    FigureCache
+        The figure cache.
+    """
+    return FigureCache()
+
+
+def render_figure(fig, fmt="png"):
+    """
+    Render a figure to bytes and close it.
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        The figure to be rendered.
+    fmt : str, optional
+        The image format, e.g. "png" or "svg" (default is "png").
+
+    Returns
+    -------
+    bytes
+        The rendered figure.
     """
-    for col in list_columns:
-        # Ensure the column is parsed correctly and is a list
-        df[col] = df[col].apply(lambda x: ast.literal_eval(x) if isinstance(x, str) else x)
-        
-    # convert the DataFrame for all specified list columns
-    return df
+    import matplotlib.pyplot as plt
 
+    buffer = BytesIO()
+    try:
+        fig.savefig(buffer, format=fmt, bbox_inches="tight")
+    finally:
+        plt.close(fig)
+    return buffer.getvalue()
 
-def display_charts(df, selected_plots, group_by_column="MUSCLE"):
+
+def plot_distribution(counts, title, xlabel, legend_title):
+    """
+    Plot a stacked bar chart of a count matrix.
+
+    Parameters
+    ----------
+    counts : pandas.DataFrame
+        Count matrix with the groups as index and the values as columns.
+    title : str
+        The title of the chart.
+    xlabel : str
+        The label of the x-axis.
+    legend_title : str
+        The title of the legend.
+
+    Returns
+    -------
+    matplotlib.figure.Figure
+        The bar chart.
+    """
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    counts.plot(kind="bar", ax=ax, stacked=True, legend=True)
+    ax.set_title(title, fontsize=16)
+    ax.set_xlabel(xlabel, fontsize=14)
+    ax.set_ylabel("Count", fontsize=14)
+    ax.legend(title=legend_title, bbox_to_anchor=(1.05, 1), loc="upper left")
+    fig.tight_layout()  # Adjust layout to accommodate the legend
+    return fig
+
+
+def age_dot_positions(ages):
+    """
+    Compute the dot plot positions of the participant ages.
+
+    Datasets with the same age are stacked on top of each other in the
+    order they appear.
+
+    Parameters
+    ----------
+    ages : array-like
+        The participant age of each dataset.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        The x (age) and y (stack height, starting at 1) position of each dot.
+    """
+    xs = np.asarray(ages)
+    ys = pd.Series(xs).groupby(xs).cumcount().to_numpy() + 1
+    return xs, ys
+
+
+def plot_age_distribution(ages, mode="auto", max_dots=500):
+    """
+    Plot the participant ages as a dot plot or a binned histogram.
+
+    Parameters
+    ----------
+    ages : pandas.Series
+        The participant age of each dataset.
+    mode : str, optional
+        "dots" for one marker per dataset, "histogram" for binned counts or
+        "auto" to switch to the histogram for more than ``max_dots`` datasets
+        (default is "auto").
+    max_dots : int, optional
+        Maximum number of datasets drawn as dots in "auto" mode (default is 500).
+
+    Returns
+    -------
+    matplotlib.figure.Figure
+        The age distribution plot.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.ticker import MaxNLocator
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+
+    if mode == "auto":
+        mode = "dots" if len(ages) <= max_dots else "histogram"
+
+    if mode == "histogram":
+        # One bin per year of age
+        edges = np.arange(ages.min(), ages.max() + 2) - 0.5
+        ax.hist(ages, bins=edges, color="#008080", edgecolor="k")
+        ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+    else:
+        xs, ys = age_dot_positions(ages)
+        colors = plt.cm.tab20(np.arange(len(xs)) % 20)  # cycle through colors
+        ax.scatter(xs, ys, c=colors, s=400, alpha=1, edgecolor="k")
+
+        # Set y-axis ticks at every integer (1 unit steps)
+        max_y = int(ys.max())
+        ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+        ax.set_ylim(0.5, max_y + 0.5)
+
+    # Labels and style
+    ax.set_title("Age Distribution", fontsize=16)
+    ax.set_xlabel("Age", fontsize=14)
+    ax.set_ylabel("Count", fontsize=14)
+    ax.grid(True, axis="y", linestyle="--", alpha=0.5)
+    return fig
+
+
+def display_charts(
+    df,
+    selected_plots,
+    group_by_column="MUSCLE",
+    index=None,
+    server_side=False,
+    query=None,
+    rows=None,
+    data_key=None,
+    age_mode="auto",
+):
     """
     Display interactive charts based on the dataframe and user selections.
 
+    Rendered charts are cached by plot type, grouping column, filter, count
+    source and data version, so unchanged charts are not drawn again.
+
     Parameters
     ----------
-    df : pandas.DataFrame
-        The input dataframe for chart generation.
+    df : pandas.DataFrame or None
+        The input dataframe for chart generation. List columns are only read
+        through ``index``, so only the scalar columns are needed when an
+        index is given. Not used with ``server_side``.
     selected_plots : list
         A list of plot types selected by the user.
     group_by_column : str
-        The column name to group the data by for visualization.
+        The column name to group the data by for visualization. Must be one
+        of CHART_COLUMNS.
+    index : ValueIndex, optional
+        Precomputed value index of ``df``. Built on the fly if not given.
+    server_side : bool, optional
+        Compute the distribution counts and ages with MongoDB aggregation
+        pipelines instead of the value index and ``df`` (default is False).
+    query : dict, optional
+        The active filter (default is all documents). Applied by the
+        server-side pipelines; locally, pass the matching ``rows`` as well.
+    rows : numpy.ndarray, optional
+        Sorted row ids of ``df`` matching ``query`` (default is all rows).
+    data_key : str, optional
+        Hash identifying the data in ``df``, e.g. the snapshot digest.
+        Computed from ``df``, or from the collection version with
+        ``server_side``, if not given.
+    age_mode : str, optional
+        Style of the age distribution plot, "dots", "histogram" or "auto"
+        (default is "auto").
     """
     st.subheader("Interactive Charts")
 
-    df = pd.DataFrame(df)
-
-    # Specify the columns that contain- lists
-    list_columns_to_explode = ["MUSCLE_REGION", "MUSCLE", "DEVICE", "DATA_PLANE", "IMAGE_TYPE", "FILE_TYPE"]
-
-    # Explode the DataFrame
-    df_converted = convert_dataframe(df, list_columns_to_explode)
+    if group_by_column not in CHART_COLUMNS:
+        st.warning(f"'{group_by_column}' column is not suitable for the distribution plots.")
+        return
+
+    if server_side:
+        if data_key is None:
+            data_key = get_collection_version()
+    else:
+        df = pd.DataFrame(df).reset_index(drop=True)
+        # The value index replaces exploding the list columns per plot
+        if index is None:
+            index = ValueIndex.from_frame(df)
+        if data_key is None:
+            data_key = hash_dataframe(df)
+
+    def count_values(group, value):
+        if server_side:
+            return get_chart_counts(group, value, query)
+        return index.cross_counts(group, value, rows=rows)
+
+    def participant_ages():
+        if server_side:
+            counts = get_value_counts("PARTICIPANT_AGE", query)
+            return pd.Series(np.repeat(counts.index.to_numpy(), counts.to_numpy()))
+        if "PARTICIPANT_AGE" not in df.columns:
+            return pd.Series([], dtype=float)
+        ages = df["PARTICIPANT_AGE"]
+        return ages if rows is None else ages.iloc[rows]
+
+    figure_cache = _get_figure_cache()
+    source_key = (server_side, json.dumps(query or {}, sort_keys=True, default=str))
 
     for plot in selected_plots:
-        if plot == "Muscle Distribution" and "MUSCLE" in df.columns:
-            fig, ax = plt.subplots()
-
-            if group_by_column in df.columns:
+        key = (plot, group_by_column, data_key, source_key, age_mode)
+        image = figure_cache.get(key)
 
+        if image is None:
+            fig = None
+            if plot == "Muscle Distribution":
                 # Aggregate counts for each unique muscle category
-                df_exploded_muscle = df_converted.explode("MUSCLE")
-                muscle_counts = df_exploded_muscle.groupby([group_by_column, "MUSCLE"]).size()
-                muscle_counts = muscle_counts.unstack(fill_value=0)
-
-                # Sum up counts for overlapping muscle categories
-                combined_counts = muscle_counts.groupby(muscle_counts.columns, axis=1).sum()
-
-                # Plotting the muscle distribution
-                fig, ax = plt.subplots(figsize=(10, 6))
-                combined_counts.plot(kind="bar", ax=ax, stacked=True, legend=True)
-                ax.set_title("Muscle Distribution", fontsize=16)
-                ax.set_xlabel(group_by_column, fontsize=14)
-                ax.set_ylabel("Count", fontsize=14)
-                ax.legend(title="Muscles", bbox_to_anchor=(1.05, 1), loc="upper left")
-                plt.tight_layout()  # Adjust layout to accommodate the legend
-                st.pyplot(fig)
-
-        
-            else:
-                st.warning(
-                    f"'{group_by_column}' column is not suitable for 'Muscle Distribution' plot."
-                )
-        
-        elif plot == "Age Distribution" and "PARTICIPANT_AGE" in df.columns:
-
-            fig, ax = plt.subplots(figsize=(12, 6))
-
-            # Clean age column
-            ages = df["PARTICIPANT_AGE"].dropna().astype(int)
-            names = df["DATASET_NAME"].dropna().astype(str) if "MUSCLE" in df.columns else None
-
-
-            if not ages.empty:
-                # Count occurrences of each age
-                age_counts = {}
-                xs = []
-                ys = []
-                colors = []
-
-                cmap = plt.cm.get_cmap('tab20', len(ages))  # many distinct colors
-
-                for i, age in enumerate(ages):
-                    if age not in age_counts:
-                        age_counts[age] = 0
-                    else:
-                        age_counts[age] += 1
-
-                    xs.append(age)
-                    ys.append(age_counts[age] + 1)
-                    colors.append(cmap(i % cmap.N))  # cycle through colors
-
-                ax.scatter(xs, ys, c=colors, s=400, alpha=1, edgecolor='k')
-
-                # Set y-axis ticks at every integer (1 unit steps)
-                max_y = max(ys)
-                ax.set_yticks(range(1, max_y + 1))  # +2 ensures last tick is shown
-                ax.set_ylim(0.5, max_y + 0.5)
-
-                # Labels and style
-                ax.set_title("Age Distribution", fontsize=16)
-                ax.set_xlabel("Age", fontsize=14)
-                ax.set_ylabel("Count", fontsize=14)
-                ax.grid(True, axis='y', linestyle='--', alpha=0.5)
-
-                st.pyplot(fig)
-            else:
-                st.warning("No valid ages found in 'PARTICIPANT_AGE'.")
-        elif plot == "Data Type Distribution" and "DATA_TYPE" in df.columns:
-            fig, ax = plt.subplots(figsize=(10, 6))
-
-            df_exploded = df_converted.explode("MUSCLE")
-
-            if group_by_column in df.columns:
-                datatype_count = (
-                    df_exploded.groupby(group_by_column)["DATA_TYPE"]
-                    .value_counts()
-                    .unstack(fill_value=0)
-                    .plot(kind="bar", stacked=True, ax=ax)
-                )
-                
-                # Plotting the muscle region distribution
-                ax.set_title("Data Type Distribution", fontsize=16)
-                ax.set_xlabel("Muscle", fontsize=14)
-                ax.set_ylabel("Count", fontsize=14)
-                ax.legend(title="Data Types", bbox_to_anchor=(1.05, 1), loc="upper left")
-                plt.tight_layout()
-                st.pyplot(fig)
-            else:
-                st.warning(
-                    f"'{group_by_column}' column is not suitable for 'Data Type Distribution' plot."
-                )
+                counts = count_values(group_by_column, "MUSCLE")
+                if not counts.empty:
+                    fig = plot_distribution(
+                        counts, "Muscle Distribution", group_by_column, "Muscles"
+                    )
+                else:
+                    st.warning("No muscles found for 'Muscle Distribution'.")
+
+            elif plot == "Age Distribution":
+                # Clean age column
+                ages = participant_ages().dropna().astype(int)
+                if not ages.empty:
+                    fig = plot_age_distribution(ages, mode=age_mode)
+                else:
+                    st.warning("No valid ages found in 'PARTICIPANT_AGE'.")
+
+            elif plot == "Data Type Distribution":
+                counts = count_values(group_by_column, "DATA_TYPE")
+                if not counts.empty:
+                    fig = plot_distribution(
+                        counts, "Data Type Distribution", "Muscle", "Data Types"
+                    )
+                else:
+                    st.warning("No data types found for 'Data Type Distribution'.")
+
+            if fig is None:
+                continue
+            image = render_figure(fig)
+            figure_cache.put(key, image)
+
+        st.image(image, use_column_width=True)
 
 
 # Currently Not Used
@@ -160,6 +353,8 @@ def display_scoreboard(df):
     df : pandas.DataFrame
         The dataframe containing the scoreboard data.
     """
+    from st_aggrid import AgGrid, GridOptionsBuilder
+
     # Add medals to the top three rows
     medals = ["🥇", "🥈", "🥉"] + [""] * (len(df) - 3)
     df.insert(0, "Medal", medals)
@@ -221,6 +416,8 @@ def display_training_metrics_barplot():
     plt.fig
         The barchart displaying the performance scores.
     """
+    import matplotlib.pyplot as plt
+
     # Metrics Data
     models = ["DeepACSA", "DL_Track_US", "Ultratrack", "SMA"]
     val_iou_scores = [0.89, 0.87, 0.81, 0.77]
@@ -270,6 +467,10 @@ def display_comparability_statistics():
     - data: dict
         The dataset containing models and metrics.
     """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from matplotlib.colors import ListedColormap
+
     data = {
         "Model": ["DeepACSA", "DL_Track_US", "Ultratrack", "SMA"],
         "RF.ACSA_ICC": [0.99, None, None, None],
@@ -356,3 +557,4 @@ def display_comparability_statistics():
     )
     ax.set_title(f"All Metrics for {selected_variable}")
     st.pyplot(fig)
+    plt.close(fig)
@@ -0,0 +1,260 @@
+from enum import Enum
+from pydantic import AnyUrl
+from pydantic.fields import SHAPE_SINGLETON
+from pymongo import ASCENDING, IndexModel
+from helpers.query_functions import COMMA_SEPARATED_FIELDS, KEY_FIELDS
+from helpers.pydantic_models import DatasetMetadata
+
+# Prefix of the names of all indexes managed by this module.
+INDEX_PREFIX = "umud_field_"
+
+# String fields with at least this maximum length are free text and not indexed.
+LONG_TEXT_LENGTH = 500
+
+# Links validated as plain strings instead of AnyUrl, not indexed either.
+LINK_FIELDS = ["PUBLICATION_LINK"]
+
+
+class IndexSpec:
+    """
+    Description of a single-field index derived from DatasetMetadata.
+
+    Attributes
+    ----------
+    field : str
+        The indexed metadata field.
+    multikey : bool
+        Whether the field is stored as a list, resulting in a multikey index.
+    name : str
+        The name of the index.
+    """
+
+    def __init__(self, field, multikey=False):
+        self.field = field
+        self.multikey = multikey
+        self.name = f"{INDEX_PREFIX}{field.lower()}"
+
+    def to_model(self):
+        """
+        Convert the specification into a pymongo IndexModel.
+
+        Returns
+        -------
+        pymongo.operations.IndexModel
+            The index model.
+        """
+        return IndexModel([(self.field, ASCENDING)], name=self.name)
+
+    def __repr__(self):
+        return f"IndexSpec({self.field!r}, multikey={self.multikey})"
+
+
+def is_indexed_field(field):
+    """
+    Decide whether a DatasetMetadata field should be indexed.
+
+    Links and long free-text fields are never filtered on exactly and are
+    skipped. The first key field is already covered by the unique index on
+    DATASET_NAME and VERSION.
+
+    Parameters
+    ----------
+    field : pydantic.fields.ModelField
+        The model field.
+
+    Returns
+    -------
+    bool
+        True if the field should be indexed.
+    """
+    type_ = field.type_
+    if field.name == KEY_FIELDS[0] or field.name in LINK_FIELDS:
+        return False
+    if isinstance(type_, type) and issubclass(type_, AnyUrl):
+        return False
+    if isinstance(type_, type) and issubclass(type_, str):
+        if issubclass(type_, Enum):
+            return True
+        max_length = getattr(type_, "max_length", None)
+        if max_length is not None and max_length >= LONG_TEXT_LENGTH:
+            return False
+    return True
+
+
+def build_index_specs(model=DatasetMetadata):
+    """
+    Derive the index set from the metadata model.
+
+    Fields declared as sets, and the comma-separated fields stored as lists,
+    are marked as multikey.
+
+    Parameters
+    ----------
+    model : pydantic.BaseModel, optional
+        The metadata model (default is DatasetMetadata).
+
+    Returns
+    -------
+    list
+        List of IndexSpec, in the field order of the model.
+    """
+    return [
+        IndexSpec(
+            name,
+            multikey=field.shape != SHAPE_SINGLETON or name in COMMA_SEPARATED_FIELDS,
+        )
+        for name, field in model.__fields__.items()
+        if is_indexed_field(field)
+    ]
+
+
+def ensure_indexes(collection, specs=None, prune=False):
+    """
+    Create the missing metadata indexes of a collection.
+
+    Existing indexes are left untouched, so applying the index set again is
+    a no-op.
+
+    Parameters
+    ----------
+    collection : pymongo.collection.Collection
+        The datasets collection.
+    specs : list, optional
+        List of IndexSpec (default is derived from DatasetMetadata).
+    prune : bool, optional
+        Drop managed indexes that are no longer part of the index set
+        (default is False).
+
+    Returns
+    -------
+    dict
+        The names of the "created", "existing" and "dropped" indexes.
+    """
+    specs = build_index_specs() if specs is None else specs
+    existing = set(collection.index_information())
+    wanted = {spec.name for spec in specs}
+
+    missing = [spec.to_model() for spec in specs if spec.name not in existing]
+    created = collection.create_indexes(missing) if missing else []
+
+    dropped = []
+    if prune:
+        for name in sorted(existing - wanted):
+            if name.startswith(INDEX_PREFIX):
+                collection.drop_index(name)
+                dropped.append(name)
+
+    return {
+        "created": list(created),
+        "existing": sorted(existing & wanted),
+        "dropped": dropped,
+    }
+
+
+def _collect_plan(plan, stages, indexes):
+    """
+    Collect the stage and index names of a (nested) query plan.
+    """
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        if "indexName" in plan:
+            indexes.append(plan["indexName"])
+        for value in plan.values():
+            _collect_plan(value, stages, indexes)
+    elif isinstance(plan, list):
+        for value in plan:
+            _collect_plan(value, stages, indexes)
+
+
+def explain_query(collection, query):
+    """
+    Explain a query and summarise its winning plan.
+
+    Parameters
+    ----------
+    collection : pymongo.collection.Collection
+        The datasets collection.
+    query : dict
+        The query filter.
+
+    Returns
+    -------
+    dict
+        The query, the stages and index names of the winning plan, whether
+        the plan scans the whole collection ("collscan"), and the number of
+        documents examined and returned.
+    """
+    explanation = collection.find(query).explain()
+    stages = []
+    indexes = []
+    plan = explanation.get("queryPlanner", {}).get("winningPlan", {})
+    _collect_plan(plan, stages, indexes)
+    statistics = explanation.get("executionStats", {})
+    return {
+        "query": query,
+        "stages": stages,
+        "indexes": indexes,
+        "collscan": "COLLSCAN" in stages,
+        "examined": statistics.get("totalDocsExamined"),
+        "returned": statistics.get("nReturned"),
+    }
+
+
+def sample_queries(collection, specs=None):
+    """
+    Build one equality query per indexed field from a sample document.
+
+    Parameters
+    ----------
+    collection : pymongo.collection.Collection
+        The datasets collection.
+    specs : list, optional
+        List of IndexSpec (default is derived from DatasetMetadata).
+
+    Returns
+    -------
+    list
+        The query filters.
+    """
+    specs = build_index_specs() if specs is None else specs
+    sample = collection.find_one({}, projection={"_id": 0}) or {}
+    queries = []
+    for spec in specs:
+        value = sample.get(spec.field)
+        if isinstance(value, list):
+            if not value:
+                continue
+            value = value[0]
+        if value is not None:
+            queries.append({spec.field: value})
+    return queries
+
+
+def explain_report(collection, queries=None):
+    """
+    Explain a set of queries and flag those scanning the whole collection.
+
+    Parameters
+    ----------
+    collection : pymongo.collection.Collection
+        The datasets collection.
+    queries : list, optional
+        The query filters (default is one query per indexed field).
+
+    Returns
+    -------
+    str
+        One line per query, prefixed with "COLLSCAN" or "ok".
+    """
+    queries = sample_queries(collection) if queries is None else queries
+    lines = []
+    for query in queries:
+        result = explain_query(collection, query)
+        status = "COLLSCAN" if result["collscan"] else "ok"
+        plan = " > ".join(result["stages"])
+        lines.append(
+            f"{status:8} {query} [{plan}] examined: {result['examined']}, "
+            f"returned: {result['returned']}"
+        )
+    return "\n".join(lines)
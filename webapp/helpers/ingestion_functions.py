@@ -0,0 +1,400 @@
+import hashlib
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from pydantic import ValidationError
+from pymongo import ASCENDING, ReplaceOne
+from pymongo.errors import BulkWriteError, OperationFailure
+from helpers.loading_functions import HASH_FIELD, VERSIONS_COLLECTION
+from helpers.pydantic_models import DatasetMetadata
+from helpers.query_functions import COMMA_SEPARATED_FIELDS, KEY_FIELDS
+
+# Name of the unique index on KEY_FIELDS.
+KEY_INDEX = "umud_dataset_key"
+
+
+class IngestionReport:
+    """
+    Summary of an ingestion run.
+
+    Attributes
+    ----------
+    read : int
+        Number of records read from the source.
+    valid : int
+        Number of records that passed validation.
+    inserted : int
+        Number of records inserted as new documents.
+    updated : int
+        Number of existing documents that were modified.
+    unchanged : int
+        Number of records skipped because their content did not change.
+    errors : list
+        List of (origin, message) tuples of the rejected records.
+    """
+
+    def __init__(self):
+        self.read = 0
+        self.valid = 0
+        self.inserted = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.errors = []
+
+    def add_error(self, origin, message):
+        """
+        Record an error of a single record.
+
+        Parameters
+        ----------
+        origin : str
+            Where the record was read from, e.g. "entries.jsonl:3".
+        message : str
+            Description of the error.
+        """
+        self.errors.append((origin, message))
+
+    def summary(self):
+        """
+        Describe the ingestion run in a few lines.
+
+        Returns
+        -------
+        str
+            The summary.
+        """
+        lines = [
+            f"Read: {self.read}, valid: {self.valid}, inserted: {self.inserted}, "
+            f"updated: {self.updated}, unchanged: {self.unchanged}, "
+            f"errors: {len(self.errors)}"
+        ]
+        lines += [f"  {origin}: {message}" for origin, message in self.errors]
+        return "\n".join(lines)
+
+
+def _parse_lines(lines, name):
+    """
+    Parse a JSONL stream, yielding one entry per non-empty line.
+    """
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        origin = f"{name}:{number}"
+        try:
+            yield origin, json.loads(line), None
+        except json.JSONDecodeError as error:
+            yield origin, None, f"Invalid JSON: {error}"
+
+
+def iter_records(source):
+    """
+    Read metadata records from a directory, a JSON or JSONL file or stdin.
+
+    Directories are searched for ``*.json`` and ``*.jsonl`` files. A JSON
+    file may contain a single record or a list of records. The source "-"
+    reads a JSONL stream from stdin.
+
+    Parameters
+    ----------
+    source : str
+        Path to a directory or file, or "-" for stdin.
+
+    Yields
+    ------
+    tuple
+        (origin, record, error) where either record or error is None.
+    """
+    if source == "-":
+        yield from _parse_lines(sys.stdin, "<stdin>")
+        return
+
+    path = Path(source)
+    if path.is_dir():
+        files = sorted(path.glob("*.json")) + sorted(path.glob("*.jsonl"))
+    else:
+        files = [path]
+
+    for file in files:
+        with open(file, "r", encoding="utf-8") as stream:
+            if file.suffix == ".jsonl":
+                yield from _parse_lines(stream, str(file))
+                continue
+            try:
+                content = json.load(stream)
+            except json.JSONDecodeError as error:
+                yield str(file), None, f"Invalid JSON: {error}"
+                continue
+        records = content if isinstance(content, list) else [content]
+        for number, record in enumerate(records):
+            origin = str(file) if len(records) == 1 else f"{file}[{number}]"
+            yield origin, record, None
+
+
+def validate_record(record):
+    """
+    Validate a metadata record against DatasetMetadata.
+
+    Parameters
+    ----------
+    record : dict
+        The metadata record as stored in the database.
+
+    Returns
+    -------
+    str or None
+        The validation error, or None if the record is valid.
+    """
+    if not isinstance(record, dict):
+        return "Record is not a JSON object."
+
+    normalized = dict(record)
+    for field in COMMA_SEPARATED_FIELDS:
+        value = normalized.get(field)
+        if isinstance(value, list):
+            normalized[field] = ", ".join(str(item) for item in value if item)
+    try:
+        DatasetMetadata(**normalized)
+    except ValidationError as error:
+        return "; ".join(
+            f"{'.'.join(str(loc) for loc in detail['loc'])}: {detail['msg']}"
+            for detail in error.errors()
+        )
+    return None
+
+
+def validate_records(records, workers=1):
+    """
+    Validate metadata records, in parallel if more than one worker is used.
+
+    Parameters
+    ----------
+    records : list
+        The metadata records.
+    workers : int, optional
+        Number of worker processes (default is 1).
+
+    Returns
+    -------
+    list
+        The validation error of each record, None for valid records.
+    """
+    if workers <= 1 or len(records) < 2:
+        return [validate_record(record) for record in records]
+    chunksize = max(1, len(records) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(validate_record, records, chunksize=chunksize))
+
+
+def content_hash(record):
+    """
+    Compute a hash of the content of a metadata record.
+
+    Parameters
+    ----------
+    record : dict
+        The metadata record. ``_id`` and the stored hash are ignored.
+
+    Returns
+    -------
+    str
+        Hex digest of the record content.
+    """
+    content = {
+        key: value for key, value in record.items() if key not in ("_id", HASH_FIELD)
+    }
+    serialized = json.dumps(content, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def ensure_unique_key(collection):
+    """
+    Create the unique compound index on DATASET_NAME and VERSION.
+
+    Creating an index that already exists is a no-op.
+
+    Parameters
+    ----------
+    collection : pymongo.collection.Collection
+        The datasets collection.
+
+    Raises
+    ------
+    pymongo.errors.OperationFailure
+        If the collection already contains duplicate entries.
+    """
+    collection.create_index(
+        [(field, ASCENDING) for field in KEY_FIELDS], unique=True, name=KEY_INDEX
+    )
+
+
+def find_duplicate_keys(collection):
+    """
+    Find entries sharing the same DATASET_NAME and VERSION.
+
+    Parameters
+    ----------
+    collection : pymongo.collection.Collection
+        The datasets collection.
+
+    Returns
+    -------
+    list
+        The duplicated keys as dictionaries.
+    """
+    pipeline = [
+        {
+            "$group": {
+                "_id": {field: f"${field}" for field in KEY_FIELDS},
+                "n": {"$sum": 1},
+            }
+        },
+        {"$match": {"n": {"$gt": 1}}},
+    ]
+    return [result["_id"] for result in collection.aggregate(pipeline)]
+
+
+def bump_collection_version(collection):
+    """
+    Increment the version counter of a collection.
+
+    Read-side caches key on this counter to detect changes.
+
+    Parameters
+    ----------
+    collection : pymongo.collection.Collection
+        The collection that changed.
+    """
+    collection.database[VERSIONS_COLLECTION].update_one(
+        {"_id": collection.name},
+        {"$inc": {"version": 1}, "$currentDate": {"updated_at": True}},
+        upsert=True,
+    )
+
+
+def upsert_records(collection, entries, report, batch_size=500):
+    """
+    Upsert metadata records keyed on DATASET_NAME and VERSION.
+
+    Records are written in key order and replace the stored document, so
+    fields removed from a record are removed from the database as well.
+    Records whose content hash matches the stored one are skipped, so re-ingesting unchanged records does not write
+    anything. The records are written with unordered ``bulk_write`` calls, so
+    that a failing record does not abort the rest of its batch. The version
+    counter of the collection is incremented if any document changed.
+
+    Parameters
+    ----------
+    collection : pymongo.collection.Collection
+        The datasets collection.
+    entries : list
+        List of (origin, record) tuples of valid records.
+    report : IngestionReport
+        The report the results and errors are added to.
+    batch_size : int, optional
+        Number of records per ``bulk_write`` call (default is 500).
+    """
+    entries = sorted(entries, key=lambda entry: _record_key(entry[1]))
+    changed = 0
+
+    for start in range(0, len(entries), batch_size):
+        batch = entries[start : start + batch_size]
+
+        # Fetch the stored hashes of the batch to skip unchanged records
+        keys = [dict(zip(KEY_FIELDS, _record_key(record))) for _, record in batch]
+        projection = {field: 1 for field in KEY_FIELDS + [HASH_FIELD]}
+        stored = {
+            _record_key(document): document.get(HASH_FIELD)
+            for document in collection.find({"$or": keys}, projection=projection)
+        }
+
+        origins = []
+        operations = []
+        for origin, record in batch:
+            digest = content_hash(record)
+            if stored.get(_record_key(record)) == digest:
+                report.unchanged += 1
+                continue
+            origins.append(origin)
+            operations.append(
+                ReplaceOne(
+                    dict(zip(KEY_FIELDS, _record_key(record))),
+                    {**record, HASH_FIELD: digest},
+                    upsert=True,
+                )
+            )
+        if not operations:
+            continue
+
+        try:
+            result = collection.bulk_write(operations, ordered=False).bulk_api_result
+        except BulkWriteError as error:
+            result = error.details
+            for write_error in result.get("writeErrors", []):
+                origin = origins[write_error["index"]]
+                report.add_error(origin, write_error.get("errmsg", "Write failed."))
+        report.inserted += result.get("nUpserted", 0)
+        report.updated += result.get("nModified", 0)
+        changed += result.get("nUpserted", 0) + result.get("nModified", 0)
+
+    if changed:
+        bump_collection_version(collection)
+
+
+def _record_key(record):
+    """
+    Get the DATASET_NAME and VERSION of a record as a tuple.
+    """
+    return tuple(record.get(field) for field in KEY_FIELDS)
+
+
+def ingest(source, collection=None, batch_size=500, workers=1):
+    """
+    Read, validate and upsert metadata records.
+
+    Parameters
+    ----------
+    source : str
+        Path to a directory or file, or "-" for stdin.
+    collection : pymongo.collection.Collection, optional
+        The datasets collection. If None, the records are only validated.
+    batch_size : int, optional
+        Number of records per ``bulk_write`` call (default is 500).
+    workers : int, optional
+        Number of validation worker processes (default is 1).
+
+    Returns
+    -------
+    IngestionReport
+        The report of the ingestion run.
+    """
+    report = IngestionReport()
+    entries = []
+    for origin, record, error in iter_records(source):
+        report.read += 1
+        if error is not None:
+            report.add_error(origin, error)
+        else:
+            entries.append((origin, record))
+
+    errors = validate_records([record for _, record in entries], workers=workers)
+    valid = []
+    for (origin, record), error in zip(entries, errors):
+        if error is not None:
+            report.add_error(origin, error)
+        else:
+            valid.append((origin, record))
+    report.valid = len(valid)
+
+    if collection is not None:
+        try:
+            ensure_unique_key(collection)
+        except OperationFailure as error:
+            duplicates = find_duplicate_keys(collection)
+            report.add_error(
+                collection.name,
+                f"Cannot create unique index, remove duplicates first: "
+                f"{duplicates} ({error})",
+            )
+        upsert_records(collection, valid, report, batch_size=batch_size)
+    return report
@@ -2,6 +2,12 @@ from pathlib import Path
 import streamlit as st
 import pymongo
 
+# Collection holding the version counters bumped by every ingestion.
+VERSIONS_COLLECTION = "collection_versions"
+
+# Field storing the content hash of each document, set by the ingestion tool.
+HASH_FIELD = "_content_hash"
+
 
 def load_dua():
     """
@@ -82,6 +88,35 @@ def get_data():
     return items
 
 
+# Probe the collection for changes.
+# Uses st.cache_data so that the probe runs at most once per minute.
+@st.cache_data(ttl=60, show_spinner=False)
+def get_collection_version():
+    """
+    Cheap probe describing the current state of the datasets collection.
+
+    The probe combines the version counter bumped by the ingestion tool with
+    the estimated document count and the largest ``_id``, so that writes
+    made without the ingestion tool are detected as well. It is used as part
+    of the cache key of data derived from the collection.
+
+    Returns
+    -------
+    tuple
+        A tuple of (version counter or None, document count, largest ``_id``
+        as string or None).
+    """
+    items = get_data()
+    counter = items.database[VERSIONS_COLLECTION].find_one({"_id": items.name})
+    count = items.estimated_document_count()
+    last = items.find_one({}, projection={"_id": 1}, sort=[("_id", -1)])
+    return (
+        counter["version"] if counter else None,
+        count,
+        str(last["_id"]) if last else None,
+    )
+
+
 # Initialize connection.
 # Uses st.cache_resource to only run once.
 @st.cache_resource
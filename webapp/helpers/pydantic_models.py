@@ -1,4 +1,3 @@
-import streamlit_pydantic as sp
 from pydantic import BaseModel, Field, EmailStr, HttpUrl, validator
 from typing import List, Optional, Set
 import json
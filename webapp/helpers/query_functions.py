@@ -0,0 +1,779 @@
+import streamlit as st
+import json
+import pandas as pd
+from enum import Enum
+from pydantic.fields import SHAPE_SINGLETON
+from helpers.pydantic_models import DatasetMetadata
+from helpers.loading_functions import HASH_FIELD, get_data, get_collection_version
+
+# Fields stored as lists in the database but validated as comma-separated
+# strings by DatasetMetadata.
+COMMA_SEPARATED_FIELDS = ["TRANSDUCER", "AUTHORS", "CONTACT"]
+
+# Fields identifying a dataset entry.
+KEY_FIELDS = ["DATASET_NAME", "VERSION"]
+
+
+def build_facet_pipeline(keys):
+    """
+    Build an aggregation pipeline returning the distinct values of several keys.
+
+    Each key becomes one branch of a single ``$facet`` stage. List fields are
+    unwound so that their elements are returned individually, which matches
+    the behaviour of ``Collection.distinct``. Missing and null values are
+    dropped.
+
+    Parameters
+    ----------
+    keys : list
+        The metadata keys to collect the distinct values for.
+
+    Returns
+    -------
+    list
+        The aggregation pipeline.
+    """
+    facets = {
+        key: [
+            {"$unwind": f"${key}"},
+            {"$group": {"_id": f"${key}"}},
+            {"$sort": {"_id": 1}},
+        ]
+        for key in keys
+    }
+    return [{"$facet": facets}]
+
+
+# Uses st.cache_data to rerun only when the key set or the collection changes.
+@st.cache_data(ttl=600, show_spinner=False)
+def _fetch_distinct_values(keys, version):
+    """
+    Run the facet aggregation for the given keys.
+
+    Parameters
+    ----------
+    keys : tuple
+        Sorted tuple of metadata keys.
+    version : tuple
+        Collection version, only used as part of the cache key.
+
+    Returns
+    -------
+    dict
+        Mapping of each key to the list of its distinct values.
+    """
+    items = get_data()
+    result = next(items.aggregate(build_facet_pipeline(keys)), {})
+    return {key: [entry["_id"] for entry in result.get(key, [])] for key in keys}
+
+
+def get_distinct_values(keys):
+    """
+    Get the distinct values for any set of metadata keys in one query.
+
+    Parameters
+    ----------
+    keys : list
+        The metadata keys to collect the distinct values for.
+
+    Returns
+    -------
+    dict
+        Mapping of each key to the list of its distinct values.
+    """
+    keys = tuple(sorted(set(keys)))
+    if not keys:
+        return {}
+    return _fetch_distinct_values(keys, get_collection_version())
+
+
+# Columns shown in the database grid by default. The long free-text fields
+# (SHORT_DESCRIPTION, DATA_LABELS_DESCRIPTION) are only fetched on request.
+GRID_COLUMNS = [
+    "DATASET_NAME",
+    "VERSION",
+    "MUSCLE",
+    "MUSCLE_REGION",
+    "DEVICE",
+    "DATA_TYPE",
+    "FILE_TYPE",
+    "IMAGE_TYPE",
+    "DATA_PLANE",
+    "PARTICIPANT_AGE",
+    "PARTICIPANT_SEX",
+    "SAMPLE_SIZE",
+    "DATASET_YEAR",
+    "DATASET_LINK",
+    "LICENSE",
+]
+
+
+def build_projection(columns):
+    """
+    Build a MongoDB projection returning only the given columns.
+
+    Parameters
+    ----------
+    columns : list or None
+        The columns to return. If None, all metadata columns are returned.
+
+    Returns
+    -------
+    dict
+        The projection document.
+    """
+    if columns is None:
+        return {"_id": 0, HASH_FIELD: 0}
+    projection = {"_id": 0}
+    projection.update({column: 1 for column in columns})
+    return projection
+
+
+# Uses st.cache_data to rerun only when the page or the collection changes.
+@st.cache_data(ttl=600, show_spinner=False)
+def _fetch_page(columns, page, page_size, sort_key, version):
+    """
+    Fetch a single page of projected documents.
+
+    Parameters
+    ----------
+    columns : tuple or None
+        The columns to project.
+    page : int
+        Zero-based page number.
+    page_size : int
+        Number of documents per page.
+    sort_key : str
+        The key the documents are sorted by.
+    version : tuple
+        Collection version, only used as part of the cache key.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A dataframe containing the documents of the requested page.
+    """
+    items = get_data()
+    cursor = (
+        items.find({}, projection=build_projection(columns))
+        .sort([(sort_key, 1), ("_id", 1)])
+        .skip(page * page_size)
+        .limit(page_size)
+    )
+    return pd.DataFrame(list(cursor), columns=list(columns) if columns else None)
+
+
+def get_data_page(page=0, page_size=25, columns=None, sort_key="DATASET_NAME"):
+    """
+    Pull a single page of the datasets collection into a dataframe.
+
+    Only the requested columns are transferred and the pagination is done
+    server-side, so the dataframe is only built for the visible page.
+
+    Parameters
+    ----------
+    page : int, optional
+        Zero-based page number (default is 0).
+    page_size : int, optional
+        Number of documents per page (default is 25). A page size of 0
+        returns all documents.
+    columns : list, optional
+        The columns to project (default is all columns).
+    sort_key : str, optional
+        The key the documents are sorted by (default is "DATASET_NAME").
+
+    Returns
+    -------
+    pandas.DataFrame
+        A dataframe containing the documents of the requested page.
+    """
+    columns = tuple(columns) if columns is not None else None
+    return _fetch_page(columns, page, page_size, sort_key, get_collection_version())
+
+
+# Uses st.cache_data to rerun only when the collection changes.
+@st.cache_data(ttl=600, show_spinner=False)
+def _count_datasets(version):
+    """
+    Count the documents in the datasets collection.
+
+    Parameters
+    ----------
+    version : tuple
+        Collection version, only used as part of the cache key.
+
+    Returns
+    -------
+    int
+        The number of documents.
+    """
+    return get_data().count_documents({})
+
+
+def count_datasets():
+    """
+    Count the documents in the datasets collection.
+
+    Returns
+    -------
+    int
+        The number of documents.
+    """
+    return _count_datasets(get_collection_version())
+
+
+def build_count_pipeline(group_by_column, value_column, query=None):
+    """
+    Build an aggregation pipeline counting values per group server-side.
+
+    Both columns may be list or scalar fields. Each combination is counted
+    at most once per document, matching ValueIndex.cross_counts. When both
+    columns are the same, each value is only paired with itself.
+
+    Parameters
+    ----------
+    group_by_column : str
+        The column to group by.
+    value_column : str
+        The column whose values are counted.
+    query : dict, optional
+        Filter applied before counting (default is all documents).
+
+    Returns
+    -------
+    list
+        The aggregation pipeline.
+    """
+    pipeline = [{"$match": query}] if query else []
+    if group_by_column == value_column:
+        pipeline += [
+            {"$project": {"group": f"${group_by_column}"}},
+            {"$unwind": "$group"},
+            {"$addFields": {"value": "$group"}},
+        ]
+    else:
+        pipeline += [
+            {
+                "$project": {
+                    "group": f"${group_by_column}",
+                    "value": f"${value_column}",
+                }
+            },
+            {"$unwind": "$group"},
+            {"$unwind": "$value"},
+        ]
+    pipeline += [
+        {"$group": {"_id": {"doc": "$_id", "group": "$group", "value": "$value"}}},
+        {
+            "$group": {
+                "_id": {"group": "$_id.group", "value": "$_id.value"},
+                "count": {"$sum": 1},
+            }
+        },
+    ]
+    return pipeline
+
+
+def counts_to_frame(results, group_by_column, value_column):
+    """
+    Convert the results of a count pipeline into a count matrix.
+
+    Parameters
+    ----------
+    results : list
+        Documents returned by the pipeline of build_count_pipeline.
+    group_by_column : str
+        The column grouped by.
+    value_column : str
+        The column whose values were counted.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Count matrix with the groups as index and the values as columns.
+    """
+    counts = pd.DataFrame(
+        {
+            "group": [result["_id"]["group"] for result in results],
+            "value": [result["_id"]["value"] for result in results],
+            "count": [result["count"] for result in results],
+        }
+    )
+    counts = counts.pivot_table(
+        index="group", columns="value", values="count", aggfunc="sum", fill_value=0
+    )
+    counts.index.name = group_by_column
+    counts.columns.name = value_column
+    return counts
+
+
+# Uses st.cache_data to rerun only when the filter state or the collection changes.
+@st.cache_data(ttl=600, show_spinner=False)
+def _fetch_chart_counts(group_by_column, value_column, query_key, version):
+    """
+    Run the count pipeline for the given columns and filter.
+
+    Parameters
+    ----------
+    group_by_column : str
+        The column to group by.
+    value_column : str
+        The column whose values are counted.
+    query_key : str
+        JSON encoded filter, used as cache key.
+    version : tuple
+        Collection version, only used as part of the cache key.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Count matrix with the groups as index and the values as columns.
+    """
+    items = get_data()
+    pipeline = build_count_pipeline(group_by_column, value_column, json.loads(query_key))
+    return counts_to_frame(list(items.aggregate(pipeline)), group_by_column, value_column)
+
+
+def get_chart_counts(group_by_column, value_column, query=None):
+    """
+    Count values per group in MongoDB and return only the count matrix.
+
+    Parameters
+    ----------
+    group_by_column : str
+        The column to group by.
+    value_column : str
+        The column whose values are counted.
+    query : dict, optional
+        Filter applied before counting (default is all documents).
+
+    Returns
+    -------
+    pandas.DataFrame
+        Count matrix with the groups as index and the values as columns.
+    """
+    query_key = canonical_query(query)
+    return _fetch_chart_counts(
+        group_by_column, value_column, query_key, get_collection_version()
+    )
+
+
+def build_value_count_pipeline(column, query=None):
+    """
+    Build an aggregation pipeline counting the documents per value of a field.
+
+    Parameters
+    ----------
+    column : str
+        The scalar field whose values are counted. Missing values are skipped.
+    query : dict, optional
+        Filter applied before counting (default is all documents).
+
+    Returns
+    -------
+    list
+        The aggregation pipeline.
+    """
+    pipeline = [{"$match": query}] if query else []
+    pipeline += [
+        {"$match": {column: {"$ne": None}}},
+        {"$group": {"_id": f"${column}", "count": {"$sum": 1}}},
+    ]
+    return pipeline
+
+
+# Uses st.cache_data to rerun only when the filter state or the collection changes.
+@st.cache_data(ttl=600, show_spinner=False)
+def _fetch_value_counts(column, query_key, version):
+    """
+    Run the value count pipeline for the given field and filter.
+
+    Parameters
+    ----------
+    column : str
+        The field whose values are counted.
+    query_key : str
+        JSON encoded filter, used as cache key.
+    version : tuple
+        Collection version, only used as part of the cache key.
+
+    Returns
+    -------
+    pandas.Series
+        The number of documents per value, sorted by value.
+    """
+    items = get_data()
+    pipeline = build_value_count_pipeline(column, json.loads(query_key))
+    results = list(items.aggregate(pipeline))
+    counts = pd.Series(
+        [result["count"] for result in results],
+        index=[result["_id"] for result in results],
+        dtype="int64",
+    )
+    counts.index.name = column
+    return counts.sort_index()
+
+
+def get_value_counts(column, query=None):
+    """
+    Count the documents per value of a field in MongoDB.
+
+    Parameters
+    ----------
+    column : str
+        The scalar field whose values are counted.
+    query : dict, optional
+        Filter applied before counting (default is all documents).
+
+    Returns
+    -------
+    pandas.Series
+        The number of documents per value, sorted by value.
+    """
+    return _fetch_value_counts(
+        column, canonical_query(query), get_collection_version()
+    )
+
+
+class FieldSpec:
+    """
+    Filter description of a metadata field.
+
+    Attributes
+    ----------
+    name : str
+        The metadata field.
+    kind : str
+        "list" for fields stored as lists, "number" for integer fields,
+        "bool" for flags and "str" for all other fields.
+    options : list or None
+        The allowed values of fields backed by an Enum, otherwise None.
+    minimum : int or None
+        The lower bound of numeric fields, if constrained.
+    maximum : int or None
+        The upper bound of numeric fields, if constrained.
+    """
+
+    def __init__(self, name, kind, options=None, minimum=None, maximum=None):
+        self.name = name
+        self.kind = kind
+        self.options = options
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def __repr__(self):
+        return f"FieldSpec({self.name!r}, {self.kind!r})"
+
+
+def describe_field(name, model_field):
+    """
+    Derive the filter description of a DatasetMetadata field.
+
+    Parameters
+    ----------
+    name : str
+        The metadata field.
+    model_field : pydantic.fields.ModelField
+        The model field.
+
+    Returns
+    -------
+    FieldSpec
+        The filter description.
+    """
+    type_ = model_field.type_
+    is_type = isinstance(type_, type)
+    options = None
+    if is_type and issubclass(type_, Enum):
+        options = [member.value for member in type_]
+
+    if model_field.shape != SHAPE_SINGLETON or name in COMMA_SEPARATED_FIELDS:
+        return FieldSpec(name, "list", options=options)
+    if is_type and issubclass(type_, bool):
+        return FieldSpec(name, "bool", options=[True, False])
+    if is_type and issubclass(type_, (int, float)):
+        return FieldSpec(
+            name,
+            "number",
+            minimum=getattr(type_, "ge", None),
+            maximum=getattr(type_, "le", None),
+        )
+    return FieldSpec(name, "str", options=options)
+
+
+def build_field_registry(model=DatasetMetadata):
+    """
+    Build the filter descriptions of all fields of a metadata model.
+
+    Parameters
+    ----------
+    model : pydantic.BaseModel, optional
+        The metadata model (default is DatasetMetadata).
+
+    Returns
+    -------
+    dict
+        Mapping of field names to FieldSpec, in the field order of the model.
+    """
+    return {
+        name: describe_field(name, model_field)
+        for name, model_field in model.__fields__.items()
+    }
+
+
+# Filter descriptions of the metadata fields, derived once at import time.
+FIELD_REGISTRY = build_field_registry()
+
+
+def get_field_spec(field):
+    """
+    Get the filter description of a metadata field.
+
+    Parameters
+    ----------
+    field : str
+        The metadata field.
+
+    Returns
+    -------
+    FieldSpec
+        The registered description, or a plain "str" description for fields
+        unknown to DatasetMetadata.
+    """
+    return FIELD_REGISTRY.get(field) or FieldSpec(field, "str")
+
+
+def field_kind(field):
+    """
+    Get the kind of filter a metadata field supports.
+
+    Parameters
+    ----------
+    field : str
+        The metadata field.
+
+    Returns
+    -------
+    str
+        The kind of the field, see FieldSpec.
+    """
+    return get_field_spec(field).kind
+
+
+def compile_predicate(kind, value, match="any"):
+    """
+    Compile the value of a filter widget into a MongoDB predicate.
+
+    Parameters
+    ----------
+    kind : str
+        The kind of the field, see FieldSpec.
+    value : object
+        The widget value: a list of values for "list" and "str" fields, a
+        (minimum, maximum) tuple for "number" fields, where either bound may
+        be None, and a boolean for "bool" fields.
+    match : str, optional
+        For "list" fields, whether documents must contain "any" or "all" of
+        the values (default is "any").
+
+    Returns
+    -------
+    object or None
+        The predicate, or None if the value does not restrict the query.
+    """
+    if kind == "number":
+        low, high = value
+        predicate = {}
+        if low is not None:
+            predicate["$gte"] = low
+        if high is not None:
+            predicate["$lte"] = high
+        return predicate or None
+    if kind == "bool":
+        return value
+    if isinstance(value, (list, tuple, set)):
+        values = list(value)
+        if not values:
+            return None
+        if kind == "list" and match == "all":
+            return {"$all": values}
+        return {"$in": values}
+    return value
+
+
+def compile_query(filters, matches=None):
+    """
+    Compile the values of the filter widgets into a MongoDB query.
+
+    The filters on different fields are combined with AND. The predicates
+    only use ``$in``, ``$all``, ``$gte`` and ``$lte``, so that they can be
+    answered by the field indexes.
+
+    Parameters
+    ----------
+    filters : dict
+        Mapping of metadata fields to widget values, see compile_predicate.
+    matches : dict, optional
+        Mapping of list fields to "any" or "all" (default is "any").
+
+    Returns
+    -------
+    dict
+        The query document.
+    """
+    matches = matches or {}
+    query = {}
+    for field, value in filters.items():
+        if value is None:
+            continue
+        predicate = compile_predicate(
+            get_field_spec(field).kind, value, matches.get(field, "any")
+        )
+        if predicate is not None:
+            query[field] = predicate
+    return query
+
+
+# Operators whose list operands have set semantics.
+SET_OPERATORS = {"$in", "$nin", "$all"}
+
+
+def _normalize(value, unordered=False):
+    """
+    Recursively normalise a query value, see canonical_query.
+    """
+    if isinstance(value, dict):
+        return {
+            key: _normalize(item, unordered=key in SET_OPERATORS)
+            for key, item in sorted(value.items())
+        }
+    if isinstance(value, (set, frozenset)):
+        unordered = True
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_normalize(item) for item in value]
+        if unordered:
+            unique = {json.dumps(item, sort_keys=True, default=str): item for item in items}
+            items = [unique[key] for key in sorted(unique)]
+        return items
+    return value
+
+
+def canonical_query(query):
+    """
+    Encode a query in a canonical form, used as cache key.
+
+    Keys are sorted, sets and the operands of ``$in``, ``$nin`` and ``$all``
+    become sorted lists without duplicates, so that equivalent queries share
+    the same key.
+
+    Parameters
+    ----------
+    query : dict or None
+        The query document.
+
+    Returns
+    -------
+    str
+        The JSON encoded canonical query.
+    """
+    return json.dumps(_normalize(query or {}), sort_keys=True, default=str)
+
+
+# Fields shown for each result of the Datasets tab.
+RESULT_COLUMNS = ["DATASET_NAME", "VERSION", "DATASET_LINK", "SHORT_DESCRIPTION"]
+
+# Sort order of the results, ending with _id so that pages are stable.
+RESULT_SORT = {"DATASET_NAME": 1, "VERSION": 1, "_id": 1}
+
+
+def build_results_pipeline(query, page=0, page_size=20):
+    """
+    Build an aggregation pipeline returning one page of results and the total.
+
+    Parameters
+    ----------
+    query : dict
+        The query document.
+    page : int, optional
+        Zero-based page number (default is 0).
+    page_size : int, optional
+        Number of results per page (default is 20).
+
+    Returns
+    -------
+    list
+        The aggregation pipeline, returning a single document with the
+        fields "total" and "rows".
+    """
+    return [
+        {"$match": query},
+        {
+            "$facet": {
+                "total": [{"$count": "count"}],
+                "rows": [
+                    {"$sort": RESULT_SORT},
+                    {"$skip": page * page_size},
+                    {"$limit": page_size},
+                    {"$project": build_projection(RESULT_COLUMNS)},
+                ],
+            }
+        },
+    ]
+
+
+# Uses st.cache_data so that repeated queries are answered without a round
+# trip. The least recently used entries are evicted beyond max_entries.
+@st.cache_data(ttl=600, max_entries=256, show_spinner=False)
+def _fetch_results(query_key, page, page_size, version):
+    """
+    Run a canonical query and return one page of projected result rows.
+
+    Parameters
+    ----------
+    query_key : str
+        Canonical JSON encoded query, as returned by canonical_query.
+    page : int
+        Zero-based page number.
+    page_size : int
+        Number of results per page.
+    version : tuple
+        Collection version, only used as part of the cache key.
+
+    Returns
+    -------
+    tuple
+        The matching documents of the page restricted to RESULT_COLUMNS, and
+        the total number of matching documents.
+    """
+    items = get_data()
+    pipeline = build_results_pipeline(json.loads(query_key), page, page_size)
+    result = next(items.aggregate(pipeline), {})
+    total = result.get("total", [])
+    return result.get("rows", []), total[0]["count"] if total else 0
+
+
+def find_datasets(query, page=0, page_size=20):
+    """
+    Find one page of the datasets matching a query.
+
+    Results are sorted by DATASET_NAME and VERSION and cached per canonical
+    query, page and collection version.
+
+    Parameters
+    ----------
+    query : dict
+        The query document.
+    page : int, optional
+        Zero-based page number (default is 0).
+    page_size : int, optional
+        Number of results per page (default is 20).
+
+    Returns
+    -------
+    tuple
+        The matching documents of the page restricted to RESULT_COLUMNS, and
+        the total number of matching documents.
+    """
+    return _fetch_results(
+        canonical_query(query), page, page_size, get_collection_version()
+    )
@@ -0,0 +1,287 @@
+import hashlib
+import math
+import re
+import threading
+from collections import Counter
+import streamlit as st
+from helpers.query_functions import KEY_FIELDS
+from helpers.snapshot import get_snapshot
+
+# Free-text fields covered by the search index.
+SEARCH_FIELDS = ["SHORT_DESCRIPTION", "DATA_LABELS_DESCRIPTION", "AUTHORS"]
+
+# Frequent English words ignored by the search.
+STOPWORDS = set(
+    "a an and are as at be by for from in is it of on or that the this to was "
+    "were with".split()
+)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """
+    Split a text into lowercase alphanumeric tokens without stopwords.
+
+    Parameters
+    ----------
+    text : str
+        The text to tokenize.
+
+    Returns
+    -------
+    list
+        The tokens.
+    """
+    return [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def document_text(document, fields=SEARCH_FIELDS):
+    """
+    Concatenate the searchable fields of a document.
+
+    Parameters
+    ----------
+    document : dict
+        The metadata document. List fields are joined with spaces.
+    fields : list, optional
+        The searchable fields (default is SEARCH_FIELDS).
+
+    Returns
+    -------
+    str
+        The searchable text.
+    """
+    parts = []
+    for field in fields:
+        value = document.get(field)
+        if isinstance(value, (list, tuple)):
+            parts.extend(str(item) for item in value if item)
+        elif isinstance(value, str):
+            parts.append(value)
+    return " ".join(parts)
+
+
+class SearchIndex:
+    """
+    Local BM25 inverted index over the free-text fields of the datasets.
+
+    Documents are identified by their DATASET_NAME and VERSION. The index is
+    updated incrementally: only new or changed documents are tokenized again.
+
+    Parameters
+    ----------
+    k1 : float, optional
+        Term frequency saturation (default is 1.5).
+    b : float, optional
+        Document length normalisation (default is 0.75).
+
+    Attributes
+    ----------
+    positions : dict
+        Position of each document key in the documents of the last update.
+    """
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.version = None
+        self.positions = {}
+        self._postings = {}
+        self._lengths = {}
+        self._terms = {}
+        self._hashes = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._lengths)
+
+    def _add(self, key, tokens):
+        """
+        Add the tokens of a document to the postings.
+        """
+        frequencies = Counter(tokens)
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[key] = frequency
+        self._terms[key] = list(frequencies)
+        self._lengths[key] = len(tokens)
+        self._total_length += len(tokens)
+
+    def _remove(self, key):
+        """
+        Remove a document from the postings.
+        """
+        for term in self._terms.pop(key):
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(key)
+        del self._hashes[key]
+
+    def update(self, documents, version=None):
+        """
+        Synchronise the index with a set of documents.
+
+        Parameters
+        ----------
+        documents : list
+            The metadata documents as dictionaries.
+        version : object, optional
+            Identifier of the document set, e.g. the snapshot digest.
+
+        Returns
+        -------
+        tuple
+            The number of (indexed, removed) documents.
+        """
+        texts = {}
+        positions = {}
+        for position, document in enumerate(documents):
+            key = tuple(document.get(field) for field in KEY_FIELDS)
+            texts[key] = document_text(document)
+            positions[key] = position
+
+        with self._lock:
+            removed = [key for key in self._hashes if key not in texts]
+            for key in removed:
+                self._remove(key)
+
+            indexed = 0
+            for key, text in texts.items():
+                digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+                if self._hashes.get(key) == digest:
+                    continue
+                if key in self._hashes:
+                    self._remove(key)
+                self._add(key, tokenize(text))
+                self._hashes[key] = digest
+                indexed += 1
+            self.version = version
+            self.positions = positions
+        return indexed, len(removed)
+
+    def _rank(self, text, limit):
+        """
+        Score the documents matching a query. The lock must be held.
+        """
+        count = len(self._lengths)
+        if count == 0:
+            return []
+        average_length = self._total_length / count or 1
+        scores = Counter()
+        for term in set(tokenize(text)):
+            postings = self._postings.get(term, {})
+            matches = len(postings)
+            idf = math.log(1 + (count - matches + 0.5) / (matches + 0.5))
+            for key, frequency in postings.items():
+                norm = 1 - self.b + self.b * self._lengths[key] / average_length
+                scores[key] += (
+                    idf * frequency * (self.k1 + 1) / (frequency + self.k1 * norm)
+                )
+        ranked = sorted(scores.items(), key=lambda item: -item[1])
+        return ranked[:limit]
+
+    def search(self, text, limit=20):
+        """
+        Rank the documents matching a free-text query.
+
+        Parameters
+        ----------
+        text : str
+            The search query.
+        limit : int, optional
+            Maximum number of results (default is 20).
+
+        Returns
+        -------
+        list
+            List of (key, score) tuples ordered by decreasing score, where key
+            is the (DATASET_NAME, VERSION) tuple of the document.
+        """
+        with self._lock:
+            return self._rank(text, limit)
+
+    def search_positions(self, text, limit=20):
+        """
+        Rank the documents matching a free-text query by their positions.
+
+        The positions and the version are read under the same lock as the
+        scores, so that all of them belong to the same update.
+
+        Parameters
+        ----------
+        text : str
+            The search query.
+        limit : int, optional
+            Maximum number of results (default is 20).
+
+        Returns
+        -------
+        tuple
+            The version of the index and a list of (position, score) tuples
+            ordered by decreasing score.
+        """
+        with self._lock:
+            ranked = self._rank(text, limit)
+            positions, version = self.positions, self.version
+        return version, [
+            (positions[key], score) for key, score in ranked if key in positions
+        ]
+
+
+# Uses st.cache_resource so that one search index is shared across all sessions.
+@st.cache_resource
+def _get_search_index():
+    """
+    Create the process-wide search index.
+
+    Returns
+    -------
+    SearchIndex
+        The empty search index.
+    """
+    return SearchIndex()
+
+
+def search_datasets(text, limit=20):
+    """
+    Search the free-text fields of the current dataset snapshot.
+
+    The shared index is brought up to date with the snapshot first, which
+    only re-indexes documents that changed since the last search. The
+    snapshot is only decoded when its digest changed; otherwise just the
+    matching rows are.
+
+    Parameters
+    ----------
+    text : str
+        The search query.
+    limit : int, optional
+        Maximum number of results (default is 20).
+
+    Returns
+    -------
+    pandas.DataFrame
+        The matching documents ordered by relevance, with a "SCORE" column.
+    """
+    snapshot = get_snapshot()
+    index = _get_search_index()
+    matches = []
+    # Another session may synchronise the index with a newer snapshot in
+    # between, whose positions do not apply to this one
+    for _ in range(2):
+        if index.version != snapshot.digest:
+            documents = snapshot.select(snapshot.compact.columns).to_dict("records")
+            index.update(documents, snapshot.digest)
+        version, matches = index.search_positions(text, limit=limit)
+        if version == snapshot.digest:
+            break
+        matches = []
+
+    results = snapshot.select(
+        snapshot.compact.columns, rows=[position for position, _ in matches]
+    )
+    results["SCORE"] = [score for _, score in matches]
+    return results.reset_index(drop=True)
@@ -0,0 +1,575 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pymongo
+import streamlit as st
+from helpers.loading_functions import get_data, get_collection_version
+from helpers.compact_frame import CompactCatalogue, memory_report
+from helpers.data_tools import apply_row_model, hash_dataframe
+from helpers.query_functions import build_projection
+from helpers.value_index import INDEX_COLUMNS, ValueIndex
+
+logger = logging.getLogger(__name__)
+
+# Error code of MongoDB deployments without change stream support.
+CHANGE_STREAM_UNSUPPORTED = 40573
+
+# Environment variable setting the directory of the snapshot files. Defaults
+# to the temporary directory.
+SNAPSHOT_DIR_VARIABLE = "UMUD_SNAPSHOT_DIR"
+
+
+class DatasetSnapshot:
+    """
+    Materialised, read-only snapshot of the datasets collection.
+
+    The snapshot is shared by all sessions and must therefore never be
+    modified. Consumers that need to change the data must work on a copy.
+
+    The documents are only kept in compact form: Enum fields as categoricals,
+    list fields as integer codes and participant fields as nullable numbers.
+    Charts, filters and sorting run on the codes; only the rows that are
+    shown or exported are decoded, see ``select``.
+
+    Parameters
+    ----------
+    compact : CompactCatalogue
+        All documents of the collection, without the ``_id`` and content hash
+        fields.
+    version : tuple
+        The collection version the snapshot was built from.
+    digest : str
+        Content hash of the documents, used to key caches of derived data.
+    object_bytes : pandas.Series
+        Memory per column of the documents as Python objects.
+    created_at : float, optional
+        Monotonic time the documents were pulled at (default is now).
+
+    Attributes
+    ----------
+    index : ValueIndex
+        Inverted index of the indexed columns, shared by charts and filters.
+    memory : pandas.DataFrame
+        Memory per column as Python objects and in compact form.
+    created_at : float
+        Monotonic time the documents were pulled at, which is earlier than
+        the construction for snapshots read from a shared file.
+    """
+
+    def __init__(self, compact, version, digest, object_bytes, created_at=None):
+        self.compact = compact
+        self.version = version
+        self.digest = digest
+        self.created_at = time.monotonic() if created_at is None else created_at
+        self.memory = memory_report(object_bytes, compact)
+        self.index = ValueIndex(compact.value_codes(INDEX_COLUMNS), len(compact))
+
+    @classmethod
+    def from_frame(cls, frame, version):
+        """
+        Build a snapshot from the documents of the collection.
+
+        Parameters
+        ----------
+        frame : pandas.DataFrame
+            All documents of the collection.
+        version : tuple
+            The collection version the documents belong to.
+
+        Returns
+        -------
+        DatasetSnapshot
+            The snapshot.
+        """
+        frame = frame.reset_index(drop=True)
+        return cls(
+            CompactCatalogue.from_frame(frame),
+            version,
+            hash_dataframe(frame),
+            frame.memory_usage(deep=True, index=False),
+        )
+
+    def select(self, columns, rows=None):
+        """
+        Decode the given columns, adding missing ones as empty columns.
+
+        Parameters
+        ----------
+        columns : list
+            The columns to select.
+        rows : array-like, optional
+            Decode these rows only, in this order (default is all rows).
+
+        Returns
+        -------
+        pandas.DataFrame
+            A dataframe containing the selected columns.
+        """
+        if rows is None:
+            return self.compact.to_frame(columns)
+        return self.compact.take(rows, columns)
+
+    def match(self, query):
+        """
+        Get the rows matching a query compiled by compile_query.
+
+        The ``$in`` and ``$all`` predicates on the indexed columns are looked
+        up in the value index, the other predicates are evaluated on the codes
+        with CompactCatalogue.match.
+
+        Parameters
+        ----------
+        query : dict
+            The query document.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted ids of the matching rows.
+        """
+        filters, others = {}, {}
+        rows = np.arange(len(self), dtype=np.int64)
+        for column, predicate in (query or {}).items():
+            indexed = (
+                column in INDEX_COLUMNS
+                and isinstance(predicate, dict)
+                and set(predicate) <= {"$in", "$all"}
+            )
+            if not indexed:
+                others[column] = predicate
+                continue
+            if "$in" in predicate:
+                filters[column] = predicate["$in"]
+            if "$all" in predicate:
+                rows = np.intersect1d(
+                    rows, self.index.match_all(column, predicate["$all"]), assume_unique=True
+                )
+        if filters:
+            rows = np.intersect1d(rows, self.index.query(filters), assume_unique=True)
+        if others:
+            rows = rows[self.compact.match(others)[rows]]
+        return rows
+
+    def __len__(self):
+        return len(self.compact)
+
+
+def snapshot_path(collection, directory=None):
+    """
+    Get the Arrow IPC file holding the snapshot of a collection.
+
+    The file is memory-mapped by every process on the host and is named after
+    the database and the collection, so that apps reading different
+    collections do not replace each other's snapshots.
+
+    Parameters
+    ----------
+    collection : pymongo.collection.Collection
+        The collection of the snapshot.
+    directory : str or pathlib.Path, optional
+        The directory of the file (default is the UMUD_SNAPSHOT_DIR environment
+        variable, or the temporary directory if it is not set).
+
+    Returns
+    -------
+    pathlib.Path
+        The snapshot file.
+    """
+    if directory is None:
+        directory = os.environ.get(SNAPSHOT_DIR_VARIABLE) or tempfile.gettempdir()
+    name = f"umud_snapshot_{collection.database.name}_{collection.name}.arrow"
+    return Path(directory) / name
+
+
+def write_snapshot_file(snapshot, path):
+    """
+    Write a snapshot to an Arrow IPC file, replacing the previous one atomically.
+
+    The file is written next to ``path`` and then renamed over it, so readers
+    either map the previous or the new file, never a partial one. Processes
+    that still map the previous file keep reading it until they swap. The
+    creation time of the snapshot is stored as wall-clock time, so that
+    processes reusing the file keep its age.
+
+    Parameters
+    ----------
+    snapshot : DatasetSnapshot
+        The snapshot to be written.
+    path : pathlib.Path
+        The snapshot file, see snapshot_path.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    metadata = {
+        "version": json.dumps(snapshot.version),
+        "digest": snapshot.digest,
+        "created": str(time.time() - (time.monotonic() - snapshot.created_at)),
+        "object_bytes": snapshot.memory["object_bytes"].drop("TOTAL").to_json(),
+    }
+    table = snapshot.compact.to_arrow(metadata)
+    descriptor, temporary = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as stream:
+            with pa.ipc.new_file(stream, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def read_snapshot_file(path):
+    """
+    Memory-map a snapshot written by ``write_snapshot_file``.
+
+    The columns are read zero-copy from the mapped file, so all processes on
+    the host share the same pages. The snapshot keeps the creation time
+    stored in the file, or the modification time of files without it.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        The snapshot file, see snapshot_path.
+
+    Returns
+    -------
+    DatasetSnapshot or None
+        The snapshot, or None if the file is missing or invalid.
+    """
+    try:
+        modified = os.stat(path).st_mtime
+        table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+        metadata = {
+            key.decode(): value.decode()
+            for key, value in table.schema.metadata.items()
+        }
+        compact = CompactCatalogue.from_arrow(table)
+    except (OSError, ValueError):
+        # pa.ArrowInvalid is a ValueError as well
+        return None
+    version = json.loads(metadata["version"])
+    # Wall-clock times are converted to the monotonic clock of the TTL
+    age = max(0.0, time.time() - float(metadata.get("created", modified)))
+    return DatasetSnapshot(
+        compact,
+        tuple(version) if isinstance(version, list) else version,
+        metadata["digest"],
+        pd.Series(json.loads(metadata["object_bytes"]), dtype="int64"),
+        created_at=time.monotonic() - age,
+    )
+
+
+def load_snapshot(version=None, refresh=False, path=None, max_age=600):
+    """
+    Get a snapshot of the datasets collection, shared through the snapshot file.
+
+    The snapshot file is reused if it belongs to the requested version and is
+    younger than ``max_age``, typically after another process or replica
+    built it. Otherwise all documents are pulled from the collection and the
+    file is replaced.
+
+    Parameters
+    ----------
+    version : tuple, optional
+        The collection version the documents belong to.
+    refresh : bool, optional
+        Pull the documents even if the snapshot file is current (default is
+        False).
+    path : pathlib.Path, optional
+        The snapshot file (default is the snapshot_path of the collection).
+    max_age : float, optional
+        Maximum age of a reused snapshot file in seconds (default is 600).
+
+    Returns
+    -------
+    DatasetSnapshot
+        The snapshot, memory-mapped from the snapshot file when possible.
+    """
+    items = None
+    if path is None:
+        items = get_data()
+        path = snapshot_path(items)
+    path = Path(path)
+    if not refresh:
+        try:
+            age = time.time() - path.stat().st_mtime
+        except OSError:
+            age = None
+        if age is not None and age < max_age:
+            shared = read_snapshot_file(path)
+            if shared is not None and shared.version == version:
+                return shared
+
+    if items is None:
+        items = get_data()
+    frame = pd.DataFrame(list(items.find({}, projection=build_projection(None))))
+    snapshot = DatasetSnapshot.from_frame(frame, version)
+    try:
+        write_snapshot_file(snapshot, path)
+    except OSError:
+        return snapshot
+
+    # Another process may have replaced the file in the meantime
+    shared = read_snapshot_file(path)
+    if shared is None or shared.digest != snapshot.digest:
+        return snapshot
+    return shared
+
+
+class SnapshotCache:
+    """
+    Process-wide cache holding the current dataset snapshot.
+
+    The snapshot is rebuilt when the collection version reported by the probe
+    changes, when a change stream reports a modification, or when the time to
+    live expires, whichever comes first. In the last two cases the loader is
+    asked to refresh the data instead of reusing a shared snapshot file.
+
+    Parameters
+    ----------
+    load : callable
+        Function building a snapshot from a collection version and a refresh
+        flag.
+    probe : callable
+        Function returning the current collection version.
+    ttl : float, optional
+        Maximum age of a snapshot in seconds (default is 600).
+    """
+
+    def __init__(self, load=load_snapshot, probe=get_collection_version, ttl=600):
+        self._load = load
+        self._probe = probe
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._stale = False
+
+    def invalidate(self):
+        """
+        Mark the current snapshot as stale so that the next access rebuilds it.
+        """
+        self._stale = True
+
+    def get(self):
+        """
+        Return the current snapshot, rebuilding it if necessary.
+
+        Returns
+        -------
+        DatasetSnapshot
+            The current snapshot.
+        """
+        with self._lock:
+            snapshot = self._snapshot
+            version = self._probe()
+            refresh = self._stale or (
+                snapshot is not None
+                and time.monotonic() - snapshot.created_at > self._ttl
+            )
+            if refresh or snapshot is None or snapshot.version != version:
+                self._stale = False
+                self._snapshot = self._load(version, refresh)
+            return self._snapshot
+
+    def watch(self, collection):
+        """
+        Invalidate the snapshot on every change reported by a change stream.
+
+        The change stream runs in a daemon thread, see ``_watch``.
+
+        Parameters
+        ----------
+        collection : pymongo.collection.Collection
+            The collection to watch.
+        """
+        threading.Thread(
+            target=self._watch,
+            args=(collection,),
+            name="umud-snapshot-watch",
+            daemon=True,
+        ).start()
+
+    def _watch(self, collection, sleep=time.sleep, initial_delay=1.0, max_delay=300.0):
+        """
+        Follow the change stream of a collection, reconnecting after errors.
+
+        Errors are logged and the stream is reopened with exponential backoff.
+        The snapshot is invalidated every time the stream is lost, since
+        changes may have been missed in the meantime. Deployments without
+        change stream support (standalone servers) fall back to the version
+        probe.
+
+        Parameters
+        ----------
+        collection : pymongo.collection.Collection
+            The collection to watch.
+        sleep : callable, optional
+            Function waiting for the given number of seconds (default is
+            time.sleep).
+        initial_delay : float, optional
+            Delay before the first reconnection in seconds (default is 1).
+        max_delay : float, optional
+            Maximum delay between reconnections in seconds (default is 300).
+        """
+        delay = initial_delay
+        while True:
+            try:
+                with collection.watch() as stream:
+                    delay = initial_delay
+                    for _ in stream:
+                        self.invalidate()
+                logger.warning("Change stream of '%s' closed.", collection.name)
+            except pymongo.errors.PyMongoError as error:
+                if getattr(error, "code", None) == CHANGE_STREAM_UNSUPPORTED:
+                    logger.info(
+                        "Change streams are not supported, the snapshot of '%s' "
+                        "is refreshed by the version probe only.",
+                        collection.name,
+                    )
+                    return
+                logger.warning(
+                    "Change stream of '%s' failed: %s", collection.name, error
+                )
+            self.invalidate()
+            logger.info("Reopening the change stream in %.0f s.", delay)
+            sleep(delay)
+            delay = min(delay * 2, max_delay)
+
+
+# Uses st.cache_resource so that one snapshot is shared across all sessions.
+@st.cache_resource
+def _get_snapshot_cache():
+    """
+    Create the process-wide snapshot cache and start watching the collection.
+
+    Returns
+    -------
+    SnapshotCache
+        The snapshot cache.
+    """
+    cache = SnapshotCache()
+    cache.watch(get_data())
+    return cache
+
+
+def get_snapshot():
+    """
+    Get the shared snapshot of the datasets collection.
+
+    Returns
+    -------
+    DatasetSnapshot
+        The current snapshot.
+    """
+    return _get_snapshot_cache().get()
+
+
+# Uses st.cache_data so that the rows are only filtered and sorted again when
+# the snapshot, the columns, the sort or the filters change.
+@st.cache_data(max_entries=32, show_spinner=False)
+def _snapshot_row_ids(digest, columns, sort_key, quick_filter, filter_key, _snapshot):
+    """
+    Filter and sort the rows of a snapshot, see CompactCatalogue.row_model.
+
+    The column filters of the grid are evaluated with apply_row_model on the
+    filtered columns of the remaining rows only.
+
+    Parameters
+    ----------
+    digest : str
+        Digest of ``_snapshot``, used as cache key.
+    columns : tuple
+        The columns shown in the grid.
+    sort_key : str
+        JSON encoded AG Grid sort model.
+    quick_filter : str
+        Text that must occur in at least one of the columns of a row.
+    filter_key : str
+        JSON encoded AG Grid filter model.
+    _snapshot : DatasetSnapshot
+        The snapshot. Not hashed by streamlit.
+
+    Returns
+    -------
+    pandas.Index
+        The ids of the matching rows, in display order.
+    """
+    rows = _snapshot.compact.row_model(
+        sort_model=json.loads(sort_key),
+        quick_filter=quick_filter,
+        columns=list(columns),
+    )
+    filter_model = {
+        column: condition
+        for column, condition in json.loads(filter_key).items()
+        if column in columns
+    }
+    if filter_model:
+        frame = _snapshot.select(list(filter_model), rows=rows)
+        rows = apply_row_model(frame, filter_model=filter_model).index
+    return pd.Index(rows)
+
+
+class SnapshotRows:
+    """
+    Rows of a snapshot, served to the server-side row model of the grid.
+
+    Implements the interface of data_tools.FrameRows. Rows are filtered and
+    sorted on the codes of the snapshot and only the requested rows are
+    decoded. The row ids are cached per snapshot digest, so reruns that do
+    not change the sort or the filters do not scan the catalogue again.
+
+    Parameters
+    ----------
+    snapshot : DatasetSnapshot
+        The snapshot.
+    columns : list
+        The columns shown in the grid.
+    """
+
+    def __init__(self, snapshot, columns):
+        self.snapshot = snapshot
+        self.columns = list(columns)
+
+    def row_ids(self, sort_model=None, quick_filter=None, filter_model=None):
+        """
+        Filter and sort the rows, see _snapshot_row_ids.
+
+        Returns
+        -------
+        pandas.Index
+            The ids of the matching rows, in display order.
+        """
+        return _snapshot_row_ids(
+            self.snapshot.digest,
+            tuple(self.columns),
+            json.dumps(sort_model or []),
+            quick_filter or "",
+            json.dumps(filter_model or {}, sort_keys=True),
+            self.snapshot,
+        )
+
+    def take(self, row_ids):
+        """
+        Get the rows with the given ids.
+
+        Parameters
+        ----------
+        row_ids : pandas.Index
+            The row ids.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The rows, in the order of ``row_ids``.
+        """
+        return self.snapshot.select(self.columns, rows=row_ids)
@@ -0,0 +1,288 @@
+import numpy as np
+import pandas as pd
+from helpers.data_tools import LIST_COLUMNS, build_long_table
+
+# Columns included in the value index. Scalar columns are indexed as
+# single-element lists so that they can be combined with the list columns.
+INDEX_COLUMNS = LIST_COLUMNS + ["DATA_TYPE"]
+
+
+class _FieldCodes:
+    """
+    Codes of one indexed field, sorted by code and by row.
+
+    Parameters
+    ----------
+    rows : numpy.ndarray
+        The row of each value.
+    codes : numpy.ndarray
+        The code of each value, -1 for missing values.
+    categories : pandas.Index
+        The value of each code.
+    row_count : int
+        Number of rows of the indexed dataframe.
+    """
+
+    def __init__(self, rows, codes, categories, row_count):
+        rows = np.asarray(rows, dtype=np.int32)
+        codes = np.asarray(codes, dtype=np.int32)
+        present = codes >= 0
+        rows, codes = rows[present], codes[present]
+        self.categories = pd.Index(categories)
+
+        # Rows of each code, sorted and without duplicates
+        order = np.lexsort((rows, codes))
+        rows, codes = rows[order], codes[order]
+        unique = np.ones(len(rows), dtype=bool)
+        unique[1:] = (rows[1:] != rows[:-1]) | (codes[1:] != codes[:-1])
+        self.code_rows, codes = rows[unique], codes[unique]
+        self.bounds = np.searchsorted(codes, np.arange(len(self.categories) + 1))
+
+        # Codes of each row
+        order = np.argsort(self.code_rows, kind="stable")
+        self.row_codes = codes[order]
+        self.row_ids = self.code_rows[order]
+        self.row_offsets = np.searchsorted(
+            self.row_ids, np.arange(row_count + 1)
+        ).astype(np.int32)
+
+        # The codes that occur, in the sort order of their values
+        occurring = np.flatnonzero(np.diff(self.bounds))
+        self.order = occurring[self.categories.take(occurring).argsort()]
+
+    def rows(self, code):
+        """
+        Get the sorted rows containing a code.
+        """
+        return self.code_rows[self.bounds[code]:self.bounds[code + 1]]
+
+    def counts(self, rows=None):
+        """
+        Count the rows containing each code, optionally restricted to rows.
+        """
+        if rows is None:
+            return np.diff(self.bounds)
+        selected = np.isin(self.row_ids, rows)
+        return np.bincount(self.row_codes[selected], minlength=len(self.categories))
+
+
+class ValueIndex:
+    """
+    Inverted index from (field, value) pairs to the rows containing them.
+
+    Each field is stored as 32-bit integer codes into its categories, once
+    sorted by code, so that the rows of a value are a slice, and once sorted
+    by row, so that counts and cross counts are computed with ``np.bincount``
+    instead of Python loops. Row ids are positions in the dataframe the index
+    was built from; the rows of a value are sorted and unique.
+
+    Parameters
+    ----------
+    codes : dict
+        Mapping of fields to (rows, codes, categories) tuples, with the row
+        and code of each value, e.g. as returned by
+        CompactCatalogue.value_codes.
+    row_count : int
+        Number of rows of the indexed dataframe.
+    """
+
+    def __init__(self, codes, row_count):
+        self.row_count = row_count
+        self._fields = {
+            field: _FieldCodes(rows, field_codes, categories, row_count)
+            for field, (rows, field_codes, categories) in codes.items()
+        }
+
+    @classmethod
+    def from_frame(cls, df, columns=INDEX_COLUMNS):
+        """
+        Build the index from a dataframe.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            The dataframe to be indexed.
+        columns : list, optional
+            The columns to index (default is INDEX_COLUMNS).
+
+        Returns
+        -------
+        ValueIndex
+            The value index.
+        """
+        df = df.reset_index(drop=True)
+        long_table = build_long_table(df, columns)
+        codes = {}
+        for field, group in long_table.groupby("field", sort=False):
+            field_codes, categories = pd.factorize(group["value"])
+            codes[field] = (group["row"].to_numpy(), field_codes, categories)
+        return cls(codes, len(df))
+
+    @property
+    def fields(self):
+        """
+        list: The indexed fields.
+        """
+        return list(self._fields)
+
+    def values(self, field):
+        """
+        Get the sorted distinct values of a field.
+
+        Parameters
+        ----------
+        field : str
+            The indexed field.
+
+        Returns
+        -------
+        list
+            The distinct values.
+        """
+        if field not in self._fields:
+            return []
+        codes = self._fields[field]
+        return list(codes.categories.take(codes.order))
+
+    def rows(self, field, value):
+        """
+        Get the rows containing a value.
+
+        Parameters
+        ----------
+        field : str
+            The indexed field.
+        value : object
+            The value to look up.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted row ids.
+        """
+        codes = self._fields.get(field)
+        code = -1 if codes is None else codes.categories.get_indexer([value])[0]
+        if code < 0:
+            return np.array([], dtype=np.int64)
+        return codes.rows(code)
+
+    def match_any(self, field, values):
+        """
+        Get the rows containing at least one of the values.
+
+        Parameters
+        ----------
+        field : str
+            The indexed field.
+        values : list
+            The values to look up.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted row ids.
+        """
+        parts = [self.rows(field, value) for value in values]
+        if not parts:
+            return np.array([], dtype=np.int64)
+        return np.unique(np.concatenate(parts))
+
+    def match_all(self, field, values):
+        """
+        Get the rows containing all of the values.
+
+        Parameters
+        ----------
+        field : str
+            The indexed field.
+        values : list
+            The values to look up.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted row ids.
+        """
+        result = np.arange(self.row_count, dtype=np.int64)
+        for value in values:
+            result = np.intersect1d(result, self.rows(field, value), assume_unique=True)
+        return result
+
+    def query(self, filters):
+        """
+        Get the rows matching a set of filters.
+
+        Filters on different fields are combined with AND, the values of a
+        single field with OR.
+
+        Parameters
+        ----------
+        filters : dict
+            Mapping of indexed fields to lists of values.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted row ids.
+        """
+        result = np.arange(self.row_count, dtype=np.int64)
+        for field, values in filters.items():
+            result = np.intersect1d(
+                result, self.match_any(field, values), assume_unique=True
+            )
+        return result
+
+    def cross_counts(self, field, other_field, rows=None):
+        """
+        Count the rows containing each combination of values of two fields.
+
+        The codes of both fields are paired per row and counted with a single
+        ``np.bincount``. When both fields are the same, each value is only
+        paired with itself.
+
+        Parameters
+        ----------
+        field : str
+            The indexed field used as index of the result.
+        other_field : str
+            The indexed field used as columns of the result.
+        rows : numpy.ndarray, optional
+            Restrict the counts to these sorted row ids (default is all rows).
+
+        Returns
+        -------
+        pandas.DataFrame
+            Count matrix with the values of ``field`` as index and the values
+            of ``other_field`` as columns.
+        """
+        index = pd.Index(self.values(field), name=field)
+        columns = pd.Index(self.values(other_field), name=other_field)
+        if index.empty or columns.empty:
+            counts = np.zeros((len(index), len(columns)), dtype=np.int64)
+            return pd.DataFrame(counts, index=index, columns=columns)
+
+        codes = self._fields[field]
+        other = self._fields[other_field]
+        if field == other_field:
+            counts = np.diag(codes.counts(rows)[codes.order])
+            return pd.DataFrame(counts, index=index, columns=columns)
+
+        row_ids, row_codes = codes.row_ids, codes.row_codes
+        if rows is not None:
+            selected = np.isin(row_ids, rows)
+            row_ids, row_codes = row_ids[selected], row_codes[selected]
+
+        # Pair every value of a row with every value of the other field
+        starts = other.row_offsets[row_ids]
+        lengths = other.row_offsets[row_ids + 1] - starts
+        ends = np.cumsum(lengths)
+        total = ends[-1] if len(ends) else 0
+        positions = np.repeat(starts - ends + lengths, lengths) + np.arange(total)
+        size = len(other.categories)
+        pairs = np.repeat(row_codes.astype(np.int64), lengths) * size
+        pairs += other.row_codes[positions]
+        counts = np.bincount(pairs, minlength=len(codes.categories) * size)
+        counts = counts.reshape(len(codes.categories), size)
+        return pd.DataFrame(
+            counts[np.ix_(codes.order, other.order)], index=index, columns=columns
+        )
@@ -0,0 +1,17 @@
+from pathlib import Path
+
+# Folder holding the images and text files shown in the tabs.
+WEBAPP_FILES = Path(__file__).resolve().parent.parent / "webapp_files"
+
+# Module rendering each tab of the sidebar menu. The modules are only imported
+# when their tab is selected for the first time.
+TAB_MODULES = {
+    "Home": "tabs.home",
+    "Datasets": "tabs.datasets",
+    "Database": "tabs.database",
+    "Challenge": "tabs.challenge",
+    "Benchmarks": "tabs.benchmarks",
+    "Image Analysis": "tabs.image_analysis",
+    "Contributing": "tabs.contributing",
+    "About Us": "tabs.about_us",
+}
@@ -0,0 +1,125 @@
+import streamlit as st
+from helpers.display_functions import display_data_warning
+
+
+def render():
+    """
+    Render the Benchmarks tab.
+    """
+    st.markdown("---")
+
+    # Benchmark Tab Header
+    st.markdown(
+        """
+    <div style="padding: 15px; border: 2px solid #008080; border-radius: 10px; background-color: #ccdfe1;">
+        <h3 style="text-align: center; color: #008080;">✨ Benchmarking Muscle Ultrasound Analysis</h3>
+        <p style="text-align: center;">
+            This section helps evaluate <b>muscle geometry analysis algorithms</b> in ultrasonography. Key parameters include 
+            <b>anatomical cross-sectional area (ACSA), fascicle length, pennation angle, and muscle thickness</b>, essential for understanding muscle function 
+            and adaptation. Manual analysis, though a gold standard, is labor-intensive and subjective.  
+        </p>
+        <p style="text-align: center;">
+            We try to provide a <b>common ground for comparing and benchmarking</b> manual and automated methods, advancing research with standardized evaluations.
+        </p>
+    </div>
+    """,
+        unsafe_allow_html=True,
+    )
+
+    st.markdown("---")
+
+    # Benchmark Image Dataset Section
+    st.markdown(
+        """
+        ### 📂 Benchmark Image Dataset
+        UMUD provides the first downloadable benchmark muscle architecture (static & dynamic) and morphology datasets, analyzed by **multiple expert raters**. 
+        Additionally, we provide benchmark training datasets for analysis algorithm training (lower limb muscle ACSA and architecture). A detailed description of the data and analyses can be found in the Readme.md accompanying the dataset.
+
+        These datasets allow you to:
+        - **Evaluate** your models/algorithm against a common ground truth.
+        - **Compare** your manual analysis with expert annotations.
+        - **Learn** how to analyse muscle geometry in ultrasonography images.
+
+        Specifically, the expert analysed dataset contains original muscle geometry ultrasound images, analysed and annotated images and the corresponding manual analysis results of: 
+        - **35 architectural images** from the vastus lateralis, gastrocnemius medialis, tibialis anterior and soleus acquired with different devices and analysed by seven experts (Fabio Sarto, Neil Cronin, Olivier Seynnes, Christoph Leitner, Taija Finni, Martino Franchi, Paul Ritsche).
+        - **30 panoramic images of rectus femoris ACSA** acquired with different devices and at different muscle regions analysed by six experts (Fabio Sarto, Neil Cronin, Olivier Seynnes, Taija Finni, Martino Franchi, Paul Ritsche).
+        - **167 architectural images of the gastrocnemius medialis during a calf raise** acquired with a Telemed device analysed by three experts (Tim van der Zee, Paolo Tecchio, Brent Raiteri). 
+        - **250 static architectural images** from the vastus lateralis in young and old individuals with drawings of the muscle fascicles analysed by one expert (Fabio Sarto).
+
+        📥 **[Download the Datasets from the UMUD Repository](https://osf.io/xbawc/files/osfstorage#)**  
+
+        🔍 We are **continuously including more images and muscles** in our expert analysed benchmark datasets.
+        """
+    )
+
+    # Benchmark Models Section
+    st.markdown("---")
+
+    st.markdown(
+        """
+        ### 🧠 Benchmark Models
+        """
+    )
+
+    st.markdown(
+        """
+        Additionally, we provide benchmark models (and their corresponding training datasets) for muscle architecture and ACSA analysis, implemented in Python and integrated with 
+        openly available datasets. These models are derived from published research and python packages (DL_Track, DeepACSA):
+        - **ACSA Analysis Models**: [Vastus Lateralis, Rectus Femoris, Biceps Femoris, Vastus Medialis](https://osf.io/xbawc/files/osfstorage#)
+        - **Muscle Architecture Models**: [Vastus Lateralis & Gastrocnemius Medialis & Tibialis Anterior & Soleus](https://osf.io/xbawc/files/osfstorage#)
+        - **Muscle Aponeurosis Models**: [Vastus Lateralis & Gastrocnemius Medialis & Tibialis Anterior & Soleus](https://osf.io/xbawc/files/osfstorage#)
+
+        These models are selected to serve as reliable benchmarks, not for publicity but to encourage collaboration and improvement based on a standardized common ground.
+        **Our expert analysed image datasets should be used as an external test set when applicable.**
+        Additional benchmark models for other segmentation tasks are under development.
+        """
+    )
+
+    # Display warning about data quality
+    display_data_warning()
+
+    # Performance Metrics Section
+    st.markdown("---")
+
+    st.markdown(
+        """
+        ### 📊 Performance Metrics
+        Benchmarking and scoring performance is essential for comparability, transparency and reproducibility.
+        By expanding the fields below, you can take a detailed look at the model/algorithm performance on our provided training and expert analysed test images.
+        
+        Under construction 🛠...
+        """
+    )
+
+    # with st.expander("**🤗 Algorithm Training Metrics**"):
+
+    #     st.markdown("#### Algorithm Training Metrics")
+    #     # Description of Calculation
+    #     st.markdown(
+    #         """
+    #         All metrics are calculated during model training on the validation folds using the mean value of five fold cross-validation. Here is a short description of the metrics:
+    #         - **IoU (Intersection over Union)**: Measures overlap between predicted and ground truth areas.
+    #         - **Dice Coefficient**: Measures similarity between two sets of data.
+    #         """
+    #     )
+
+    #     display_training_metrics()
+    #     # fig = display_training_metrics_barplots()
+    #     # st.pyplot(fig)
+
+    # # Dropdowns for model selection and metric filtering
+    # with st.expander("**📐 Muscle Geometry Comparability Statistics**", expanded=False):
+
+    #     st.markdown(
+    #         """
+    #     All statistics are calculated compared to the manual analysis by our expert raters. Here is a short description of the statistics. (For simplicity we omit compatibility intervals, keep this in mind when interpreting the data.):
+    #     - **Intraclass Correlation Coefficient (ICC)**:
+    #     A statistical measure of reliability that assesses the consistency of measurements made by different observers or instruments. ICC values range from 0 to 1, where higher values indicate better reliability.
+    #     - **Mean Difference (MD)**:
+    #     The average absolute difference between measurements. It quantifies bias between methods or observers, with lower values indicating better agreement.
+    #     - **Coefficient of Variation (CV%)**:
+    #     A measure of relative variability expressed as a percentage. It is the ratio of the standard deviation to the mean, used to compare variability across datasets.
+    #     """
+    #     )
+
+    #     display_comparability_statistics()
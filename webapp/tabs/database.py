@@ -0,0 +1,206 @@
+import streamlit as st
+from helpers.loading_functions import get_collection_version, load_dua
+from helpers.query_functions import GRID_COLUMNS, count_datasets, get_data_page
+from helpers.snapshot import SnapshotRows, get_snapshot
+from helpers.display_functions import display_charts
+from helpers.data_tools import (
+    FrameRows,
+    clean_dataframe,
+    export_token,
+    filter_dataframe,
+    get_download_button,
+)
+from helpers.pydantic_models import DatasetMetadata
+
+
+def render():
+    """
+    Render the Database tab.
+    """
+    # Horizontal line separator
+    st.markdown("---")
+
+    # Intro section with concise and readable text
+    st.markdown(
+        """
+        <div style="padding: 10px; border: 2px solid #008080; border-radius: 10px; border-width: 3px; background-color: #ccdfe1;">
+            <h4 style="text-align: center;">💾 Database Exploration Tool</h4>
+            <p style="text-align: center;">
+                In this tab, you can <b>explore the entire musculoskeletal ultrasonography datasets</b> stored in the database. Select the relevant filters, input the values, and retrieve datasets that meet your criteria.
+                You can filter the data, visualize different aspects of the dataset through interactive charts, and download the filtered data for further analysis. 
+            </p>
+        </div>
+
+        """,
+        unsafe_allow_html=True,
+    )
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    with st.expander("**📜 Data Usage Agreement**"):
+        st.warning("You must agree to the Data Usage Agreement before proceeding.")
+        st.markdown(load_dua())  # Display DUA content
+
+        st.text(
+            "By proceeding, you agree to the terms and conditions of the Data Usage Agreement."
+        )
+
+    agreement = st.checkbox("ACCEPT TO CONTINUE.")
+
+    if agreement:
+        render_grid()
+        st.markdown("---")
+        render_charts()
+
+
+# Fragment, so that grid widgets only rerun the grid and not the charts.
+@st.fragment
+def render_grid():
+    """
+    Render the paged dataset grid and the download of the filtered data.
+    """
+    total_datasets = count_datasets()
+
+    if total_datasets == 0:
+        st.write("No data available in the database.")
+
+    # Display filtered dataframe with filtering capabilities
+    st.markdown("##### Dataset Overview")
+    selected_columns = st.multiselect(
+        "Select Columns to Display",
+        list(DatasetMetadata.__fields__.keys()),
+        default=GRID_COLUMNS,
+        help="Select which columns you want to display. Long description columns are hidden by default.",
+    )
+    row_model = st.radio(
+        "Row Model",
+        ["Paged", "Server-side"],
+        horizontal=True,
+        help="'Paged' loads one page from the database into the grid. 'Server-side' searches and sorts the whole catalogue on the server and only sends one block of rows to the grid.",
+    )
+
+    grid_key = f"database_{row_model.lower()}"
+    if row_model == "Server-side":
+        # Rows are filtered and sorted on the shared snapshot
+        snapshot = get_snapshot()
+        rows = SnapshotRows(snapshot, selected_columns)
+        row_ids = filter_dataframe(rows, server_side=True, key=grid_key, read_only=True)
+        source = (snapshot.digest, tuple(selected_columns))
+    else:
+        col1, col2 = st.columns(2)
+        with col1:
+            page_size = st.selectbox("Rows per Page", [25, 50, 100])
+        with col2:
+            page_count = max(1, -(-total_datasets // page_size))
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1)
+
+        # Only the visible page is pulled from the database
+        df = get_data_page(page - 1, page_size, columns=selected_columns)
+
+        # Clean the columns shown in the grid
+        df_clean = clean_dataframe(df, columns=selected_columns)
+        filtered_df = filter_dataframe(df_clean, key=grid_key, read_only=True)
+        row_ids = filtered_df.index
+        rows = FrameRows(filtered_df)
+        source = (get_collection_version(), page, page_size, tuple(selected_columns))
+
+    # Selected rows are returned as row ids into the displayed data
+    selection = st.session_state.get(f"{grid_key}_selection", [])
+    if selection:
+        row_ids = row_ids[row_ids.isin(selection)]
+
+    with st.expander("**📥 Download Filtered Datasets...**", expanded=False):
+        if row_model == "Server-side":
+            # The filtered rows stay on the server until they are exported
+            st.write(f"{len(row_ids)} datasets match the current selection.")
+        else:
+            st.write(rows.take(row_ids))
+        # Add download button for the filtered rows. The export is keyed by
+        # the selected rows and only taken and cleaned when it is prepared.
+        get_download_button(
+            lambda: clean_dataframe(rows.take(row_ids)),
+            token=export_token(row_ids, *source),
+        )
+
+    if row_model == "Server-side":
+        with st.expander("**🧮 Snapshot Memory**", expanded=False):
+            st.write(
+                "Memory used by each column of the shared snapshot as Python objects and in its compact form."
+            )
+            st.dataframe(snapshot.memory)
+
+
+# Fragment, so that chart widgets only rerun the charts and not the grid or
+# its data fetch.
+@st.fragment
+def render_charts():
+    """
+    Render the interactive charts of the dataset snapshot.
+    """
+    # Dropdown for plot selection
+    st.markdown("##### Interactive Charts")
+    plot_options = [
+        "Muscle Distribution",
+        "Age Distribution",
+        "Data Type Distribution",
+    ]
+    selected_plots = st.multiselect(
+        "Select Plots to Display",
+        plot_options,
+        default=["Muscle Distribution"],
+        help="Select which plots you want to display to get a better understanding of the data. So far, only three plots are available. You can select multiple plots.",
+    )
+
+    # Dropdown for grouping selection
+    # categorical_columns = get_categorical_columns(df)
+    # group_by_column = st.selectbox(
+    #     "Select Column to Group By",
+    #     options=categorical_columns,
+    #     help="Select which column you want to group the data by.",
+    #     index=4,
+    # )
+
+    # Display interactive charts
+    age_mode = "auto"
+    if "Age Distribution" in selected_plots:
+        age_mode = st.radio(
+            "Age Distribution Style",
+            ["auto", "dots", "histogram"],
+            horizontal=True,
+            help="Show one dot per dataset or a binned histogram. 'auto' switches to the histogram for large catalogues.",
+        )
+
+    # Filter submitted in the Datasets tab
+    query = st.session_state.get("dataset_query") or None
+    if query and not st.checkbox(
+        "Only include the datasets of the submitted query",
+        value=True,
+        help="Restrict the charts to the datasets matching the filters submitted in the Datasets tab.",
+    ):
+        query = None
+
+    server_side = st.checkbox(
+        "Compute chart counts on the server",
+        help="Count the distributions with MongoDB aggregation pipelines and only transfer the resulting counts.",
+    )
+
+    if server_side:
+        # Only the counts are transferred, the snapshot is not loaded
+        display_charts(
+            None, selected_plots, server_side=True, query=query, age_mode=age_mode
+        )
+        return
+
+    # The charts count on the codes of the snapshot, only the scalar columns
+    # are passed for the ages
+    snapshot = get_snapshot()
+    rows = None if query is None else snapshot.match(query)
+    display_charts(
+        snapshot.compact.frame,
+        selected_plots,
+        index=snapshot.index,
+        query=query,
+        rows=rows,
+        data_key=snapshot.digest,
+        age_mode=age_mode,
+    )
@@ -0,0 +1,221 @@
+import streamlit as st
+from helpers.loading_functions import load_dua
+from helpers.query_functions import (
+    FIELD_REGISTRY,
+    compile_query,
+    find_datasets,
+    get_distinct_values,
+    get_field_spec,
+)
+from helpers.search_functions import search_datasets
+
+
+def render():
+    """
+    Render the Datasets tab.
+    """
+    # Horizontal line separator
+    st.markdown("---")
+
+    # Intro section with concise and readable text
+    st.markdown(
+        """
+        <div style="padding: 10px; border: 2px solid #008080; border-radius: 10px; border-width: 3px; background-color: #ccdfe1;">
+            <h4 style="text-align: center;">📈 Explore Muscle Ultrasound Datasets</h4>
+            <p style="text-align: center;">
+                Use this tab to <b>query datasets by applying specific metadata filters</b>. Select the relevant filters, input the values, and retrieve datasets that meet your criteria.
+                Choose the filters you want to apply from the list below. You can apply multiple filters for more precise results.
+                Alternatively, <b>search the descriptions and authors</b> of all datasets with free text.
+            </p>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    st.markdown("<br>", unsafe_allow_html=True)
+    search_mode = st.radio(
+        "Search Mode",
+        ["Metadata Filters", "Free-Text Search"],
+        horizontal=True,
+        help="Filter on exact metadata values or rank datasets by their descriptions and authors.",
+    )
+
+    if search_mode == "Free-Text Search":
+
+        with st.form("search_form", clear_on_submit=False):
+
+            search_text = st.text_input(
+                "Search Descriptions and Authors",
+                placeholder="e.g. gastrocnemius fascicle length",
+            )
+
+            with st.expander("**📜 Data Usage Agreement**", expanded=False):
+                st.markdown(load_dua())  # Display DUA content
+
+            st.warning(
+                "By submitting, you agree to the Data Usage Agreement.",
+            )
+            searched = st.form_submit_button("Search", type="primary")
+
+            st.markdown("---")
+
+            if searched and search_text.strip():
+                matches = search_datasets(search_text)
+                if len(matches) > 0:
+                    st.markdown("##### Ranked Dataset Links and Descriptions:")
+                    for _, match in matches.iterrows():
+                        link = match.get("DATASET_LINK", "No link available")
+                        st.markdown(
+                            f"- **{match.get('DATASET_NAME', 'No title available')}** "
+                            f"(score {match['SCORE']:.2f})"
+                        )
+                        st.markdown(f"**[{link}]({link})**")
+                        st.markdown(
+                            f"{match.get('SHORT_DESCRIPTION', 'No description available')}"
+                        )
+                else:
+                    st.write("No datasets match the search.")
+
+    # Section for selecting filters
+    if search_mode == "Metadata Filters":
+        st.markdown("##### Select Metadata Filters")
+
+        # Filter options
+        filter_options = list(FIELD_REGISTRY)
+        selected_filters = st.multiselect(
+            "", filter_options, help="Select the filters you want to use."
+        )
+    else:
+        selected_filters = []
+
+    if len(selected_filters) > 0:
+
+        # Create a form for inputting filter values
+        with st.form("entry_form", clear_on_submit=False):
+
+            st.markdown("##### Enter Filter Values")
+            filter_inputs = {}
+            filter_matches = {}
+            field_specs = {key: get_field_spec(key) for key in selected_filters}
+
+            # Fetch unique values in a single query, except for flags and
+            # numeric fields whose bounds are fixed by the schema. Stored values
+            # are used rather than the Enum options, so that legacy values
+            # remain selectable.
+            unique_values = get_distinct_values(
+                [
+                    key
+                    for key, spec in field_specs.items()
+                    if spec.kind != "bool"
+                    and (spec.minimum is None or spec.maximum is None)
+                ]
+            )
+
+            for key, spec in field_specs.items():
+                options = unique_values.get(key, [])
+
+                # Render the widget matching the type of each field
+                if spec.kind == "number":
+                    if spec.minimum is not None and spec.maximum is not None:
+                        lowest, highest = spec.minimum, spec.maximum
+                    else:
+                        numbers = [
+                            value for value in options if isinstance(value, (int, float))
+                        ]
+                        lowest = min(numbers, default=0)
+                        highest = max(numbers, default=0)
+                    if lowest < highest:
+                        low, high = st.slider(
+                            key,
+                            min_value=lowest,
+                            max_value=highest,
+                            value=(lowest, highest),
+                        )
+                        # Full-range bounds do not restrict the query
+                        filter_inputs[key] = (
+                            low if low > lowest else None,
+                            high if high < highest else None,
+                        )
+                    else:
+                        value = st.selectbox(key, options=[None, lowest])
+                        filter_inputs[key] = (value, value)
+                elif spec.kind == "bool":
+                    filter_inputs[key] = st.selectbox(
+                        key,
+                        options=[None] + spec.options,
+                        format_func=lambda value: "Any" if value is None else str(value),
+                    )
+                elif spec.kind == "list":
+                    filter_inputs[key] = st.multiselect(key, options=options)
+                    filter_matches[key] = st.radio(
+                        f"Datasets must contain ... of the selected {key} values",
+                        ["any", "all"],
+                        horizontal=True,
+                        key=f"match_{key}",
+                    )
+                else:
+                    filter_inputs[key] = st.multiselect(key, options=options)
+
+            # Horizontal separator
+            st.markdown("---")
+
+            # Data Usage Agreement section in an expander
+            with st.expander("**📜 Data Usage Agreement**", expanded=False):
+                st.markdown(load_dua())  # Display DUA content
+
+            # Warning and submit button
+            st.warning(
+                "By submitting, you agree to the Data Usage Agreement.",
+            )
+
+            # Primary action button
+            submitted = st.form_submit_button("Submit Query", type="primary")
+
+            # Horizontal line separator
+            st.markdown("---")
+
+            if submitted:
+                st.session_state["dataset_query"] = compile_query(
+                    filter_inputs, filter_matches
+                )
+                st.session_state["dataset_results_page"] = 1
+
+    # Results of the last submitted query, paged outside of the form
+    if selected_filters and "dataset_query" in st.session_state:
+        render_results()
+
+
+# Fragment, so that changing the results page does not rerun the filter form.
+@st.fragment
+def render_results():
+    """
+    Render one page of the results of the last submitted query.
+    """
+    query = st.session_state["dataset_query"]
+
+    st.markdown("##### Formed Query")
+    st.json(query)
+
+    page_size = 20
+    page = st.session_state.get("dataset_results_page", 1)
+    results, total = find_datasets(query, page=page - 1, page_size=page_size)
+
+    if total > 0:
+        st.markdown(f"##### Dataset Links and Descriptions ({total} found):")
+        for result in results:
+            title = result.get("DATASET_NAME", "No title available")
+            link = result.get("DATASET_LINK", "No link available")
+            description = result.get("SHORT_DESCRIPTION", "No description available")
+            # Display the link and its corresponding description
+            st.markdown(f"- **{title}**")
+            st.markdown(f"**[{link}]({link})**")
+            st.markdown(f"{description}")
+        if total > page_size:
+            st.number_input(
+                "Results Page",
+                min_value=1,
+                max_value=(total - 1) // page_size + 1,
+                key="dataset_results_page",
+            )
+    else:
+        st.write("No datasets found for the selected criteria.")
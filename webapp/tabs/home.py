@@ -0,0 +1,146 @@
+import streamlit as st
+from helpers.loading_functions import read_newsfeed
+from tabs import WEBAPP_FILES
+
+
+def render():
+    """
+    Render the Home tab.
+    """
+    # Welcome Section
+    st.markdown(
+        """
+        <div style="text-align: center; padding: 20px;">
+            <p><strong>Explore musculoskeletal ultrasonography data for research and development.</strong></p>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    st.markdown("---")
+
+    st.markdown(
+        """
+    <div style="padding: 10px; border: 2px solid #008080; border-radius: 10px; border-width: 3px; background-color: #ccdfe1;">
+        <h4 style="text-align: center;">Key Features</h4>
+        <ul style="list-style-type: none; padding-left: 0; text-align: left; font-size: 16px;">
+            <li>📁 <strong>Variety of Data</strong>: Access images, videos, and volumetric data.</li>
+            <li>🏷️ <strong>Labeled Datasets</strong>: Focused on datasets with comprehensive labels.</li>
+            <li>🔍 <strong>Metadata Indexing</strong>: Metadata indexing for efficient searching.</li>
+            <li>✨ <strong>Expert Standards</strong>: Expert-analyzed benchmarks and models.</li>
+        </ul>
+    </div>
+    """,
+        unsafe_allow_html=True,
+    )
+
+    st.markdown("---")
+
+    # About UMUD Section
+    st.markdown(
+        """
+        ### About UMUD
+        """
+    )
+
+    # st.warning(
+    #     "**This is a beta version of the UMUD repository, no functionality is guaranteed yet. We are currently testing first dataset inclusions.**",
+    #     icon=":material/warning:",
+    # )
+    st.markdown(
+        """
+        *Preprint:* [![DOI:10.31219/osf.io/syr4z](https://zenodo.org/badge/DOI/10.31219/osf.io/syr4z.svg)](https://doi.org/10.31219/osf.io/syr4z)
+        
+        The **UMUD repository** is a centralized platform for musculoskeletal ultrasonography dataset metadata. The database includes B-mode images, videos and volumetric data, with a focus on providing labeled datasets for training and research purposes.
+        
+        Existing  datasets often lack standardized metadata, making it challenging to find the datasets and compare data across different studies. UMUD tries to solve this issue by providing a comprehensive metadata index for musculoskeletal ultrasonography datasets.
+        
+        Moreover, as part of the [ORMIR](https://www.ormir.org/) community, we aim to set analysis standards by offering benchmark datasets and models, and organizing community challenges.
+        """
+    )
+
+    st.markdown("---")
+
+    news_items_path = str(WEBAPP_FILES)
+    news_items = read_newsfeed(news_items_path + "/newsfeed.txt")
+
+    st.markdown("### 📰 Newsfeed")
+    newsfeed_container = """
+    <style>
+    .news-container {
+        max-height: 300px;
+        overflow-y: scroll;
+        border: 1px solid #e6e6e6;
+        padding: 15px;
+        background-color: #f9f9f9;
+        border-radius: 8px;
+    }
+    .news-item {
+        padding: 10px 0;
+        border-bottom: 1px solid #ddd;
+        font-size: 14px;
+    }
+    </style>
+    <div class="news-container">
+    """
+    if news_items:
+        for item in news_items:
+            newsfeed_container += f'<div class="news-item">- {item}</div>'
+    else:
+        newsfeed_container += '<div class="news-item">No news items available.</div>'
+
+    newsfeed_container += "</div>"
+    st.markdown(newsfeed_container, unsafe_allow_html=True)
+
+    # Collaborator Section
+    st.markdown("---")
+    st.markdown("### Our Collaborators")
+
+    partners = [
+        {
+            "name": "ORMIR",
+            "logo": str(WEBAPP_FILES) + "/ormir_logo.png",
+            "link": "https://ormir.org/",
+        },
+        {
+            "name": "University of Basel",
+            "logo": str(WEBAPP_FILES) + "/unibas_logo.png",
+            "link": "https://www.unibas.ch/",
+        },
+        {
+            "name": "University of Padova",
+            "logo": str(WEBAPP_FILES) + "/unipd_logo.png",
+            "link": "https://www.unipd.it/",
+        },
+        {
+            "name": "University of Jyväskylä",
+            "logo": str(WEBAPP_FILES) + "/jyu_logo.png",
+            "link": "https://www.jyu.fi/",
+        },
+        {
+            "name": "Norwegian School of Sport Sciences",
+            "logo": str(WEBAPP_FILES) + "/nih_logo.png",
+            "link": "https://www.nih.no/",
+        },
+    ]
+
+    # Display partner logos in columns with hover effects
+    cols = st.columns(len(partners))
+    for col, partner in zip(cols, partners):
+        with col:
+            st.markdown(
+                f"<a href='{partner['link']}' target='_blank'>", unsafe_allow_html=True
+            )
+            st.image(partner["logo"], use_column_width=True)
+            st.markdown("</a>", unsafe_allow_html=True)
+
+    # Closing message
+    # st.markdown(
+    #     """
+    # <div style="text-align: center;">
+    #     <h3></h3>
+    #     <h4>Thank you for visiting the UMUD Repository!</h4>
+    # </div>
+    # """,
+    #     unsafe_allow_html=True,
+    # )
@@ -0,0 +1,95 @@
+import streamlit as st
+from helpers.display_functions import display_data_warning
+
+
+def render():
+    """
+    Render the Image Analysis tab.
+    """
+    st.markdown("---")
+    st.markdown(
+        """
+        <div style="padding: 15px; border: 2px solid #008080; border-radius: 10px; background-color: #ccdfe1;">
+            <h3 style="color: #000000; text-align: center;">🧙‍♂️ Automatic Analysis Algorithms</h3>
+            <p style="text-align: center;">
+                Automated image analysis algorithms are pivotal for driving progress in the understanding of muscle function, 
+                adaptation, and structural assessments. At UMUD, <b>we aim to empower researchers with state-of-the-art tools 
+                that enhance analysis efficiency and accuracy</b>. Below, you’ll find a curated list of available automatic 
+                analysis algorithms that have been widely used and validated in the field.
+            </p>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+    st.markdown("---")
+    algorithms = [
+        {
+            "name": "ACSAuto",
+            "description": "ACSAuto is an ImageJ macro script to semi-automatically evaluate the anatomical cross-sectional area of ultrasound images. ACSA preprocesses the image with filtering and ridge detection to enable automatic scaling using a reference line. It then enhances muscle aponeuroses and identifies their boundaries using a custom function, calculating the muscle’s ACSA from a generated polygon.",
+            "link": "https://github.com/PaulRitsche/ACSAuto",
+        },
+        {
+            "name": "DeepACSA",
+            "description": "DeepACSA is a python package using convolutional neural networks trained on ultrasonography images of the human lower limb. Specifically, the dataset included transversal ultrasonography images from the human gastrocnemius medialis and lateralis, vastus lateralis and rectus femoris. The algorithm is able to analyse muscle anatomical cross-sectional area, echo intensity and muscle volume.",
+            "link": "https://deepacsa.readthedocs.io/en/latest/",
+        },
+        {
+            "name": "DeepMTJ",
+            "description": "DeepMTJ is a machine learning approach for automatically tracking of muscle-tendon junctions (MTJ) in ultrasound images. Our method is based on a convolutional neural network trained to infer MTJ positions across various ultrasound systems from different vendors, collected in independent laboratories from diverse observers, on distinct muscles and movements. We built DeepMTJ to support clinical biomechanists and locomotion researchers with an open-source tool for gait analyses.",
+            "link": "https://github.com/luuleitner/deepMTJ",
+        },
+        {
+            "name": "DL_Track_US",
+            "description": "DL_Track_US is a python package using convolutional neural networks trained on ultrasonography images of the human lower limb. Specifically, the dataset included longitudinal ultrasonography images from the human gastrocnemius medialis, tibialis anterior, soleus and vastus lateralis. The algorithm is able to analyse muscle architectural parameters (muscle thickness, fascicle length and pennation angle) in both, single image files as well as videos.",
+            "link": "https://dltrack.readthedocs.io/en/latest/index.html",
+        },
+        {
+            "name": "SMA",
+            "description": "SMA (Simple Muscle Analysis) is an ImageJ macro to automate the analysis of muscle architecture from B-mode ultrasound images and videos. Images/frames are filtered in the spatial and frequency domains with built-in commands and external plugins to highlight aponeuroses and fascicles. Fascicle dominant orientation is then computed in regions of interest using the OrientationJ plugin.",
+            "link": "https://github.com/oseynnes/SMA",
+        },
+        {
+            "name": "TimTrack",
+            "description": "TimTrack is a drift-free Matlab algorithm for estimating muscle architectures from ultrasound images and image videos. The algorithm uses a combination of image filtering to highlight line-like structures and line-detection procedures to obtain the overall fascicle orientation. ",
+            "link": "https://github.com/timvanderzee/ultrasound-automated-algorithm",
+        },
+        {
+            "name": "UltraTimTrack",
+            "description": "UltraTimTrack is a Kalman-filter-based fascicle tracking algorithm that combines tracking estimates from existing and openly-available algorithms to yield improved estimates of muscle fascicle length and fascicle angle changes during movement. The proposed UltraTimTrack algorithm was evaluated using ultrasound image sequences collected from the left-sided medial gastrocnemius muscle of healthy young adults during cyclical submaximal voluntary fixed-end plantar flexion contractions at various frequencies with varying activation levels, as well as during passive ankle rotations at various angular velocities.",
+            "link": "https://github.com/timvanderzee/UltraTimTrack",
+        },
+        {
+            "name": "UltraTrack",
+            "description": "UltraTrack is a software program for tracking muscle fascicle length and orientation changes through sequences of B-mode ultrasound images. It implements an affine extension to an optic flow algorithm to track movement of the muscle fascicle end-points throughout the sequence of images.",
+            "link": "https://sites.google.com/site/ultratracksoftware/home",
+        },
+    ]
+
+    # Display warning about image quality
+    display_data_warning()
+
+    st.markdown("---")
+
+    for algo in algorithms:
+        st.markdown(f"**[{algo['name']}]({algo['link']})**: {algo['description']}")
+
+    # dataset_path = str(WEBAPP_FILES)
+    # if os.path.exists(dataset_path):
+    #     with open(dataset_path + "/muscle_benchmark_dataset.zip", "rb") as file:
+    #         dataset_content = file.read()
+    #     st.download_button(
+    #         label="📦 Download Muscle Benchmark Dataset",
+    #         data=dataset_content,
+    #         file_name="muscle_benchmark_dataset.zip",
+    #         mime="application/zip",
+    #     )
+
+    st.markdown("---")
+    st.info(
+        """
+            We acknowledge that the list of algorithms is not exhaustive. 
+            Our selection criteria, are open-source code and documentation combined with clear usage instructions and testing or validation.
+            Ideally, the algorithm should have a UI and be as user-friendly as possible.
+            """,
+        icon=":material/info:",
+    )